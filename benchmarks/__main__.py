@@ -0,0 +1,152 @@
+"""
+Run the benchmark suite and compare runs between commits.
+
+    python -m benchmarks run --scale small
+    python -m benchmarks run --suite agents --suite analyze --output before.json
+    python -m benchmarks compare benchmarks/results/<old>.json benchmarks/results/<new>.json
+
+A run saves every suite's results as JSON (by default under
+benchmarks/results/, named after the commit and scale) along with the
+commit, interpreter and machine. compare lists what regressed or improved
+by more than the threshold and exits non-zero on regressions. Comparisons
+are only meaningful between runs of the same scale on the same machine.
+bench_worker_memory is not part of the suite: it starts gunicorn.
+"""
+import argparse
+import asyncio
+import importlib
+import os
+import sys
+from typing import Callable, Dict
+from benchmarks.data import SCALES
+from benchmarks.harness import Result, compare, environment, load_results, metric, save_results
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+def _agents(scale, repeat):
+    return importlib.import_module("benchmarks.bench_agents").run_benchmark(scale, repeat)
+
+def _analyze(scale, repeat):
+    return importlib.import_module("benchmarks.bench_analyze").run_benchmark(scale, repeat)
+
+def _neuroscience(scale, repeat):
+    bench = importlib.import_module("benchmarks.bench_neuroscience")
+    timings = bench.run_benchmark(scale["events"], scale["mastery_topics"], repeat)
+    return {name: metric(seconds) for name, seconds in timings.items()}
+
+def _storage(scale, repeat):
+    bench = importlib.import_module("benchmarks.bench_storage")
+    results = asyncio.run(bench.run_benchmark("sqlite", scale["profiles"], scale["queries"]))
+    return {name: metric(result["ops_per_second"], "ops/s", higher_is_better=True) for name, result in results.items()}
+
+def _serialization(scale, repeat):
+    bench = importlib.import_module("benchmarks.bench_serialization")
+    results = {}
+    for name, value in bench.run_benchmark(scale["payloads"], repeat).items():
+        if name.endswith("_ms"):
+            results[name[:-3]] = metric(value / 1000)
+        else:
+            results[name] = metric(value, "bytes")
+    return results
+
+def _wire_format(scale, repeat):
+    bench = importlib.import_module("benchmarks.bench_wire_format")
+    if bench.msgpack is None:
+        raise ImportError("msgpack is not installed")
+    results = {}
+    for payload, formats in bench.run_benchmark(scale["payloads"], 100, repeat).items():
+        for wire_format, values in formats.items():
+            for name, value in values.items():
+                key = f"{payload}.{wire_format}.{name}"
+                results[key[:-3] if name.endswith("_us") else key] = (
+                    metric(value / 1e6) if name.endswith("_us") else metric(value, "bytes")
+                )
+    return results
+
+def _profile_validation(scale, repeat):
+    bench = importlib.import_module("benchmarks.bench_profile_validation")
+    results = bench.run_benchmark(scale["profiles"], repeat, 0.01)
+    return {name: metric(rate, "rows/s", higher_is_better=True) for name, rate in results.items()}
+
+# Suite name -> function(scale, repeat) returning {benchmark name: result}
+SUITES: Dict[str, Callable[[Dict[str, int], int], Dict[str, Result]]] = {
+    "agents": _agents,
+    "analyze": _analyze,
+    "neuroscience": _neuroscience,
+    "storage": _storage,
+    "serialization": _serialization,
+    "wire_format": _wire_format,
+    "profile_validation": _profile_validation
+}
+
+def default_output(scale: str) -> str:
+    env = environment()
+    commit = (env["commit"] or "unknown")[:12] + ("-dirty" if env["dirty"] else "")
+    return os.path.join(RESULTS_DIR, f"{commit}-{scale}.json")
+
+def run(args) -> int:
+    results = {}
+    for suite in args.suite or list(SUITES):
+        print(f"{suite} ...", file=sys.stderr)
+        try:
+            suite_results = SUITES[suite](SCALES[args.scale], args.repeat)
+        except ImportError as error:
+            # e.g. agno or msgpack missing from this environment
+            print(f"  skipped: {error}", file=sys.stderr)
+            continue
+        for name, result in suite_results.items():
+            results[f"{suite}.{name}"] = result
+            print(f"  {name:<60} {result['value']:>14.6g} {result['unit']}", file=sys.stderr)
+    output = args.output or default_output(args.scale)
+    save_results(output, args.scale, results)
+    print(output)
+    return 0
+
+def compare_runs(args) -> int:
+    baseline, current = load_results(args.baseline), load_results(args.current)
+    if baseline["scale"] != current["scale"]:
+        print(f"warning: comparing scale {baseline['scale']} with {current['scale']}", file=sys.stderr)
+    for side, results in (("baseline", baseline), ("current", current)):
+        env = results["environment"]
+        print(f"{side:<9} {env['commit']}{' (dirty)' if env['dirty'] else ''}  {env['timestamp']}  {env['platform']}")
+
+    rows = compare(baseline, current, args.threshold)
+    regressions = 0
+    for row in rows:
+        if "change" not in row:
+            print(f"{row['verdict']:<10} {row['name']}")
+            continue
+        if row["verdict"] == "regressed":
+            regressions += 1
+        if row["verdict"] != "unchanged" or args.all:
+            print(f"{row['verdict']:<10} {row['name']:<64} {row['before']:>12.6g} -> {row['after']:>12.6g} "
+                  f"{row['unit']:<11} {row['change']:+.1%}")
+    print(f"{regressions} regressed, {sum(row['verdict'] == 'improved' for row in rows)} improved, "
+          f"{len(rows)} compared")
+    return 1 if regressions else 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the suite and save the results")
+    run_parser.add_argument("--scale", choices=list(SCALES), default="small")
+    run_parser.add_argument("--suite", action="append", choices=list(SUITES), help="run only these suites")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>-<scale>.json)")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="compare two results files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="relative change that counts (default 0.1)")
+    compare_parser.add_argument("--all", action="store_true", help="also list unchanged benchmarks")
+    compare_parser.set_defaults(handler=compare_runs)
+
+    args = parser.parse_args()
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Micro-benchmarks of the agents' hot methods.
+
+    python -m benchmarks.bench_agents --scale small
+
+Times each analysis step the /analyze pipeline and the learning routes run,
+on synthetic interests, topics and learning events of the chosen scale
+(see benchmarks/data.py), in seconds per call.
+"""
+import argparse
+import asyncio
+from datetime import datetime
+from typing import Dict
+from benchmarks.data import (
+    SCALES, make_availability, make_interests, make_learning_events, make_mastery_table, make_topics
+)
+from benchmarks.harness import Result, measure, measure_async
+from src.agents.balajis_analysis_agent import BALAJISAnalysisAgent
+from src.agents.braved_analysis_agent import BRAVEDAnalysisAgent
+from src.agents.interest_analysis_agent import InterestAnalysisAgent
+from src.agents.learning_path_agent import LearningPathAgent
+from src.agents.neuroscience_agent import NeuroscienceAgent
+
+def run_benchmark(scale: Dict[str, int], repeat: int = 5) -> Dict[str, Result]:
+    results = {}
+    topics, engagement = make_topics(scale["topics"])
+    interests = make_interests(scale["interests"])
+
+    interest_agent = InterestAnalysisAgent()
+    results["interest.categorize_interests"] = measure_async(
+        lambda: interest_agent.categorize_interests(topics), repeat
+    )
+    results["interest.calculate_interest_scores"] = measure_async(
+        lambda: interest_agent.calculate_interest_scores(topics, engagement), repeat
+    )
+
+    braved_agent = BRAVEDAnalysisAgent()
+    results["braved.analyze_braved_components"] = measure_async(
+        lambda: braved_agent.analyze_braved_components(interests), repeat
+    )
+    balajis_agent = BALAJISAnalysisAgent()
+    results["balajis.analyze_balajis_components"] = measure_async(
+        lambda: balajis_agent.analyze_balajis_components(interests), repeat
+    )
+
+    # The later steps take the previous step's output
+    braved_analysis = asyncio.run(braved_agent.analyze_braved_components(interests))
+    balajis_analysis = asyncio.run(balajis_agent.analyze_balajis_components(interests))
+    categories = asyncio.run(interest_agent.categorize_interests(topics))["categorized_interests"]
+    scores = asyncio.run(interest_agent.calculate_interest_scores(topics, engagement))
+
+    results["interest.identify_learning_opportunities"] = measure_async(
+        lambda: interest_agent.identify_learning_opportunities(categories, scores), repeat
+    )
+    results["braved.generate_braved_recommendations"] = measure_async(
+        lambda: braved_agent.generate_braved_recommendations(braved_analysis), repeat
+    )
+    results["braved.assess_braved_balance"] = measure_async(
+        lambda: braved_agent.assess_braved_balance(braved_analysis), repeat
+    )
+    results["balajis.generate_balajis_recommendations"] = measure_async(
+        lambda: balajis_agent.generate_balajis_recommendations(balajis_analysis), repeat
+    )
+    results["balajis.assess_balajis_alignment"] = measure_async(
+        lambda: balajis_agent.assess_balajis_alignment(balajis_analysis), repeat
+    )
+
+    learning_path_agent = LearningPathAgent()
+    results["learning_path.generate_learning_modules"] = measure_async(
+        lambda: learning_path_agent.generate_learning_modules(interests), repeat
+    )
+    modules = asyncio.run(learning_path_agent.generate_learning_modules(interests))
+    start_date = datetime(2025, 1, 6)
+    results["learning_path.create_learning_schedule"] = measure_async(
+        lambda: learning_path_agent.create_learning_schedule(modules, start_date), repeat
+    )
+
+    neuroscience_agent = NeuroscienceAgent()
+    events = make_learning_events(scale["events"])
+    user_data = {"activities": events, "activity_times": events, "quiz_results": events}
+    patterns = asyncio.run(neuroscience_agent.analyze_learning_patterns(user_data))
+    results["learning_path.create_learning_schedule_with_sessions"] = measure_async(
+        lambda: learning_path_agent.create_learning_schedule(
+            modules, start_date, availability=make_availability(),
+            optimal_times=patterns.get("optimal_learning_times")
+        ),
+        repeat
+    )
+    results["neuroscience.analyze_learning_patterns"] = measure_async(
+        lambda: neuroscience_agent.analyze_learning_patterns(user_data), repeat
+    )
+    mastery_table = make_mastery_table(scale["mastery_topics"])
+    results["neuroscience.assess_mastery_levels"] = measure_async(
+        lambda: neuroscience_agent.assess_mastery_levels(mastery_table), repeat
+    )
+    results["neuroscience.score_learning_styles"] = measure(
+        lambda: neuroscience_agent._score_learning_styles(events), repeat
+    )
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=list(SCALES), default="small")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, result in run_benchmark(SCALES[args.scale], args.repeat).items():
+        print(f"{name:<56} {result['value'] * 1e6:>12.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+End-to-end /analyze benchmark against local stand-ins.
+
+    python -m benchmarks.bench_analyze --scale small
+
+Drives POST /analyze through the whole app (middleware, admission control,
+agents, profile write) in process, with profiles in a temporary SQLite
+database and the Twitter client replaced by a stub serving synthetic
+tweets, so no network or Supabase is involved. Reports per-request latency
+and throughput, and the orchestrator alone for comparison.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+from fastapi.testclient import TestClient
+from benchmarks.data import SCALES, make_rows, make_topics, make_tweets
+from benchmarks.harness import Result, latency_summary, measure_async, metric
+from src.api import agent_routes
+from src.main import create_app
+from src.services.profile_service import ProfileService
+from src.storage.sqlite_store import SQLiteProfileStore
+
+class StubTwitterClient:
+    """Answers get_user and get_users_tweets like tweepy.Client, from synthetic tweets"""
+
+    def __init__(self, tweets: List[Dict]):
+        self.tweets = [
+            SimpleNamespace(text=tweet["text"], public_metrics=tweet["public_metrics"]) for tweet in tweets
+        ]
+
+    def get_user(self, username: str, **kwargs):
+        return SimpleNamespace(data=SimpleNamespace(id="1", username=username))
+
+    def get_users_tweets(self, id: str, max_results: int = 100, **kwargs):
+        return SimpleNamespace(data=self.tweets[:max_results])
+
+def analysis_request(user_id: str, topics: List[str], engagement: Dict[str, int]) -> Dict:
+    return {
+        "user_id": user_id,
+        "task": "analyze_user_profile",
+        "params": {"username": f"user_{user_id[:8]}", "limit": 100, "topics": topics, "engagement_data": engagement}
+    }
+
+def run_benchmark(scale: Dict[str, int], repeat: int = 5) -> Dict[str, Result]:
+    requests = scale["analyses"]
+    topics, engagement = make_topics(min(scale["topics"], 200))
+    with tempfile.TemporaryDirectory() as root:
+        service = ProfileService(SQLiteProfileStore(os.path.join(root, "profiles.db")))
+        users = [row["id"] for row in asyncio.run(service.store.bulk_create(make_rows(requests)))]
+
+        # The app's routes share these module-level objects
+        original_service = agent_routes.profile_service
+        original_twitter = agent_routes.social_media_agent.twitter_client
+        agent_routes.profile_service = service
+        agent_routes.social_media_agent.twitter_client = StubTwitterClient(make_tweets(scale["tweets"]))
+        try:
+            client = TestClient(create_app())
+            bodies = [analysis_request(user_id, topics, engagement) for user_id in users]
+            client.post("/analyze", json=bodies[0]).raise_for_status()
+
+            latencies = []
+            start = time.perf_counter()
+            for body in bodies:
+                request_start = time.perf_counter()
+                client.post("/analyze", json=body).raise_for_status()
+                latencies.append(time.perf_counter() - request_start)
+            elapsed = time.perf_counter() - start
+
+            results = {f"latency_{name}": value for name, value in latency_summary(latencies).items()}
+            results["throughput"] = metric(requests / elapsed, "requests/s", higher_is_better=True)
+            results["orchestrator"] = measure_async(
+                lambda: agent_routes.mrs_beens.execute(bodies[0]["task"], bodies[0]["params"]), repeat
+            )
+        finally:
+            agent_routes.profile_service = original_service
+            agent_routes.social_media_agent.twitter_client = original_twitter
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=list(SCALES), default="small")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, result in run_benchmark(SCALES[args.scale], args.repeat).items():
+        if result["unit"] == "s":
+            print(f"{name:<28} {result['value'] * 1000:>10.2f} ms")
+        else:
+            print(f"{name:<28} {result['value']:>10.1f} {result['unit']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+NeuroscienceAgent analytics benchmark.
+
+    python -m benchmarks.bench_neuroscience --events 1000000
+
+Times the vectorized optimal-time, retention and batch mastery analysis
+and the single-pass learning-style scoring against the original per-record loops
+(kept below as the baseline) and checks that both give the same results.
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from benchmarks.data import make_activities, make_activity_times, make_mastery_table, make_quiz_results
+from src.agents.neuroscience_agent import NeuroscienceAgent
+from src.storage.activity_log import ActivityLog
+
+def baseline_optimal_times(activity_times):
+    """The per-record loop NeuroscienceAgent used before vectorizing"""
+    time_slots = {}
+    for activity in activity_times:
+        hour = activity["timestamp"].hour
+        if hour not in time_slots:
+            time_slots[hour] = {"count": 0, "success_rate": 0}
+        time_slots[hour]["count"] += 1
+        time_slots[hour]["success_rate"] += activity.get("success_rate", 0)
+
+    optimal_times = []
+    for hour, data in time_slots.items():
+        if data["count"] > 0:
+            optimal_times.append({
+                "hour": hour,
+                "success_rate": data["success_rate"] / data["count"],
+                "activity_count": data["count"]
+            })
+    return sorted(optimal_times, key=lambda x: x["success_rate"], reverse=True)
+
+def baseline_retention(quiz_results):
+    """The multi-pass retention analysis NeuroscienceAgent used before vectorizing"""
+    retention_analysis = {"overall_retention": 0.0, "topic_retention": {}, "time_based_retention": {}}
+    total_questions = sum(quiz["total_questions"] for quiz in quiz_results)
+    correct_answers = sum(quiz["correct_answers"] for quiz in quiz_results)
+    retention_analysis["overall_retention"] = (correct_answers / total_questions) * 100
+    for quiz in quiz_results:
+        topic = quiz["topic"]
+        if topic not in retention_analysis["topic_retention"]:
+            retention_analysis["topic_retention"][topic] = {"total_questions": 0, "correct_answers": 0}
+        retention_analysis["topic_retention"][topic]["total_questions"] += quiz["total_questions"]
+        retention_analysis["topic_retention"][topic]["correct_answers"] += quiz["correct_answers"]
+    return retention_analysis
+
+def baseline_style_scores(agent, activities):
+    """One pass over the activities per learning style, as before single-pass scoring"""
+    scores = {}
+    for style, data in agent.learning_patterns.items():
+        score = 0.0
+        total_activities = 0
+        for activity in activities:
+            if any(indicator in activity.get("type", "").lower() for indicator in data["indicators"]):
+                score += activity.get("engagement_score", 0)
+                total_activities += 1
+        scores[style] = score / total_activities if total_activities > 0 else 0.0
+    return scores
+
+def baseline_mastery(agent, table):
+    """One assess_mastery_level call per topic row"""
+    async def assess_all():
+        keys = list(table)
+        return [
+            await agent.assess_mastery_level(dict(zip(keys, row)))
+            for row in zip(*table.values())
+        ]
+    return asyncio.run(assess_all())
+
+def best_of(repeat, function, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def run_benchmark(events, topics, repeat):
+    """Seconds taken by each analysis, baseline and vectorized, best of repeat"""
+    agent = NeuroscienceAgent()
+    activity_times = make_activity_times(events)
+    quiz_results = make_quiz_results(events)
+    activities = make_activities(events)
+    mastery_table = make_mastery_table(topics)
+
+    cases = [
+        ("optimal_times", baseline_optimal_times, agent._analyze_optimal_times, activity_times),
+        ("retention", baseline_retention, agent._analyze_retention, quiz_results),
+        ("style_scores", lambda data: baseline_style_scores(agent, data), agent._score_learning_styles, activities),
+        ("mastery", lambda data: baseline_mastery(agent, data),
+         lambda data: asyncio.run(agent.assess_mastery_levels(data)), mastery_table)
+    ]
+    results = {}
+    for name, baseline, vectorized, data in cases:
+        results[f"{name}_baseline"], expected = best_of(repeat, baseline, data)
+        results[name], actual = best_of(repeat, vectorized, data)
+        assert actual == expected, f"{name} results differ from the baseline"
+
+    hours, weekdays, success_rates = agent._activity_time_arrays(activity_times)
+    results["rank_hours"], _ = best_of(repeat, agent._rank_hours, hours, success_rates)
+    results["rank_weekly_slots"], _ = best_of(repeat, agent._rank_weekly_slots, hours, weekdays, success_rates)
+
+    # Full analysis from dicts in memory vs. from the columnar activity log
+    events = [
+        {**timing, **activity, "topic": quiz["topic"], "total_questions": quiz["total_questions"],
+         "correct_answers": quiz["correct_answers"]}
+        for timing, activity, quiz in zip(activity_times, activities, quiz_results)
+    ]
+    user_data = {"activities": events, "activity_times": events, "quiz_results": events}
+    results["analyze_learning_patterns"], _ = best_of(
+        repeat, lambda: asyncio.run(agent.analyze_learning_patterns(user_data))
+    )
+    with tempfile.TemporaryDirectory() as root:
+        log = ActivityLog(root)
+        log.append("bench", events)
+        results["activity_log_scan"], scan = best_of(repeat, log.scan, "bench")
+        results["analyze_activity_columns"], _ = best_of(
+            repeat, lambda: asyncio.run(agent.analyze_activity_columns(scan.columns, scan.types, scan.topics))
+        )
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NeuroscienceAgent analytics")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--topics", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.events, args.topics, args.repeat)
+    print(f"{args.events} events, {args.topics} topics, best of {args.repeat}")
+    for name in ("optimal_times", "retention", "style_scores", "mastery"):
+        baseline_time, vectorized_time = results[f"{name}_baseline"], results[name]
+        print(f"  {name:<14} baseline {baseline_time:.3f}s  vectorized {vectorized_time:.3f}s  "
+              f"({baseline_time / vectorized_time:.1f}x)")
+    print(f"  from arrays    hours {results['rank_hours'] * 1000:.1f}ms  "
+          f"day x hour {results['rank_weekly_slots'] * 1000:.1f}ms")
+    print(f"  full analysis  dicts {results['analyze_learning_patterns']:.3f}s  "
+          f"log scan {results['activity_log_scan']:.3f}s + columns {results['analyze_activity_columns']:.3f}s")
+
+if __name__ == "__main__":
+    main()
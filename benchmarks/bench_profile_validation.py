@@ -0,0 +1,61 @@
+"""
+Profile model construction benchmark.
+
+    python -m benchmarks.bench_profile_validation --rows 10000
+
+Compares full pydantic validation (Profile(**row)) with the trusted
+Profile.from_db_row path on rows shaped like the profiles table, with and
+without sampled re-validation.
+"""
+import argparse
+import time
+import uuid
+from unittest import mock
+from benchmarks.data import make_rows
+from src.models import profile as profile_module
+from src.models.profile import Profile
+
+def make_db_rows(count):
+    rows = make_rows(count)
+    for row in rows:
+        row.update(
+            id=str(uuid.uuid4()),
+            created_at="2025-01-01T00:00:00+00:00",
+            updated_at="2025-01-01T00:00:00+00:00"
+        )
+    return rows
+
+def rows_per_second(build, rows, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for row in rows:
+            build(row)
+        best = min(best, time.perf_counter() - start)
+    return len(rows) / best
+
+def run_benchmark(count, rounds, sample_rate):
+    rows = make_db_rows(count)
+    assert Profile.from_db_row(rows[0]) == Profile(**rows[0])
+    results = {
+        "validated": rows_per_second(lambda row: Profile(**row), rows, rounds),
+        "from_db_row": rows_per_second(Profile.from_db_row, rows, rounds)
+    }
+    with mock.patch.object(profile_module, "PROFILE_VALIDATION_SAMPLE_RATE", sample_rate):
+        results[f"from_db_row_sampled_{sample_rate:g}"] = rows_per_second(Profile.from_db_row, rows, rounds)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--sample-rate", type=float, default=0.01)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.rows, args.rounds, args.sample_rate)
+    baseline = results["validated"]
+    for name, rate in results.items():
+        print(f"{name:<28} {rate:>12,.0f} rows/s  ({rate / baseline:.1f}x)")
+
+if __name__ == "__main__":
+    main()
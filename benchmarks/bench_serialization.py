@@ -0,0 +1,67 @@
+"""
+/analyze response serialization benchmark.
+
+    python -m benchmarks.bench_serialization --responses 200
+
+Times FastAPI's default path (jsonable_encoder + JSONResponse) against
+FastJSONResponse (orjson) on generated BRAVED+BALAJIS analysis results of
+the same shape the agents return, and reports the bytes on the wire raw,
+gzipped and brotli-compressed.
+"""
+import argparse
+import gzip
+import statistics
+import time
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from benchmarks.data import make_analysis_result
+from src.api import compression
+from src.api.responses import FastJSONResponse
+
+def per_call_ms(function, payloads, rounds):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for payload in payloads:
+            function(payload)
+        timings.append((time.perf_counter() - start) / len(payloads) * 1000)
+    return min(timings)
+
+def run_benchmark(responses, rounds):
+    payloads = [make_analysis_result(seed) for seed in range(responses)]
+    bodies = [FastJSONResponse(payload).body for payload in payloads]
+
+    results = {
+        "default_encoder_ms": per_call_ms(lambda payload: JSONResponse(jsonable_encoder(payload)).body, payloads, rounds),
+        "orjson_ms": per_call_ms(lambda payload: FastJSONResponse(payload).body, payloads, rounds),
+        "raw_bytes": statistics.mean(map(len, bodies)),
+        "gzip_bytes": statistics.mean(len(gzip.compress(body, compression.GZIP_LEVEL)) for body in bodies),
+        "gzip_ms": per_call_ms(lambda body: gzip.compress(body, compression.GZIP_LEVEL), bodies, rounds)
+    }
+    if compression.brotli is not None:
+        brotli = compression.brotli
+        results["brotli_bytes"] = statistics.mean(
+            len(brotli.compress(body, quality=compression.BROTLI_QUALITY)) for body in bodies
+        )
+        results["brotli_ms"] = per_call_ms(
+            lambda body: brotli.compress(body, quality=compression.BROTLI_QUALITY), bodies, rounds
+        )
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--responses", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.responses, args.rounds)
+    print(f"serialize   default {results['default_encoder_ms']:.3f} ms   orjson {results['orjson_ms']:.3f} ms   "
+          f"({results['default_encoder_ms'] / results['orjson_ms']:.1f}x)")
+    print(f"bytes       raw {results['raw_bytes']:.0f}   gzip {results['gzip_bytes']:.0f} "
+          f"({results['gzip_ms']:.3f} ms)", end="")
+    if "brotli_bytes" in results:
+        print(f"   brotli {results['brotli_bytes']:.0f} ({results['brotli_ms']:.3f} ms)", end="")
+    print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Profile store benchmark, run against any configured backend.
+
+    python -m benchmarks.bench_storage --backend sqlite --profiles 5000
+    python -m benchmarks.bench_storage --backend supabase --profiles 200
+
+The Supabase backend uses SUPABASE_URL/SUPABASE_SERVICE_KEY and deletes the
+profiles it created when done.
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from benchmarks.data import INTERESTS, make_rows
+from src.config.settings import BRAVED_FRAMEWORK, BALAJIS_FRAMEWORK
+
+def open_store(backend):
+    if backend == "sqlite":
+        from src.storage.sqlite_store import SQLiteProfileStore
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        return SQLiteProfileStore(path)
+    from src.storage.supabase_store import SupabaseProfileStore
+    return SupabaseProfileStore()
+
+async def timed(name, operations, coro, results):
+    start = time.perf_counter()
+    value = await coro
+    elapsed = time.perf_counter() - start
+    results[name] = {"seconds": elapsed, "ops_per_second": operations / elapsed if elapsed else float("inf")}
+    return value
+
+async def run_benchmark(backend, profiles, queries):
+    store = open_store(backend)
+    rows = make_rows(profiles)
+    results = {}
+
+    created = await timed("bulk_create", profiles, store.bulk_create(rows), results)
+    ids = [row["id"] for row in created]
+
+    async def gets():
+        for profile_id in random.Random(1).choices(ids, k=queries):
+            await store.get_profile(profile_id)
+
+    async def updates():
+        for i, profile_id in enumerate(ids[:queries]):
+            await store.update_profile(profile_id, {"braved_scores": {**rows[i]["braved_scores"], "ai": i % 101}})
+
+    async def searches():
+        for i in range(queries):
+            await store.search_profiles(min_scores={"ai": 90, "build": i % 100}, limit=50)
+
+    async def interest_searches():
+        for i in range(queries):
+            await store.search_profiles(interests=[INTERESTS[i % len(INTERESTS)]], limit=50)
+
+    async def tops():
+        components = list(BRAVED_FRAMEWORK) + list(BALAJIS_FRAMEWORK)
+        for i in range(queries):
+            await store.top_profiles(components[i % len(components)], limit=10)
+
+    await timed("get_profile", queries, gets(), results)
+    await timed("update_profile", min(queries, len(ids)), updates(), results)
+    await timed("search_by_score", queries, searches(), results)
+    await timed("search_by_interest", queries, interest_searches(), results)
+    await timed("top_profiles", queries, tops(), results)
+    await timed("bulk_delete", len(ids), store.bulk_delete(ids), results)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark a profile store backend")
+    parser.add_argument("--backend", choices=["sqlite", "supabase"], default="sqlite")
+    parser.add_argument("--profiles", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args.backend, args.profiles, args.queries))
+    print(f"{args.backend} backend, {args.profiles} profiles")
+    for name, result in results.items():
+        print(f"  {name:<20} {result['ops_per_second']:>12.1f} ops/s  ({result['seconds']:.3f}s)")
+
+if __name__ == "__main__":
+    main()
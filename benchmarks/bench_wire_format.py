@@ -0,0 +1,80 @@
+"""
+JSON vs MessagePack wire format benchmark.
+
+    python -m benchmarks.bench_wire_format --payloads 200
+
+Times a full round trip of each format (server render + client decode) on
+the bodies internal consumers move most: /analyze results and pages of
+profiles. JSON is rendered by FastJSONResponse (orjson) and decoded with
+orjson, MessagePack is rendered by NegotiatedResponse and decoded with
+msgpack, the same code paths the API and src/client.py use. Decoding
+JSON with the standard library, as requests' Response.json() does, is
+timed too: that is what most consumers pay today.
+"""
+import argparse
+import json
+import statistics
+import time
+import orjson
+from benchmarks.bench_profile_validation import make_db_rows
+from benchmarks.data import make_analysis_result
+from src.api.negotiation import msgpack, packb, unpackb
+from src.api.responses import FastJSONResponse
+
+def per_call_us(function, payloads, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for payload in payloads:
+            function(payload)
+        best = min(best, time.perf_counter() - start)
+    return best / len(payloads) * 1e6
+
+def compare(payloads, rounds):
+    json_bodies = [FastJSONResponse(payload).body for payload in payloads]
+    msgpack_bodies = [packb(payload) for payload in payloads]
+    assert unpackb(msgpack_bodies[0]) == orjson.loads(json_bodies[0])
+    return {
+        "json": {
+            "encode_us": per_call_us(lambda payload: FastJSONResponse(payload).body, payloads, rounds),
+            "decode_us": per_call_us(orjson.loads, json_bodies, rounds),
+            "stdlib_decode_us": per_call_us(json.loads, json_bodies, rounds),
+            "bytes": statistics.mean(map(len, json_bodies))
+        },
+        "msgpack": {
+            "encode_us": per_call_us(packb, payloads, rounds),
+            "decode_us": per_call_us(unpackb, msgpack_bodies, rounds),
+            "bytes": statistics.mean(map(len, msgpack_bodies))
+        }
+    }
+
+def run_benchmark(payloads, page_size, rounds):
+    return {
+        "analysis": compare([make_analysis_result(seed) for seed in range(payloads)], rounds),
+        f"profiles_x{page_size}": compare(
+            [make_db_rows(page_size) for _ in range(max(payloads // 10, 1))], rounds
+        )
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payloads", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    if msgpack is None:
+        parser.error("msgpack is not installed")
+
+    for name, formats in run_benchmark(args.payloads, args.page_size, args.rounds).items():
+        for wire_format, result in formats.items():
+            round_trip = result["encode_us"] + result["decode_us"]
+            print(f"{name:<16} {wire_format:<8} encode {result['encode_us']:>8.1f} us   "
+                  f"decode {result['decode_us']:>8.1f} us   {1e6 / round_trip:>8,.0f} round trips/s   "
+                  f"{result['bytes']:>8,.0f} bytes")
+            if "stdlib_decode_us" in result:
+                round_trip = result["encode_us"] + result["stdlib_decode_us"]
+                print(f"{name:<16} {'json/std':<8} encode {result['encode_us']:>8.1f} us   "
+                      f"decode {result['stdlib_decode_us']:>8.1f} us   {1e6 / round_trip:>8,.0f} round trips/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Per-worker memory of the gunicorn deployment, with and without preloading.
+
+    python -m benchmarks.bench_worker_memory --workers 4
+
+Starts gunicorn with gunicorn.conf.py twice (GUNICORN_PRELOAD=0 and 1),
+sends a few requests to every worker, then reads /proc/<pid>/smaps_rollup
+of each worker. RSS counts shared pages in every process; PSS splits them
+between the processes sharing them and USS is the memory a worker alone
+holds, so preloading shows up as lower PSS/USS per worker. Linux only.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+WARMUP_PATHS = ("/", "/frameworks", "/agents", "/docs")
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def children(pid):
+    found = []
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as stat:
+                # The command name may contain spaces; fields after it are fixed
+                fields = stat.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            found.append(int(name))
+    return found
+
+def memory_kb(pid):
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as rollup:
+        for line in rollup:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": values["Rss"],
+        "pss": values["Pss"],
+        "uss": values["Private_Clean"] + values["Private_Dirty"]
+    }
+
+def measure(workers, preload, requests, timeout=120):
+    port = free_port()
+    env = dict(
+        os.environ,
+        WEB_CONCURRENCY=str(workers),
+        GUNICORN_PRELOAD="1" if preload else "0",
+        GUNICORN_BIND=f"127.0.0.1:{port}"
+    )
+    master = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "src.main:app", "-c", "gunicorn.conf.py"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if master.poll() is not None:
+                raise RuntimeError("gunicorn exited during startup; run it by hand to see why")
+            if time.monotonic() > deadline:
+                raise RuntimeError("gunicorn workers did not start in time")
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1).read()
+                if len(children(master.pid)) == workers:
+                    break
+            except OSError:
+                pass
+            time.sleep(0.2)
+
+        # Spread over all workers by sheer count; each request touches the app's state
+        for _ in range(requests):
+            for path in WARMUP_PATHS:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=5).read()
+
+        per_worker = [memory_kb(pid) for pid in children(master.pid)]
+        master_memory = memory_kb(master.pid)
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=30)
+
+    count = len(per_worker)
+    return {
+        "preload": preload,
+        "workers": count,
+        "worker_rss_kb": sum(worker["rss"] for worker in per_worker) / count,
+        "worker_pss_kb": sum(worker["pss"] for worker in per_worker) / count,
+        "worker_uss_kb": sum(worker["uss"] for worker in per_worker) / count,
+        "total_pss_kb": master_memory["pss"] + sum(worker["pss"] for worker in per_worker)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results = [measure(args.workers, preload, args.requests) for preload in (False, True)]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'preload':>8} {'RSS/worker':>12} {'PSS/worker':>12} {'USS/worker':>12} {'total PSS':>12}")
+    for result in results:
+        print(f"{str(result['preload']):>8} {result['worker_rss_kb'] / 1024:>10.1f}MB "
+              f"{result['worker_pss_kb'] / 1024:>10.1f}MB {result['worker_uss_kb'] / 1024:>10.1f}MB "
+              f"{result['total_pss_kb'] / 1024:>10.1f}MB")
+    saved = results[0]["worker_uss_kb"] - results[1]["worker_uss_kb"]
+    print(f"preloading saves {saved / 1024:.1f}MB of private memory per worker")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Synthetic data for the benchmarks.
+
+Every generator is deterministic for a given seed, so runs on different
+commits measure the same inputs. SCALES sizes a whole suite run.
+"""
+import random
+from datetime import datetime, timedelta
+from src.config.settings import BRAVED_FRAMEWORK, BALAJIS_FRAMEWORK
+
+# Input sizes of a suite run (see benchmarks/__main__.py)
+SCALES = {
+    "small": {
+        "profiles": 1_000, "queries": 200, "interests": 20, "topics": 500, "tweets": 100,
+        "events": 20_000, "mastery_topics": 1_000, "analyses": 20, "payloads": 50
+    },
+    "medium": {
+        "profiles": 10_000, "queries": 1_000, "interests": 100, "topics": 5_000, "tweets": 100,
+        "events": 200_000, "mastery_topics": 10_000, "analyses": 100, "payloads": 200
+    },
+    "large": {
+        "profiles": 100_000, "queries": 5_000, "interests": 500, "topics": 50_000, "tweets": 100,
+        "events": 1_000_000, "mastery_topics": 100_000, "analyses": 500, "payloads": 1_000
+    }
+}
+
+INTERESTS = ["bitcoin", "ai", "web3", "nft", "zk", "defi", "vr", "gaming", "privacy", "automation"]
+# Phrases matching the interest categories and BRAVED/BALAJIS keywords of the agents, plus some that match none
+INTEREST_TOPICS = [
+    "bitcoin mining", "crypto trading", "blockchain programming", "web3 startups", "nft art",
+    "ai agents", "machine learning", "prompt engineering", "vr design", "metaverse music",
+    "decentralization research", "emotional leadership", "mindfulness", "investing in defi",
+    "productivity systems", "algorithms", "physics of computation", "writing", "gardening", "cooking"
+]
+ACTIVITY_TYPES = [
+    "YouTube videos", "Podcasts", "Group discussions", "Hands-on projects", "Coding exercises",
+    "Blog articles", "Lecture notes", "API documentation", "Infographic images", "Flashcards"
+]
+TOPICS = ["bitcoin", "defi", "nft", "ai_agents", "prompting", "vr", "zk_proofs", "trading_psychology"]
+LEVELS = ("beginner", "intermediate", "advanced")
+PLATFORMS = ["udemy", "coursera", "youtube", "edx", "medium", "github"]
+WORDS = (
+    "blockchain protocol design security agents prompting spatial computing trading "
+    "cryptography markets leverage attention algorithms influence skills research"
+).split()
+
+def make_rows(count, seed=0):
+    """Profile rows without ids, as passed to ProfileStore.create_profile"""
+    rng = random.Random(seed)
+    return [
+        {
+            "username": f"bench_user_{i}",
+            "interests": rng.sample(INTERESTS, 3),
+            "braved_scores": {key: rng.randint(0, 100) for key in BRAVED_FRAMEWORK},
+            "balajis_scores": {key: rng.randint(0, 100) for key in BALAJIS_FRAMEWORK},
+            "learning_path": {"steps": []}
+        }
+        for i in range(count)
+    ]
+
+def make_topics(count, seed=0):
+    """Topics mentioned by a user (with repeats) and their engagement counts"""
+    rng = random.Random(seed)
+    topics = [rng.choice(INTEREST_TOPICS) for _ in range(count)]
+    engagement = {topic: rng.randint(0, 500) for topic in set(topics)}
+    return topics, engagement
+
+def make_interests(count, seed=0):
+    """Learning opportunities as InterestAnalysisAgent returns them, one per interest category"""
+    rng = random.Random(seed)
+    return {
+        f"category_{index}": {
+            "primary_interest": rng.choice(INTEREST_TOPICS),
+            "secondary_interests": rng.sample(INTEREST_TOPICS, 2),
+            "confidence_score": rng.random()
+        }
+        for index in range(count)
+    }
+
+def make_tweets(count, seed=0, author_id="1"):
+    """Tweets in the Twitter API v2 shape (tweet.fields=created_at,public_metrics)"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            "id": str(10 ** 18 + seed * 10 ** 6 + index),
+            "author_id": author_id,
+            "text": f"Thoughts on {rng.choice(INTEREST_TOPICS)} and {rng.choice(INTEREST_TOPICS)} #{rng.choice(INTERESTS)}",
+            "created_at": (start + timedelta(minutes=rng.randrange(365 * 24 * 60))).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "public_metrics": {
+                "like_count": rng.randint(0, 1000),
+                "retweet_count": rng.randint(0, 200),
+                "reply_count": rng.randint(0, 50),
+                "quote_count": rng.randint(0, 20)
+            }
+        }
+        for index in range(count)
+    ]
+
+def make_availability(seed=0):
+    """Weekly availability windows: weekday evenings and weekend mornings"""
+    rng = random.Random(seed)
+    evenings = [{"day": day, "start_hour": rng.randint(17, 19), "end_hour": 22} for day in range(5)]
+    return evenings + [{"day": day, "start_hour": 9, "end_hour": rng.randint(11, 13)} for day in (5, 6)]
+
+def make_activity_times(count, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2022, 1, 1)
+    return [
+        {
+            "timestamp": start + timedelta(seconds=rng.randrange(3 * 365 * 24 * 3600)),
+            "success_rate": rng.random()
+        }
+        for _ in range(count)
+    ]
+
+def make_activities(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {"type": rng.choice(ACTIVITY_TYPES), "engagement_score": rng.random()}
+        for _ in range(count)
+    ]
+
+def make_quiz_results(count, seed=0):
+    rng = random.Random(seed)
+    results = []
+    for _ in range(count):
+        total = rng.randint(5, 20)
+        results.append({
+            "topic": rng.choice(TOPICS),
+            "total_questions": total,
+            "correct_answers": rng.randint(0, total)
+        })
+    return results
+
+def make_mastery_table(count, seed=0):
+    rng = random.Random(seed)
+    return {
+        "name": [f"topic_{index}" for index in range(count)],
+        "quiz_scores": [[rng.random() for _ in range(rng.randint(1, 8))] for _ in range(count)],
+        "project_completion": [rng.random() for _ in range(count)],
+        "time_spent": [rng.uniform(0, 40) for _ in range(count)],
+        "expected_time": [rng.uniform(1, 30) for _ in range(count)],
+        "engagement_score": [rng.random() for _ in range(count)]
+    }
+
+def make_learning_events(count, seed=0):
+    """Activity log events combining timing, activity type and quiz fields"""
+    return [
+        {**timing, **activity, "topic": quiz["topic"], "total_questions": quiz["total_questions"],
+         "correct_answers": quiz["correct_answers"]}
+        for timing, activity, quiz in zip(
+            make_activity_times(count, seed), make_activities(count, seed), make_quiz_results(count, seed)
+        )
+    ]
+
+def _phrase(rng, words=4):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+def _recommendation(rng, name):
+    return {
+        "name": name,
+        "description": _phrase(rng, 12),
+        "current_score": rng.randint(1, 100),
+        "learning_path": {
+            level: {"title": _phrase(rng), "steps": [_phrase(rng, 5) for _ in range(4)]}
+            for level in LEVELS
+        },
+        "resources": {
+            kind: [
+                {
+                    "platform": rng.choice(PLATFORMS),
+                    "title": _phrase(rng, 5),
+                    "url": f"https://{rng.choice(PLATFORMS)}.com/{rng.randrange(10 ** 6)}",
+                    "level": rng.choice(LEVELS)
+                }
+                for _ in range(rng.randint(2, 4))
+            ]
+            for kind in ("courses", "books", "youtube_channels", "communities")
+        },
+        "projects": [
+            {
+                "title": _phrase(rng),
+                "description": _phrase(rng, 10),
+                "difficulty": rng.choice(LEVELS),
+                "skills": [rng.choice(WORDS) for _ in range(3)]
+            }
+            for _ in range(3)
+        ]
+    }
+
+def make_analysis_result(seed=0):
+    """One /analyze response body: both frameworks' recommendations plus a learning path"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    modules = [
+        {
+            "title": _phrase(rng),
+            "duration_weeks": 4,
+            "start_date": (start + timedelta(weeks=4 * i)).isoformat(),
+            "milestones": [
+                {"week": week + 1, "description": f"Week {week + 1} objectives", "tasks": _phrase(rng, 6)}
+                for week in range(4)
+            ]
+        }
+        for i in range(8)
+    ]
+    return {
+        "status": "success",
+        "data": {
+            "braved_scores": {key: rng.randint(0, 100) for key in BRAVED_FRAMEWORK},
+            "balajis_scores": {key: rng.randint(0, 100) for key in BALAJIS_FRAMEWORK},
+            "braved_analysis": {
+                "recommendations": {key: _recommendation(rng, name) for key, name in BRAVED_FRAMEWORK.items()}
+            },
+            "balajis_analysis": {
+                "recommendations": {key: _recommendation(rng, name) for key, name in BALAJIS_FRAMEWORK.items()}
+            },
+            "learning_path": {"modules": modules, "total_duration_weeks": 4 * len(modules)}
+        },
+        "message": "Analysis completed and stored in Supabase"
+    }
@@ -0,0 +1,123 @@
+"""
+Timing, result files and comparisons for the benchmark suite.
+
+A result is {"value", "unit", "higher_is_better"}. Timings are seconds per
+call, the best of several rounds of calls (the least disturbed
+measurement); each round runs enough calls to take at least min_time.
+Result files carry the commit and machine they were measured on, so two
+files can be compared with compare().
+"""
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import numpy as np
+
+Result = Dict[str, Any]
+
+def metric(value: float, unit: str = "s", higher_is_better: bool = False) -> Result:
+    return {"value": float(value), "unit": unit, "higher_is_better": higher_is_better}
+
+def measure(function: Callable[[], Any], repeat: int = 5, min_time: float = 0.05) -> Result:
+    """Seconds per call of function()"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return metric(best)
+
+def measure_async(function: Callable[[], Awaitable[Any]], repeat: int = 5, min_time: float = 0.05) -> Result:
+    """Seconds per call of await function(), on one event loop"""
+    loop = asyncio.new_event_loop()
+    try:
+        return measure(lambda: loop.run_until_complete(function()), repeat, min_time)
+    finally:
+        loop.close()
+
+def latency_summary(latencies: List[float]) -> Dict[str, Result]:
+    """Mean and percentiles of per-request latencies, in seconds"""
+    samples = np.asarray(latencies)
+    summary = {"mean": metric(samples.mean())}
+    for percentile in (50, 95, 99):
+        summary[f"p{percentile}"] = metric(np.percentile(samples, percentile))
+    return summary
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment() -> Dict[str, Any]:
+    """What a result depends on besides the code: commit, interpreter and machine"""
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count()
+    }
+
+def save_results(path: str, scale: str, results: Dict[str, Result]):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as output:
+        json.dump({"environment": environment(), "scale": scale, "results": results}, output, indent=2, sort_keys=True)
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path) as results:
+        return json.load(results)
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Compare two result files, benchmark by benchmark.
+
+    "change" is the relative change of the value; a benchmark regressed when
+    it got worse by more than threshold and improved when it got better by
+    more than that. Benchmarks missing from either file are reported as
+    "added" or "removed".
+    """
+    old, new = baseline["results"], current["results"]
+    rows = []
+    for name in sorted(set(old) | set(new)):
+        if name not in old or name not in new:
+            rows.append({"name": name, "verdict": "added" if name in new else "removed"})
+            continue
+        before, after = old[name]["value"], new[name]["value"]
+        change = (after - before) / before if before else 0.0
+        better = -change if not new[name]["higher_is_better"] else change
+        if better < -threshold:
+            verdict = "regressed"
+        elif better > threshold:
+            verdict = "improved"
+        else:
+            verdict = "unchanged"
+        rows.append({
+            "name": name, "before": before, "after": after, "unit": new[name]["unit"],
+            "change": change, "verdict": verdict
+        })
+    return rows
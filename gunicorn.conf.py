@@ -0,0 +1,41 @@
+"""
+Production server settings.
+
+    gunicorn src.main:app -c gunicorn.conf.py
+
+With preload_app the application is imported once in the master, which
+then builds the remaining read-only state (src.main.preload) and freezes
+the garbage collector so that workers forked from it share those pages
+instead of copying them. benchmarks/bench_worker_memory.py measures the
+per-worker memory with and without preloading.
+
+Workers share their state through the profile store; what a worker keeps
+in memory follows the others' writes through the event feed (see "Running
+several workers" in the README).
+"""
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") != "0"
+timeout = 120
+graceful_timeout = 30
+
+if preload_app:
+    # No collections while the app is imported: freeing cycles would leave
+    # holes in shared pages that later allocations in the workers fill.
+    gc.disable()
+
+def when_ready(server):
+    if not server.cfg.preload_app:
+        return
+    from src.main import preload
+    preload()
+    # Objects that exist now move to a permanent generation the collector
+    # never scans, so collections in the workers don't write to (and copy)
+    # the pages holding them.
+    gc.freeze()
+    gc.enable()
@@ -0,0 +1,12 @@
+"""
+HTTP load testing of the API against local stand-ins for its services.
+
+    python -m loadtest --concurrency 1,4,16,64
+
+fake_postgrest serves the profiles table the way Supabase's PostgREST
+does and fake_twitter the Twitter API v2 endpoints the social media agent
+calls, both with configurable latency and errors (faults). workload
+drives the running app over HTTP with a mix of profile CRUD, /analyze and
+/neuroscience requests and reports throughput, latency percentiles and
+error rates at each concurrency of a ramp. See __main__ for the runner.
+"""
@@ -0,0 +1,253 @@
+"""
+Load test the API over HTTP, ramping up concurrency.
+
+    python -m loadtest --concurrency 1,4,16,64 --stage-seconds 20
+    python -m loadtest --workers 4 --db-latency-ms 5 --twitter-latency-ms 150 --output run.json
+    python -m loadtest --app-url http://staging:8000 --mix get_profile=4,analyze=1
+
+Starts fake_postgrest and fake_twitter on free local ports, the app under
+gunicorn (gunicorn.conf.py) with STORAGE_BACKEND=supabase pointed at them,
+seeds --profiles profiles, then runs one stage per concurrency level and
+prints a row per stage: throughput, latency percentiles, the share of
+errors and of 429s from admission control, and the requests the stand-ins
+received per second. With --app-url the app at that URL is tested as is
+and nothing is started; profiles are then seeded through the API.
+
+The client runs in this one process, so make sure it isn't the bottleneck:
+when throughput stops growing but the app's workers are not busy, run
+several instances instead of raising the concurrency.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+import httpx
+from benchmarks.data import make_rows
+from benchmarks.harness import environment
+from loadtest.faults import CONTROL_PREFIX, add_fault_arguments, fault_command_line, fault_options
+from loadtest.workload import DEFAULT_MIX, Workload, parse_mix, run_stage
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICE_KEY = "loadtest"
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class Server:
+    """A subprocess serving HTTP, with its output in a log file"""
+
+    def __init__(self, name: str, command: List[str], url: str, log_dir: str, env: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.url = url
+        self.log_path = os.path.join(log_dir, f"{name}.log")
+        with open(self.log_path, "w") as log:
+            self.process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+    def wait_ready(self, path: str, timeout: float = 60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                if httpx.get(self.url + path, timeout=1).status_code < 500:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        with open(self.log_path) as log:
+            output = log.read()[-4000:]
+        raise RuntimeError(f"{self.name} did not start:\n{output}")
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+def start_servers(args, log_dir: str) -> Dict[str, Server]:
+    """The stand-ins and the app, ready to serve"""
+    python = [sys.executable, "-m"]
+    database_port, twitter_port, app_port = free_port(), free_port(), free_port()
+    database_command = python + ["loadtest.fake_postgrest", "--port", str(database_port)]
+    for column in args.db_extra_column:
+        database_command += ["--extra-column", column]
+    twitter_command = python + ["loadtest.fake_twitter", "--port", str(twitter_port)]
+    if args.twitter_rate_limit:
+        twitter_command += ["--rate-limit", str(args.twitter_rate_limit)]
+    if args.seed is not None:
+        database_command += ["--seed", str(args.seed)]
+        twitter_command += ["--seed", str(args.seed)]
+
+    servers = {}
+    try:
+        servers["database"] = Server(
+            "fake_postgrest", database_command + fault_command_line(fault_options(args, "db-")),
+            f"http://127.0.0.1:{database_port}", log_dir
+        )
+        servers["twitter"] = Server(
+            "fake_twitter", twitter_command + fault_command_line(fault_options(args, "twitter-")),
+            f"http://127.0.0.1:{twitter_port}", log_dir
+        )
+        env = {
+            **os.environ,
+            "STORAGE_BACKEND": "supabase",
+            "SUPABASE_URL": servers["database"].url,
+            "SUPABASE_SERVICE_KEY": SERVICE_KEY,
+            "TWITTER_API_URL": servers["twitter"].url,
+            "TWITTER_API_KEY": SERVICE_KEY,
+            "TWITTER_API_SECRET": SERVICE_KEY,
+            "GUNICORN_BIND": f"127.0.0.1:{app_port}",
+            "WEB_CONCURRENCY": str(args.workers),
+            "LEADERBOARD_SNAPSHOT_PATH": os.path.join(log_dir, "leaderboard_snapshot.npz"),
+            "ACTIVITY_LOG_PATH": os.path.join(log_dir, "activity_log")
+        }
+        servers["app"] = Server(
+            "app", [sys.executable, "-m", "gunicorn", "src.main:app", "-c", "gunicorn.conf.py"],
+            f"http://127.0.0.1:{app_port}", log_dir, env
+        )
+        servers["database"].wait_ready(f"{CONTROL_PREFIX}/stats")
+        servers["twitter"].wait_ready(f"{CONTROL_PREFIX}/stats")
+        servers["app"].wait_ready("/")
+    except BaseException:
+        for server in servers.values():
+            server.stop()
+        raise
+    return servers
+
+async def seed_profiles(client: httpx.AsyncClient, count: int, database_url: Optional[str]) -> List[str]:
+    """Create count profiles, straight into the stand-in when there is one, and return their ids"""
+    rows = make_rows(count)
+    for index, row in enumerate(rows):
+        row["username"] = f"loadtest_seed_{index}"
+    if database_url:
+        headers = {"apikey": SERVICE_KEY, "Prefer": "return=representation"}
+        ids = []
+        for start in range(0, count, 1000):
+            response = await client.post(
+                f"{database_url}/rest/v1/profiles", json=rows[start:start + 1000], headers=headers
+            )
+            response.raise_for_status()
+            ids.extend(row["id"] for row in response.json())
+        return ids
+
+    ids = []
+    for start in range(0, count, 50):
+        responses = await asyncio.gather(*(client.post("/profiles/", json=row) for row in rows[start:start + 50]))
+        for response in responses:
+            response.raise_for_status()
+            ids.append(response.json()["id"])
+    return ids
+
+async def upstream_counters(client: httpx.AsyncClient, servers: Dict[str, "Server"]) -> Dict[str, Dict]:
+    counters = {}
+    for name in ("database", "twitter"):
+        if name in servers:
+            counters[name] = (await client.get(f"{servers[name].url}{CONTROL_PREFIX}/stats")).json()
+    return counters
+
+def upstream_rates(before: Dict[str, Dict], after: Dict[str, Dict], elapsed: float) -> Dict[str, Dict]:
+    """Requests per second each stand-in served during a stage, and its injected errors and 429s"""
+    rates = {}
+    for name, counters in after.items():
+        rates[name] = {
+            key: counters[key] - before[name][key]
+            for key in ("requests", "injected_errors", "rate_limited") if key in counters
+        }
+        rates[name]["throughput"] = rates[name]["requests"] / elapsed
+    return rates
+
+def _ms(value: Optional[float]) -> str:
+    return f"{value:>8.1f}" if value is not None else f"{'-':>8}"
+
+def print_stage(stage: Dict, by_operation: bool):
+    upstream = stage.get("upstream", {})
+    print(
+        f"{stage['concurrency']:>11} {stage['requests']:>9} {stage['throughput']:>9.1f} "
+        f"{_ms(stage['p50_ms'])} {_ms(stage['p90_ms'])} {_ms(stage['p99_ms'])} {_ms(stage['max_ms'])} "
+        f"{stage['error_rate']:>7.1%} {stage['rejected_rate']:>7.1%} "
+        f"{upstream.get('database', {}).get('throughput', 0):>8.1f} {upstream.get('twitter', {}).get('throughput', 0):>8.1f}",
+        flush=True
+    )
+    if by_operation:
+        for name, operation in stage["operations"].items():
+            print(
+                f"{'':>4}{name:<16} {operation['requests']:>9} {operation['throughput']:>9.1f} "
+                f"{_ms(operation['p50_ms'])} {_ms(operation['p90_ms'])} {_ms(operation['p99_ms'])} "
+                f"{_ms(operation['max_ms'])} {operation['error_rate']:>7.1%} {operation['rejected_rate']:>7.1%}"
+            )
+
+async def run(args, servers: Dict[str, Server]) -> List[Dict]:
+    base_url = args.app_url or servers["app"].url
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+    limits = httpx.Limits(max_connections=max(concurrency_levels), max_keepalive_connections=max(concurrency_levels))
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        database = servers.get("database")
+        profile_ids = await seed_profiles(client, args.profiles, database.url if database else None)
+        workload = Workload(client, profile_ids, args.seed or 0)
+
+        print(
+            f"{'concurrency':>11} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+            f"{'max ms':>8} {'errors':>7} {'429s':>7} {'db req/s':>8} {'tw req/s':>8}"
+        )
+        stages = []
+        for concurrency in concurrency_levels:
+            before = await upstream_counters(client, servers)
+            stage = await run_stage(workload, concurrency, args.stage_seconds, mix)
+            stage["upstream"] = upstream_rates(before, await upstream_counters(client, servers), stage["elapsed"])
+            stages.append(stage)
+            print_stage(stage, args.by_operation)
+            if args.max_error_rate is not None and stage["error_rate"] > args.max_error_rate:
+                print(f"stopping: error rate above {args.max_error_rate:.1%}")
+                break
+    return stages
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m loadtest", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32,64", help="comma separated ramp of concurrent clients")
+    parser.add_argument("--stage-seconds", type=float, default=10, help="duration of each ramp stage")
+    parser.add_argument("--mix", help=f"operation weights as name=weight,... (default {DEFAULT_MIX})")
+    parser.add_argument("--profiles", type=int, default=1000, help="profiles seeded before the ramp")
+    parser.add_argument("--timeout", type=float, default=30, help="request timeout, in seconds")
+    parser.add_argument("--max-error-rate", type=float, help="stop the ramp after a stage with more errors")
+    parser.add_argument("--by-operation", action="store_true", help="also print each operation's row")
+    parser.add_argument("--output", help="write the configuration and every stage's results to this JSON file")
+    parser.add_argument("--seed", type=int, help="seed of the workload and the injected faults")
+    parser.add_argument("--app-url", help="test the app at this URL instead of starting it with the stand-ins")
+    parser.add_argument("--workers", type=int, default=1, help="gunicorn workers of the started app")
+    parser.add_argument(
+        "--db-extra-column", action="append", default=[],
+        help="columns the stand-in database accepts besides the migrated ones"
+    )
+    parser.add_argument("--twitter-rate-limit", type=int, help="requests per 15 minutes and endpoint before 429")
+    add_fault_arguments(parser, "db-")
+    add_fault_arguments(parser, "twitter-")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        servers = start_servers(args, log_dir) if not args.app_url else {}
+        try:
+            stages = asyncio.run(run(args, servers))
+        finally:
+            for server in servers.values():
+                server.stop()
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump({"environment": environment(), "config": vars(args), "stages": stages}, output, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,358 @@
+"""
+In-memory stand-in for Supabase's PostgREST API, serving the profiles,
+events and user_state tables.
+
+    python -m loadtest.fake_postgrest --port 54321 --latency-ms 5
+
+Implements the part of PostgREST that SupabaseProfileStore uses: GET with
+column filters (eq, neq, gt, gte, lt, lte, in, is, ov, each optionally
+negated with not.), jsonb paths (col->key, col->>key), select, order,
+limit and offset; POST of a row or a list of rows; PATCH and DELETE by
+filter; and Prefer: return=representation. Like PostgREST it answers 400
+for columns the table doesn't have, 409 for a taken primary key and 401
+without an apikey. Rows get their generated columns (id, created_at,
+updated_at) on insert and a new updated_at on update.
+
+Filters are evaluated by scanning the table (an id=eq. filter is a
+lookup), so keep the table to some tens of thousands of rows if the stand-in
+itself shouldn't add latency. GET /_loadtest/stats returns the counters.
+"""
+import argparse
+import csv
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import orjson
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from src.config.settings import BALAJIS_FRAMEWORK, BRAVED_FRAMEWORK
+from src.storage.base import EVENT_COLUMNS, PROFILE_COLUMNS, USER_STATE_COLUMNS
+from loadtest.faults import CONTROL_PREFIX, Faults, add_fault_arguments, fault_options
+
+TIMESTAMP_COLUMNS = ("created_at", "updated_at")
+# Query parameters that aren't column filters
+RESERVED_PARAMS = ("select", "order", "limit", "offset")
+
+Path = Tuple[str, Optional[str], bool]  # column, jsonb key, ->> (as text)
+
+class PostgrestError(Exception):
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+def parse_path(name: str) -> Path:
+    """'braved_scores->ai' -> ('braved_scores', 'ai', False)"""
+    for arrow, as_text in (("->>", True), ("->", False)):
+        if arrow in name:
+            column, _, key = name.partition(arrow)
+            return column, key, as_text
+    return name, None, False
+
+def parse_list(literal: str) -> List[str]:
+    """Items of '(a,b)' or '{"a","b"}', with double quotes and backslash escapes"""
+    inner = literal[1:-1] if literal[:1] in "({" else literal
+    if not inner:
+        return []
+    return next(csv.reader([inner], doublequote=False, escapechar="\\"))
+
+def parse_timestamp(value: str) -> datetime:
+    timestamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
+
+def resolve(row: Dict[str, Any], path: Path) -> Any:
+    column, key, as_text = path
+    value = row.get(column)
+    if key is not None:
+        value = value.get(key) if isinstance(value, dict) else None
+        if as_text and value is not None and not isinstance(value, str):
+            value = orjson.dumps(value).decode()
+    return value
+
+def coerce(value: Any, literal: str, column: str) -> Any:
+    """A filter literal converted to compare with value"""
+    if column in TIMESTAMP_COLUMNS:
+        return parse_timestamp(literal)
+    if isinstance(value, bool):
+        return literal == "true"
+    if isinstance(value, (int, float)):
+        return float(literal)
+    return literal
+
+def _compare(operator: str) -> Callable[[Any, Any], bool]:
+    return {
+        "eq": lambda a, b: a == b,
+        "neq": lambda a, b: a != b,
+        "gt": lambda a, b: a > b,
+        "gte": lambda a, b: a >= b,
+        "lt": lambda a, b: a < b,
+        "lte": lambda a, b: a <= b
+    }[operator]
+
+def parse_filter(name: str, expression: str) -> Tuple[Path, Callable[[Dict[str, Any]], bool]]:
+    """A predicate on rows for a filter such as braved_scores->ai=gte.70"""
+    path = parse_path(name)
+    column = path[0]
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    operator, _, literal = expression.partition(".")
+
+    if operator == "is":
+        target = {"null": None, "true": True, "false": False}.get(literal, literal)
+        test = lambda value: value is target
+    elif operator == "in":
+        items = parse_list(literal)
+        test = lambda value: value is not None and any(value == coerce(value, item, column) for item in items)
+    elif operator == "ov":
+        items = set(parse_list(literal))
+        test = lambda value: bool(value) and not items.isdisjoint(value)
+    elif operator in ("eq", "neq", "gt", "gte", "lt", "lte"):
+        compare = _compare(operator)
+        def test(value):
+            if value is None:
+                return False
+            if column in TIMESTAMP_COLUMNS:
+                value = parse_timestamp(value)
+            return compare(value, coerce(value, literal, column))
+    else:
+        raise PostgrestError(400, "PGRST100", f"unknown operator '{operator}' in filter {name}={expression}")
+
+    if negate:
+        return path, lambda row: not test(resolve(row, path))
+    return path, lambda row: test(resolve(row, path))
+
+class Table:
+    """A table as a dict of rows by primary key, in insertion order"""
+
+    name: str
+    key: Tuple[str, ...] = ("id",)
+
+    def __init__(self, columns: Iterable[str]):
+        self.columns = set(columns)
+        self.rows: Dict[Any, Dict[str, Any]] = {}
+        self._last_timestamp = datetime.now(timezone.utc)
+
+    def _now(self) -> str:
+        # Versions must differ between two updates of a row, as clock_timestamp() does
+        now = max(datetime.now(timezone.utc), self._last_timestamp + timedelta(microseconds=1))
+        self._last_timestamp = now
+        return now.isoformat()
+
+    def _new_row(self, now: str) -> Dict[str, Any]:
+        """Column defaults and generated columns of an inserted row"""
+        return {}
+
+    def _row_key(self, row: Dict[str, Any]) -> Any:
+        return tuple(row.get(column) for column in self.key)
+
+    def _lookup(self, name: str, expression: str) -> Optional[List[Dict[str, Any]]]:
+        """Rows found by primary key for a filter, or None when it needs a scan"""
+        return None
+
+    def _check_columns(self, data: Dict[str, Any]):
+        for column in data:
+            if column not in self.columns:
+                raise PostgrestError(
+                    400, "PGRST204", f"Could not find the '{column}' column of '{self.name}' in the schema cache"
+                )
+
+    def _matching(self, filters: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        candidates: Iterable[Dict[str, Any]] = self.rows.values()
+        predicates = []
+        for name, expression in filters:
+            found = self._lookup(name, expression)
+            if found is not None:
+                candidates = found
+                continue
+            path, predicate = parse_filter(name, expression)
+            self._check_columns({path[0]: None})
+            predicates.append(predicate)
+        return [row for row in candidates if all(predicate(row) for predicate in predicates)]
+
+    def insert(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for data in rows:
+            self._check_columns(data)
+        new_rows = []
+        for data in rows:
+            row = self._new_row(self._now())
+            row.update(data)
+            new_rows.append(row)
+        keys = [self._row_key(row) for row in new_rows]
+        if len(set(keys)) < len(keys) or any(key in self.rows for key in keys):
+            raise PostgrestError(409, "23505", f'duplicate key value violates unique constraint "{self.name}_pkey"')
+        for key, row in zip(keys, new_rows):
+            self.rows[key] = row
+        return new_rows
+
+    def select(self, filters: List[Tuple[str, str]], order: Optional[str] = None,
+               limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        rows = self._matching(filters)
+        # Sort by the last term first; each sort is stable
+        for term in reversed(order.split(",") if order else []):
+            name, *modifiers = term.split(".")
+            path = parse_path(name)
+            descending = "desc" in modifiers
+            nulls_first = "nullsfirst" in modifiers or (descending and "nullslast" not in modifiers)
+            nulls = [row for row in rows if resolve(row, path) is None]
+            values = sorted(
+                (row for row in rows if resolve(row, path) is not None),
+                key=lambda row: resolve(row, path), reverse=descending
+            )
+            rows = nulls + values if nulls_first else values + nulls
+        return rows[offset:offset + limit if limit is not None else None]
+
+    def update(self, filters: List[Tuple[str, str]], data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        self._check_columns(data)
+        rows = self._matching(filters)
+        for row in rows:
+            row.update(data)
+            if "updated_at" in self.columns:
+                row["updated_at"] = self._now()
+        return rows
+
+    def delete(self, filters: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        rows = self._matching(filters)
+        for row in rows:
+            del self.rows[self._row_key(row)]
+        return rows
+
+class ProfileTable(Table):
+    """The profiles table; rows are looked up by id without a scan"""
+
+    name = "profiles"
+
+    def __init__(self, columns: Iterable[str] = PROFILE_COLUMNS):
+        super().__init__(columns)
+
+    def _new_row(self, now: str) -> Dict[str, Any]:
+        return {
+            "id": str(uuid.uuid4()),
+            "username": None,
+            "interests": [],
+            "braved_scores": {key: 0 for key in BRAVED_FRAMEWORK},
+            "balajis_scores": {key: 0 for key in BALAJIS_FRAMEWORK},
+            "learning_path": None,
+            "created_at": now,
+            "updated_at": now,
+            "neuroscience_insights": None
+        }
+
+    def _row_key(self, row: Dict[str, Any]) -> Any:
+        return row["id"]
+
+    def _lookup(self, name: str, expression: str) -> Optional[List[Dict[str, Any]]]:
+        if name != "id" or not expression.startswith("eq."):
+            return None
+        row = self.rows.get(expression[3:])
+        return [row] if row else []
+
+class EventTable(Table):
+    """The events table, with ids from an identity column"""
+
+    name = "events"
+
+    def __init__(self):
+        super().__init__(EVENT_COLUMNS)
+        self._next_id = 1
+
+    def _new_row(self, now: str) -> Dict[str, Any]:
+        row = {"id": self._next_id, "data": None, "created_at": now}
+        self._next_id += 1
+        return row
+
+class UserStateTable(Table):
+    """The user_state table, keyed by (user_id, kind)"""
+
+    name = "user_state"
+    key = ("user_id", "kind")
+
+    def __init__(self):
+        super().__init__(USER_STATE_COLUMNS)
+
+    def _new_row(self, now: str) -> Dict[str, Any]:
+        return {"updated_at": now}
+
+def _json(content: Any, status_code: int = 200) -> Response:
+    return Response(orjson.dumps(content), status_code=status_code, media_type="application/json")
+
+def _project(rows: List[Dict[str, Any]], select: Optional[str]) -> List[Dict[str, Any]]:
+    if not select or select == "*":
+        return rows
+    columns = select.split(",")
+    return [{column: row.get(column) for column in columns} for row in rows]
+
+def create_app(table: Optional[ProfileTable] = None, **faults) -> Faults:
+    """The stand-in as an ASGI app, with the given profiles table; faults are the Faults keyword arguments"""
+    profiles = table or ProfileTable()
+    tables: Dict[str, Table] = {table.name: table for table in (profiles, EventTable(), UserStateTable())}
+    methods: Dict[str, int] = {}
+
+    async def rows_endpoint(request: Request) -> Response:
+        table = tables.get(request.path_params["table"])
+        if table is None:
+            return _json({"code": "42P01", "message": f"relation \"{request.path_params['table']}\" does not exist"}, 404)
+        if "apikey" not in request.headers:
+            return _json({"message": "No API key found in request"}, 401)
+        methods[request.method] = methods.get(request.method, 0) + 1
+
+        params = request.query_params
+        filters = [(name, value) for name, value in params.multi_items() if name not in RESERVED_PARAMS]
+        representation = "return=representation" in request.headers.get("prefer", "")
+        try:
+            if request.method == "GET":
+                rows = table.select(
+                    filters, params.get("order"),
+                    int(params["limit"]) if "limit" in params else None, int(params.get("offset", 0))
+                )
+                return _json(_project(rows, params.get("select")))
+            if request.method == "POST":
+                body = orjson.loads(await request.body())
+                rows = table.insert(body if isinstance(body, list) else [body])
+                status = 201
+            elif request.method == "PATCH":
+                rows = table.update(filters, orjson.loads(await request.body()))
+                status = 200
+            else:
+                rows = table.delete(filters)
+                status = 200
+        except PostgrestError as error:
+            return _json({"code": error.code, "details": None, "hint": None, "message": str(error)}, error.status)
+        except (ValueError, TypeError) as error:
+            return _json({"code": "22P02", "details": None, "hint": None, "message": str(error)}, 400)
+        if not representation:
+            return Response(status_code=201 if status == 201 else 204)
+        return _json(_project(rows, params.get("select")), status)
+
+    async def stats_endpoint(request: Request) -> Response:
+        return _json({**app.counters(), "methods": methods, "rows": len(profiles.rows)})
+
+    app = Faults(
+        Starlette(routes=[
+            Route(f"{CONTROL_PREFIX}/stats", stats_endpoint),
+            Route("/rest/v1/{table}", rows_endpoint, methods=["GET", "POST", "PATCH", "DELETE"])
+        ]),
+        **faults
+    )
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument(
+        "--extra-column", action="append", default=[],
+        help="accept a column the migrations don't define yet"
+    )
+    parser.add_argument("--seed", type=int, help="seed of the injected faults")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    app = create_app(ProfileTable(PROFILE_COLUMNS + tuple(args.extra_column)), seed=args.seed, **fault_options(args))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Stand-in for the Twitter API v2 endpoints the social media agent calls.
+
+    python -m loadtest.fake_twitter --port 54322 --latency-ms 80 --rate-limit 900
+
+GET /2/users/by/username/{username} answers with a user whose id is
+derived from the username, and GET /2/users/{id}/tweets with up to
+max_results synthetic tweets (benchmarks/data.py), the same ones for the
+same user on every call. With --rate-limit, each endpoint allows that many
+requests per --rate-window seconds and then answers 429 with
+x-rate-limit-* headers, as Twitter does. GET /_loadtest/stats returns the
+counters.
+"""
+import argparse
+import time
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import orjson
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from benchmarks.data import make_tweets
+from loadtest.faults import CONTROL_PREFIX, Faults, add_fault_arguments, fault_options
+
+MAX_RESULTS = 100
+# Fields returned whatever tweet.fields asks for
+DEFAULT_TWEET_FIELDS = ("id", "text", "edit_history_tweet_ids")
+
+def user_id(username: str) -> str:
+    return str(zlib.crc32(username.lower().encode()) + 1)
+
+@lru_cache(maxsize=4096)
+def user_tweets(author_id: str) -> List[Dict]:
+    tweets = make_tweets(MAX_RESULTS, seed=int(author_id), author_id=author_id)
+    for tweet in tweets:
+        tweet["edit_history_tweet_ids"] = [tweet["id"]]
+    return tweets
+
+class RateLimit:
+    """Fixed windows of requests per endpoint, counted like Twitter's x-rate-limit headers"""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.windows: Dict[str, List[float]] = {}  # endpoint -> [window reset time, requests]
+        self.limited = 0
+
+    def check(self, endpoint: str) -> Tuple[bool, Dict[str, str]]:
+        """Whether a request is allowed, and its rate limit headers"""
+        now = time.time()
+        window = self.windows.get(endpoint)
+        if window is None or now >= window[0]:
+            window = self.windows[endpoint] = [now + self.window, 0]
+        window[1] += 1
+        allowed = window[1] <= self.limit
+        if not allowed:
+            self.limited += 1
+        return allowed, {
+            "x-rate-limit-limit": str(self.limit),
+            "x-rate-limit-remaining": str(max(0, self.limit - int(window[1]))),
+            "x-rate-limit-reset": str(int(window[0]))
+        }
+
+def _json(content, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(orjson.dumps(content), status_code=status_code, headers=headers, media_type="application/json")
+
+def create_app(rate_limit: Optional[RateLimit] = None, **faults) -> Faults:
+    """The stand-in as an ASGI app; faults are the Faults keyword arguments"""
+
+    def limited(endpoint: str, content) -> Response:
+        if rate_limit is None:
+            return _json(content)
+        allowed, headers = rate_limit.check(endpoint)
+        if not allowed:
+            return _json({"title": "Too Many Requests", "detail": "Too Many Requests", "status": 429}, 429, headers)
+        return _json(content, headers=headers)
+
+    async def user_by_username(request: Request) -> Response:
+        username = request.path_params["username"]
+        return limited("users_by_username", {"data": {"id": user_id(username), "name": username, "username": username}})
+
+    async def users_tweets(request: Request) -> Response:
+        author_id = request.path_params["id"]
+        if not author_id.isdigit():
+            return _json({"title": "Invalid Request", "detail": f"Invalid id: {author_id}"}, 400)
+        max_results = min(int(request.query_params.get("max_results", 10)), MAX_RESULTS)
+        fields = set(DEFAULT_TWEET_FIELDS) | set(filter(None, request.query_params.get("tweet.fields", "").split(",")))
+        tweets = [
+            {field: value for field, value in tweet.items() if field in fields}
+            for tweet in user_tweets(author_id)[:max_results]
+        ]
+        meta = {"result_count": len(tweets)}
+        if tweets:
+            meta.update(newest_id=tweets[0]["id"], oldest_id=tweets[-1]["id"])
+        return limited("users_tweets", {"data": tweets, "meta": meta})
+
+    async def stats_endpoint(request: Request) -> Response:
+        return _json({**app.counters(), "rate_limited": rate_limit.limited if rate_limit else 0})
+
+    app = Faults(
+        Starlette(routes=[
+            Route(f"{CONTROL_PREFIX}/stats", stats_endpoint),
+            Route("/2/users/by/username/{username}", user_by_username),
+            Route("/2/users/{id}/tweets", users_tweets)
+        ]),
+        **faults
+    )
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54322)
+    parser.add_argument("--rate-limit", type=int, help="requests per window and endpoint before 429")
+    parser.add_argument("--rate-window", type=float, default=900, help="rate limit window, in seconds")
+    parser.add_argument("--seed", type=int, help="seed of the injected faults")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    rate_limit = RateLimit(args.rate_limit, args.rate_window) if args.rate_limit else None
+    uvicorn.run(
+        create_app(rate_limit, seed=args.seed, **fault_options(args)),
+        host=args.host, port=args.port, log_level="warning"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Latency and errors injected into the stand-in servers.
+
+Faults wraps an ASGI app: every request waits latency_ms (plus up to
+jitter_ms at random) and fails with error_status at error_rate. Paths
+under /_loadtest are exempt so the runner can always read the counters.
+"""
+import argparse
+import asyncio
+import random
+from typing import Dict, Optional
+from starlette.responses import JSONResponse
+
+# Control endpoints of the stand-ins, never delayed or failed
+CONTROL_PREFIX = "/_loadtest"
+
+class Faults:
+    """ASGI middleware adding latency and errors, and counting requests"""
+
+    def __init__(self, app, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, seed: Optional[int] = None):
+        self.app = app
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.injected_errors = 0
+
+    def counters(self) -> Dict[str, int]:
+        return {"requests": self.requests, "injected_errors": self.injected_errors}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(CONTROL_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        self.requests += 1
+        delay = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.injected_errors += 1
+            response = JSONResponse({"message": "injected fault"}, status_code=self.error_status)
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+def add_fault_arguments(parser: argparse.ArgumentParser, prefix: str = ""):
+    """--latency-ms, --jitter-ms, --error-rate and --error-status, optionally prefixed (e.g. "db-")"""
+    parser.add_argument(f"--{prefix}latency-ms", type=float, default=0.0, help="added to every request")
+    parser.add_argument(f"--{prefix}jitter-ms", type=float, default=0.0, help="random extra latency, up to this")
+    parser.add_argument(f"--{prefix}error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument(f"--{prefix}error-status", type=int, default=503, help="status of the failed requests")
+
+def fault_options(args: argparse.Namespace, prefix: str = "") -> Dict[str, float]:
+    """The Faults keyword arguments parsed by add_fault_arguments"""
+    prefix = prefix.replace("-", "_")
+    return {
+        name: getattr(args, prefix + name)
+        for name in ("latency_ms", "jitter_ms", "error_rate", "error_status")
+    }
+
+def fault_command_line(options: Dict[str, float]) -> list:
+    """fault_options as command line arguments of a stand-in server"""
+    return [
+        argument
+        for name, value in options.items()
+        for argument in (f"--{name.replace('_', '-')}", str(value))
+    ]
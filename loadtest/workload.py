@@ -0,0 +1,182 @@
+"""
+The request mix of a load test and the statistics of each ramp stage.
+
+A stage runs `concurrency` closed-loop clients for a fixed time: each
+picks an operation from the weighted mix, sends it, waits for the answer
+and starts over, so the offered load grows with concurrency until the app
+saturates. Deletes only remove profiles the workload created itself;
+while there are none, a create is sent instead.
+"""
+import asyncio
+import random
+import time
+from typing import Any, Dict, List, Optional
+import httpx
+import numpy as np
+from benchmarks.data import INTERESTS, make_rows, make_topics
+from src.config.settings import SCORE_COLUMNS
+
+# Operation -> relative weight
+DEFAULT_MIX = {
+    "get_profile": 30,
+    "search_profiles": 10,
+    "top_profiles": 5,
+    "create_profile": 10,
+    "update_profile": 10,
+    "delete_profile": 5,
+    "analyze": 20,
+    "neuroscience": 10
+}
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """'get_profile=3,analyze=1' -> {"get_profile": 3.0, "analyze": 1.0}"""
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown operation: {name} (one of {', '.join(DEFAULT_MIX)})")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+class Workload:
+    """The operations of the mix, against profiles known to exist"""
+
+    def __init__(self, client: httpx.AsyncClient, profile_ids: List[str], seed: int = 0):
+        self.client = client
+        self.profile_ids = list(profile_ids)
+        self.created: List[str] = []
+        self.random = random.Random(seed)
+        self.topics, self.engagement = make_topics(50, seed)
+        self._rows = 0
+
+    def pick(self, mix: Dict[str, float]) -> str:
+        name = self.random.choices(list(mix), weights=list(mix.values()))[0]
+        if name == "delete_profile" and not self.created:
+            return "create_profile"
+        return name
+
+    def _profile_id(self) -> str:
+        return self.random.choice(self.profile_ids)
+
+    def _row(self) -> Dict[str, Any]:
+        self._rows += 1
+        row = make_rows(1, seed=self.random.randrange(1 << 30))[0]
+        row["username"] = f"loadtest_{self._rows}"
+        return row
+
+    async def get_profile(self) -> httpx.Response:
+        return await self.client.get(f"/profiles/{self._profile_id()}")
+
+    async def search_profiles(self) -> httpx.Response:
+        component = self.random.choice(list(SCORE_COLUMNS))
+        return await self.client.get("/profiles/search", params={
+            "min_score": f"{component}:{self.random.randrange(50, 95)}",
+            "interest": self.random.sample(INTERESTS, 2),
+            "limit": 20
+        })
+
+    async def top_profiles(self) -> httpx.Response:
+        return await self.client.get(f"/profiles/top/{self.random.choice(list(SCORE_COLUMNS))}")
+
+    async def create_profile(self) -> httpx.Response:
+        response = await self.client.post("/profiles/", json=self._row())
+        if response.status_code == 200:
+            profile_id = response.json()["id"]
+            self.profile_ids.append(profile_id)
+            self.created.append(profile_id)
+        return response
+
+    async def update_profile(self) -> httpx.Response:
+        return await self.client.put(f"/profiles/{self._profile_id()}", json=self._row())
+
+    async def delete_profile(self) -> httpx.Response:
+        profile_id = self.created.pop(self.random.randrange(len(self.created)))
+        self.profile_ids.remove(profile_id)
+        return await self.client.delete(f"/profiles/{profile_id}")
+
+    async def analyze(self) -> httpx.Response:
+        profile_id = self._profile_id()
+        return await self.client.post("/analyze", json={
+            "user_id": profile_id,
+            "task": "analyze_user_profile",
+            "params": {
+                "username": f"user_{profile_id[:8]}",
+                "limit": 100,
+                "topics": self.random.sample(self.topics, 20),
+                "engagement_data": self.engagement
+            }
+        })
+
+    async def neuroscience(self) -> httpx.Response:
+        return await self.client.post("/neuroscience", json={"user_id": self._profile_id()})
+
+class OperationStats:
+    """Latencies and response statuses of one operation; status 0 is a transport error"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Dict[int, int] = {}
+
+    def record(self, latency: float, status: int):
+        self.latencies.append(latency)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def merge(self, other: "OperationStats"):
+        self.latencies.extend(other.latencies)
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+
+def summarize(stats: OperationStats, elapsed: float) -> Dict[str, Any]:
+    """
+    Throughput, latency percentiles (ms) and outcome rates.
+
+    429s are admission control turning requests away and are counted apart
+    from errors: statuses of 400 and up and transport errors.
+    """
+    requests = len(stats.latencies)
+    rejected = stats.statuses.get(429, 0)
+    errors = sum(count for status, count in stats.statuses.items() if status >= 400 or status == 0) - rejected
+    summary = {
+        "requests": requests,
+        "throughput": requests / elapsed if elapsed else 0.0,
+        "error_rate": errors / requests if requests else 0.0,
+        "rejected_rate": rejected / requests if requests else 0.0,
+        "statuses": {str(status): count for status, count in sorted(stats.statuses.items())}
+    }
+    latencies = np.asarray(stats.latencies) * 1000
+    for percentile in (50, 90, 99):
+        summary[f"p{percentile}_ms"] = float(np.percentile(latencies, percentile)) if requests else None
+    summary["max_ms"] = float(latencies.max()) if requests else None
+    return summary
+
+async def run_stage(workload: Workload, concurrency: int, duration: float,
+                    mix: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Run `concurrency` clients for `duration` seconds; the summary of all requests and of each operation"""
+    mix = mix or DEFAULT_MIX
+    operations = {name: OperationStats() for name in DEFAULT_MIX}
+    deadline = time.perf_counter() + duration
+
+    async def client():
+        while time.perf_counter() < deadline:
+            name = workload.pick(mix)
+            start = time.perf_counter()
+            try:
+                status = (await getattr(workload, name)()).status_code
+            except httpx.HTTPError:
+                status = 0
+            operations[name].record(time.perf_counter() - start, status)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    total = OperationStats()
+    for stats in operations.values():
+        total.merge(stats)
+    return {
+        "concurrency": concurrency,
+        "elapsed": elapsed,
+        **summarize(total, elapsed),
+        "operations": {name: summarize(stats, elapsed) for name, stats in operations.items() if stats.latencies}
+    }
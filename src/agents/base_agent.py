@@ -1,11 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
-from supabase import create_client, Client
-from ..config.settings import SUPABASE_URL, SUPABASE_SERVICE_KEY
+from typing import Dict, List, Any, Optional
+from ..storage import get_profile_store
 
 class BaseAgent(ABC):
     def __init__(self):
-        self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        self.store = get_profile_store()
 
     @abstractmethod
     async def process(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -15,24 +14,22 @@ class BaseAgent(ABC):
         """
         pass
 
-    async def save_to_supabase(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    async def save_profile(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Save data to Supabase
+        Save a profile to the configured store
         """
         try:
-            response = self.supabase.table(table).insert(data).execute()
-            return response.data[0]
+            return await self.store.create_profile(data)
         except Exception as e:
-            print(f"Error saving to Supabase: {str(e)}")
+            print(f"Error saving profile: {str(e)}")
             raise
 
-    async def get_from_supabase(self, table: str, query: Dict[str, Any]) -> Dict[str, Any]:
+    async def get_profile(self, profile_id: str) -> Optional[Dict[str, Any]]:
         """
-        Get data from Supabase
+        Get a profile from the configured store
         """
         try:
-            response = self.supabase.table(table).select("*").match(query).execute()
-            return response.data[0] if response.data else None
+            return await self.store.get_profile(profile_id)
         except Exception as e:
-            print(f"Error getting from Supabase: {str(e)}")
-            raise 
\ No newline at end of file
+            print(f"Error getting profile: {str(e)}")
+            raise
@@ -1,7 +1,73 @@
 from agno import Agent, Tool
-from typing import Dict, Any, List
-import json
-from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+from datetime import datetime
+from functools import lru_cache
+from ..services.learning_planner import (
+    catalog_from_modules, catalog_from_recommendations, get_learning_planner, iter_module_schedule, iter_schedule_weeks
+)
+from ..services.session_scheduler import DEFAULT_WEEKLY_HOURS, SessionPlan, availability_mask, slot_scores
+
+# Distinct (topic, skill level, resource types) results kept by the resolver
+RESOURCE_CACHE_SIZE = 1024
+# Frameworks whose recommendations' learning paths become staged modules
+FRAMEWORKS = ("braved", "balajis")
+
+class FrozenDict(dict):
+    """A dict that cannot be modified, so cached results can be shared safely"""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("FrozenDict is immutable")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+def _normalize_resource_key(topic: str, skill_level: str) -> Tuple[str, str]:
+    return topic.strip(), skill_level.strip().lower()
+
+@lru_cache(maxsize=RESOURCE_CACHE_SIZE)
+def _resolve_resources(topic: str, skill_level: str, resource_types: Tuple[str, ...]) -> Mapping[str, Sequence[Mapping[str, str]]]:
+    """Build the resources of a topic once; the result is shared by every caller"""
+    templates = {
+        "courses": (
+            {
+                "title": f"{topic.title()} for {skill_level.title()}s",
+                "platform": "udemy",
+                "url": f"https://udemy.com/courses/{topic}-{skill_level}"
+            },
+            {
+                "title": f"Introduction to {topic}",
+                "platform": "coursera",
+                "url": f"https://coursera.org/learn/{topic}"
+            }
+        ),
+        "books": ({
+            "title": f"The Complete Guide to {topic.title()}",
+            "author": "Expert Author",
+            "url": f"https://books.com/{topic}"
+        },),
+        "videos": ({
+            "title": f"{topic.title()} Tutorial Series",
+            "platform": "youtube",
+            "url": f"https://youtube.com/playlist?list={topic}"
+        },),
+        "communities": ({
+            "title": f"{topic.title()} Community",
+            "platform": "discord",
+            "url": f"https://discord.gg/{topic}"
+        },),
+        "practice": ({
+            "title": f"{topic.title()} Practice Projects",
+            "platform": "github",
+            "url": f"https://github.com/topics/{topic}-projects"
+        },)
+    }
+    return FrozenDict(
+        (resource_type, tuple(FrozenDict(resource) for resource in templates.get(resource_type, ())))
+        for resource_type in resource_types
+    )
 
 class LearningPathAgent(Agent):
     def __init__(self):
@@ -36,17 +102,27 @@ class LearningPathAgent(Agent):
             "practice": ["exercises", "projects", "challenges"]
         }
 
-    async def generate_learning_modules(self, 
-                                      interests: Dict[str, Any], 
-                                      skill_level: str = "beginner") -> List[Dict[str, Any]]:
-        """Generate learning modules based on interests and skill level"""
+    async def generate_learning_modules(self,
+                                      interests: Dict[str, Any],
+                                      skill_level: str = "beginner",
+                                      recommendations: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Generate learning modules based on interests and skill level.
+
+        recommendations maps a framework ("braved" or "balajis") to the
+        recommendations of its analysis agent. Each component's beginner,
+        intermediate and advanced stages then become modules, each requiring
+        the stage before it.
+        """
         modules = []
+        topics = []
         
         for category, data in interests.items():
             if not data.get("primary_interest"):
                 continue
                 
             module = {
+                "module_id": f"interests.{category}",
                 "title": f"{data['primary_interest'].title()} Fundamentals",
                 "category": category,
                 "skill_level": skill_level,
@@ -56,100 +132,131 @@ class LearningPathAgent(Agent):
                     f"Apply {data['primary_interest']} principles in practice",
                     f"Build a foundation for advanced {data['primary_interest']} topics"
                 ],
-                "prerequisites": [],
-                "resources": await self.recommend_resources(
-                    data['primary_interest'],
-                    category,
-                    skill_level
-                )
+                "prerequisites": []
             }
             modules.append(module)
+            topics.append((data['primary_interest'], category, skill_level))
+
+        for framework, framework_recommendations in (recommendations or {}).items():
+            for module_id, module in catalog_from_recommendations(framework, framework_recommendations).items():
+                modules.append({
+                    "module_id": module_id,
+                    "title": module["title"],
+                    "category": framework,
+                    "skill_level": module["level"],
+                    "duration_weeks": module["duration_weeks"],
+                    "objectives": module["steps"],
+                    "prerequisites": module["prerequisites"]
+                })
+                topics.append((module["component"], framework, module["level"]))
+
+        resources = await self.recommend_resources_bulk(topics)
+        for module, module_resources in zip(modules, resources):
+            module["resources"] = module_resources
             
         return modules
 
     async def create_learning_schedule(self, 
                                      modules: List[Dict[str, Any]], 
-                                     start_date: datetime = None) -> Dict[str, Any]:
-        """Create a personalized learning schedule"""
+                                     start_date: datetime = None,
+                                     availability: List[Dict[str, int]] = None,
+                                     optimal_times: List[Dict[str, Any]] = None,
+                                     weekly_hours: int = DEFAULT_WEEKLY_HOURS,
+                                     max_parallel: int = 1,
+                                     time_zone: str = "UTC") -> Dict[str, Any]:
+        """
+        Create a personalized learning schedule.
+
+        Modules are ordered by the learning planner so that every module
+        comes after its prerequisites (module ids listed in "prerequisites");
+        modules without a "module_id" are known by their position. Up to
+        max_parallel modules whose prerequisites are met run side by side.
+
+        The schedule lists each module's dates without its weekly
+        milestones; those come from iter_learning_schedule and
+        iter_schedule_weeks, which walk the same planned order lazily.
+
+        With the learner's weekly availability (and optionally the
+        NeuroscienceAgent optimal learning times), both in local hours of
+        time_zone, modules are placed by the session scheduler in that order
+        and the schedule lists the planned sessions.
+        """
         if not start_date:
             start_date = datetime.now()
-            
-        schedule = {
-            "start_date": start_date.isoformat(),
-            "modules": []
-        }
-        
-        current_date = start_date
-        for module in modules:
-            module_schedule = {
-                "module_title": module["title"],
-                "start_date": current_date.isoformat(),
-                "end_date": (current_date + timedelta(weeks=module["duration_weeks"])).isoformat(),
-                "weekly_commitment": "5-7 hours",
-                "milestones": [
-                    {
-                        "week": i + 1,
-                        "description": f"Week {i + 1} objectives",
-                        "tasks": module["objectives"][i % len(module["objectives"])]
-                    }
-                    for i in range(module["duration_weeks"])
-                ]
-            }
-            schedule["modules"].append(module_schedule)
-            current_date += timedelta(weeks=module["duration_weeks"])
-            
+
+        by_id = {module.get("module_id", f"module.{index}"): module for index, module in enumerate(modules)}
+        schedule = get_learning_planner().schedule(
+            catalog_from_modules(modules), max_parallel=max_parallel, start_date=start_date
+        ).to_dict(milestones=False)
+        if availability:
+            plan = SessionPlan(
+                [{**by_id[entry["module_id"]], "module_id": entry["module_id"]} for entry in schedule["modules"]],
+                availability_mask(availability),
+                slot_scores(optimal_times or []),
+                start_date,
+                weekly_hours,
+                time_zone=time_zone
+            )
+            windows = {window["module_id"]: window for window in plan.module_windows()}
+            for module_schedule in schedule["modules"]:
+                window = windows.get(module_schedule["module_id"])
+                if window:
+                    module_schedule.update(start_date=window["start_date"], end_date=window["end_date"],
+                                           weekly_commitment=f"{weekly_hours} hours")
+            schedule["sessions"] = plan.sessions()
         return schedule
 
+    def iter_learning_schedule(self,
+                               modules: Iterable[Dict[str, Any]],
+                               start_date: datetime,
+                               max_parallel: int = 1) -> Iterator[Dict[str, Any]]:
+        """Yield module schedules with their milestones one at a time, in planned order"""
+        return iter_module_schedule(modules, start_date, max_parallel)
+
+    def iter_schedule_weeks(self,
+                            modules: Iterable[Dict[str, Any]],
+                            start_date: datetime,
+                            start_week: int = 0,
+                            max_parallel: int = 1) -> Iterator[Dict[str, Any]]:
+        """Yield weekly milestones of the planned order on demand, starting at start_week"""
+        return iter_schedule_weeks(modules, start_date, start_week, max_parallel)
+
     async def recommend_resources(self, 
                                 topic: str, 
                                 category: str, 
-                                skill_level: str) -> Dict[str, List[Dict[str, str]]]:
-        """Recommend learning resources for a specific topic"""
-        resources = {}
-        
-        for resource_type, platforms in self.resource_types.items():
-            resources[resource_type] = []
-            
-            # Example resource recommendations
-            if resource_type == "courses":
-                resources[resource_type].extend([
-                    {
-                        "title": f"{topic.title()} for {skill_level.title()}s",
-                        "platform": "udemy",
-                        "url": f"https://udemy.com/courses/{topic}-{skill_level}"
-                    },
-                    {
-                        "title": f"Introduction to {topic}",
-                        "platform": "coursera",
-                        "url": f"https://coursera.org/learn/{topic}"
-                    }
-                ])
-            elif resource_type == "books":
-                resources[resource_type].append({
-                    "title": f"The Complete Guide to {topic.title()}",
-                    "author": "Expert Author",
-                    "url": f"https://books.com/{topic}"
-                })
-            elif resource_type == "videos":
-                resources[resource_type].append({
-                    "title": f"{topic.title()} Tutorial Series",
-                    "platform": "youtube",
-                    "url": f"https://youtube.com/playlist?list={topic}"
-                })
-            elif resource_type == "communities":
-                resources[resource_type].append({
-                    "title": f"{topic.title()} Community",
-                    "platform": "discord",
-                    "url": f"https://discord.gg/{topic}"
-                })
-            elif resource_type == "practice":
-                resources[resource_type].append({
-                    "title": f"{topic.title()} Practice Projects",
-                    "platform": "github",
-                    "url": f"https://github.com/topics/{topic}-projects"
-                })
-                
-        return resources
+                                skill_level: str) -> Mapping[str, Sequence[Mapping[str, str]]]:
+        """
+        Recommend learning resources for a specific topic.
+
+        Results depend only on the topic and skill level (category does not
+        change them), so they are memoized and returned as shared, read-only
+        structures: copy them before modifying.
+        """
+        return _resolve_resources(*_normalize_resource_key(topic, skill_level), tuple(self.resource_types))
+
+    async def recommend_resources_bulk(self,
+                                       requests: Iterable[Tuple[str, str, str]]) -> List[Mapping[str, Sequence[Mapping[str, str]]]]:
+        """Recommend resources for many (topic, category, skill_level) requests, resolving each distinct one once"""
+        resource_types = tuple(self.resource_types)
+        resolved: Dict[Tuple[str, str], Mapping[str, Sequence[Mapping[str, str]]]] = {}
+        results = []
+        for topic, _category, skill_level in requests:
+            key = _normalize_resource_key(topic, skill_level)
+            if key not in resolved:
+                resolved[key] = _resolve_resources(*key, resource_types)
+            results.append(resolved[key])
+        return results
+
+    @staticmethod
+    def resource_cache_info() -> Dict[str, int]:
+        """Get hit/miss statistics of the resource resolver"""
+        info = _resolve_resources.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+
+    @staticmethod
+    def clear_resource_cache():
+        """Drop every memoized resource recommendation"""
+        _resolve_resources.cache_clear()
 
     async def execute(self, task: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a learning path generation task"""
@@ -161,16 +268,40 @@ class LearningPathAgent(Agent):
             if start_date:
                 start_date = datetime.fromisoformat(start_date)
             
-            # Step 1: Generate learning modules
-            modules = await self.generate_learning_modules(interests, skill_level)
+            # Step 1: Generate learning modules, with the BRAVED/BALAJIS learning paths when given
+            recommendations = {
+                framework: params[f"{framework}_recommendations"]
+                for framework in FRAMEWORKS if params.get(f"{framework}_recommendations")
+            }
+            modules = await self.generate_learning_modules(interests, skill_level, recommendations)
             
             # Step 2: Create learning schedule
-            schedule = await self.create_learning_schedule(modules, start_date)
+            schedule = await self.create_learning_schedule(
+                modules,
+                start_date,
+                availability=params.get("availability"),
+                optimal_times=params.get("optimal_learning_times"),
+                time_zone=params.get("timezone", "UTC")
+            )
             
             return {
                 "modules": modules,
                 "schedule": schedule,
-                "total_duration_weeks": sum(module["duration_weeks"] for module in modules)
+                "total_duration_weeks": schedule["total_duration_weeks"]
             }
+
+        if task == "plan_learning_path":
+            # Modules and prerequisites come from the BRAVED/BALAJIS learning paths
+            catalog = {}
+            for framework in FRAMEWORKS:
+                catalog.update(catalog_from_recommendations(framework, params.get(f"{framework}_recommendations", {})))
+            start_date = params.get("start_date")
+            return get_learning_planner().plan(
+                catalog,
+                targets=params.get("targets"),
+                completed=params.get("completed", []),
+                max_parallel=params.get("max_parallel", 2),
+                start_date=datetime.fromisoformat(start_date) if start_date else None
+            )
         
         raise ValueError(f"Unknown task: {task}") 
\ No newline at end of file
@@ -35,7 +35,7 @@ class MrsBeens(BaseAgent):
                 balajis_scores
             )
             
-            # 6. Save to Supabase
+            # 6. Save to the profile store
             profile_data = {
                 "username": data["twitter_handle"],
                 "interests": interests,
@@ -44,7 +44,7 @@ class MrsBeens(BaseAgent):
                 "learning_path": learning_path
             }
             
-            saved_profile = await self.save_to_supabase("profiles", profile_data)
+            saved_profile = await self.save_profile(profile_data)
             
             return {
                 "profile": saved_profile,
@@ -1,6 +1,12 @@
 from agno import Agent, Tool
-from typing import List, Dict, Any
-import json
+from typing import List, Dict, Any, Iterable, Optional
+from ..services.progress_hub import ProgressReporter
+
+# Request params passed on to the learning path generation
+LEARNING_PATH_PARAMS = (
+    "skill_level", "start_date", "availability", "optimal_learning_times", "timezone",
+    "braved_recommendations", "balajis_recommendations"
+)
 
 class MrsBeens(Agent):
     def __init__(self):
@@ -26,13 +32,36 @@ class MrsBeens(Agent):
         """Register a specialized agent with the orchestrator"""
         self.specialized_agents[agent.name] = agent
 
-    async def delegate_task(self, task: str, agent_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Delegate a task to a specialized agent"""
+    async def delegate_task(self,
+                            task: str,
+                            agent_name: str,
+                            params: Dict[str, Any],
+                            progress: Optional[ProgressReporter] = None) -> Dict[str, Any]:
+        """Delegate a task to a specialized agent, reporting its start, end and any scores it produced"""
         if agent_name not in self.specialized_agents:
             raise ValueError(f"Agent {agent_name} not found")
         
         agent = self.specialized_agents[agent_name]
-        return await agent.execute(task, params)
+        if progress is None:
+            return await agent.execute(task, params)
+
+        progress("agent_started", agent=agent_name, task=task)
+        result = await agent.execute(task, params)
+        progress("agent_finished", agent=agent_name, task=task)
+        scores = {key: value for key, value in result.items() if key.endswith("_scores")} if isinstance(result, dict) else {}
+        if scores:
+            progress("partial_scores", agent=agent_name, scores=scores)
+        return result
+
+    @staticmethod
+    def collect_scores(results: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Merge the score maps (braved_scores, balajis_scores) the agents produced, later agents winning"""
+        scores: Dict[str, Dict[str, Any]] = {}
+        for result in results:
+            for key, value in result.items():
+                if key.endswith("_scores") and isinstance(value, dict):
+                    scores.setdefault(key, {}).update(value)
+        return scores
 
     async def aggregate_results(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Aggregate results from multiple agents"""
@@ -42,22 +71,27 @@ class MrsBeens(Agent):
             "summary": "Combined analysis from all agents"
         }
 
-    async def execute(self, task: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a task by coordinating multiple agents"""
+    async def execute(self,
+                      task: str,
+                      params: Dict[str, Any],
+                      progress: Optional[ProgressReporter] = None) -> Dict[str, Any]:
+        """Execute a task by coordinating multiple agents, optionally reporting progress"""
         # Example task execution flow
         if task == "analyze_user_profile":
             # 1. Delegate social media analysis
             social_media_results = await self.delegate_task(
                 "analyze_posts",
                 "SocialMediaAgent",
-                params
+                params,
+                progress
             )
             
             # 2. Delegate interest analysis
             interest_results = await self.delegate_task(
                 "analyze_interests",
                 "InterestAnalysisAgent",
-                params
+                params,
+                progress
             )
             
             # 3. Delegate learning path generation
@@ -66,15 +100,24 @@ class MrsBeens(Agent):
                 "LearningPathAgent",
                 {
                     "social_media_analysis": social_media_results,
-                    "interest_analysis": interest_results
-                }
+                    "interest_analysis": interest_results,
+                    # A module per interest category, staged by the learning planner
+                    "interests": interest_results.get("learning_opportunities", {}),
+                    **{key: params[key] for key in LEARNING_PATH_PARAMS if key in params}
+                },
+                progress
             )
             
-            # 4. Aggregate all results
-            return await self.aggregate_results([
-                social_media_results,
-                interest_results,
-                learning_path
-            ])
+            # 4. Aggregate all results, keeping each agent's under its own key
+            results = {
+                "social_media_analysis": social_media_results,
+                "interest_analysis": interest_results,
+                "learning_path": learning_path
+            }
+            return {
+                **results,
+                **self.collect_scores(results.values()),
+                **await self.aggregate_results(list(results.values()))
+            }
         
-        raise ValueError(f"Unknown task: {task}") 
\ No newline at end of file
+        raise ValueError(f"Unknown task: {task}")
@@ -1,7 +1,24 @@
 from agno import Agent, Tool
 from typing import Dict, Any
+import asyncio
 import tweepy
 import json
+from requests.adapters import HTTPAdapter
+from ..config.settings import TWITTER_API_URL
+
+# tweepy always calls this host
+TWITTER_API_HOST = "https://api.twitter.com"
+
+class _RedirectAdapter(HTTPAdapter):
+    """Sends requests for TWITTER_API_HOST to another base URL"""
+
+    def __init__(self, base_url: str):
+        super().__init__()
+        self.base_url = base_url.rstrip("/")
+
+    def send(self, request, **kwargs):
+        request.url = self.base_url + request.url[len(TWITTER_API_HOST):]
+        return super().send(request, **kwargs)
 
 class SocialMediaAgent(Agent):
     def __init__(self, twitter_api_key: str, twitter_api_secret: str):
@@ -26,13 +43,17 @@ class SocialMediaAgent(Agent):
             consumer_key=twitter_api_key,
             consumer_secret=twitter_api_secret
         )
+        if TWITTER_API_URL.rstrip("/") != TWITTER_API_HOST:
+            self.twitter_client.session.mount(TWITTER_API_HOST + "/", _RedirectAdapter(TWITTER_API_URL))
 
     async def analyze_twitter_posts(self, username: str, limit: int = 100) -> Dict[str, Any]:
         """Analyze Twitter posts for a given username"""
         try:
-            # Get user's recent tweets
-            tweets = self.twitter_client.get_users_tweets(
-                username=username,
+            # Get user's recent tweets; tweepy blocks, so it runs off the event loop
+            user = await asyncio.to_thread(self.twitter_client.get_user, username=username)
+            tweets = await asyncio.to_thread(
+                self.twitter_client.get_users_tweets,
+                user.data.id,
                 max_results=limit,
                 tweet_fields=['created_at', 'public_metrics']
             )
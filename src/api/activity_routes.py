@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from src.agents.neuroscience_agent import NeuroscienceAgent
+from src.storage.activity_log import get_activity_log
+
+router = APIRouter(prefix="/activity", tags=["activity"])
+activity_log = get_activity_log()
+neuroscience_agent = NeuroscienceAgent()
+
+class ActivityEvent(BaseModel):
+    timestamp: datetime
+    type: Optional[str] = None
+    engagement_score: float = 0.0
+    success_rate: float = 0.0
+    topic: Optional[str] = None
+    total_questions: int = 0
+    correct_answers: int = 0
+
+@router.post("/{user_id}")
+async def append_activity(user_id: str, events: List[ActivityEvent]):
+    """Append learning events to a user's activity log"""
+    try:
+        # File writes, locks and compaction block, so they run off the event loop
+        appended = await run_in_threadpool(activity_log.append, user_id, [event.dict() for event in events])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"user_id": user_id, "appended": appended}
+
+@router.get("/{user_id}/insights")
+async def get_activity_insights(user_id: str, since: Optional[datetime] = None, until: Optional[datetime] = None):
+    """Analyze a user's learning patterns over a time range of their activity log"""
+    try:
+        scan = await run_in_threadpool(activity_log.scan, user_id, start=since, end=until)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not len(scan):
+        raise HTTPException(status_code=404, detail="No activity in range")
+    insights = await neuroscience_agent.analyze_activity_columns(scan.columns, scan.types, scan.topics)
+    return {"user_id": user_id, "events": len(scan), **insights}
+
+@router.post("/{user_id}/compact")
+async def compact_activity(user_id: str):
+    """Merge a user's activity log segments"""
+    try:
+        return {"user_id": user_id, "merged_segments": await run_in_threadpool(activity_log.compact, user_id)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
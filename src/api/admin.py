@@ -0,0 +1,11 @@
+import secrets
+from typing import Optional
+from fastapi import Header, HTTPException
+from src.config.settings import ADMIN_API_KEY
+
+async def require_admin(x_admin_key: Optional[str] = Header(None)):
+    """Dependency of maintenance routes: the X-Admin-Key header must match ADMIN_API_KEY"""
+    if not ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="Admin routes are disabled")
+    if not x_admin_key or not secrets.compare_digest(x_admin_key, ADMIN_API_KEY):
+        raise HTTPException(status_code=403, detail="Invalid admin key")
@@ -0,0 +1,226 @@
+"""
+Admission control for expensive routes.
+
+Each controlled route gets a concurrency limit that adapts to latency
+(AIMD: additive increase while latency stays near the best recently seen,
+multiplicative decrease when it degrades or requests fail). Requests over
+the limit wait in per-client queues served fairly: a freed slot goes to the
+waiting client with the fewest requests in flight. Requests that can't be
+queued, or wait longer than the queue timeout, get 429 with Retry-After.
+Limits are per worker process.
+
+A client is the authenticated user when an authentication middleware set
+one, else the client address (behind a proxy, run uvicorn/gunicorn with
+forwarded_allow_ips so that it is the original client's). Ids the client
+sends itself, like X-User-Id or the body's user_id, are not used: rotating
+them would let a client escape its queue.
+"""
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.config.settings import (
+    ANALYZE_INITIAL_CONCURRENCY, ANALYZE_MAX_CONCURRENCY, ANALYZE_QUEUE_SIZE, ANALYZE_QUEUE_TIMEOUT
+)
+
+class Rejected(Exception):
+    """Raised when a request is not admitted; retry_after is in seconds"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Over capacity, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+class AIMDLimit:
+    """
+    Concurrency limit driven by latency.
+
+    Latency is compared with the fastest of the last `window` samples;
+    above tolerance times that, or on failure, the limit is multiplied by
+    backoff (at most once per baseline latency, so one burst of slow
+    responses counts once). Otherwise, while at least half the limit is in
+    use, each success adds 1/limit, i.e. about one slot per limit's worth
+    of requests.
+    """
+
+    def __init__(self,
+                 initial: int = ANALYZE_INITIAL_CONCURRENCY,
+                 min_limit: int = 1,
+                 max_limit: int = ANALYZE_MAX_CONCURRENCY,
+                 backoff: float = 0.9,
+                 tolerance: float = 2.0,
+                 window: int = 200):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self._recent: Deque[float] = deque(maxlen=window)
+        self._last_decrease = 0.0
+        # Smoothed latency, for Retry-After estimates
+        self.average_latency: Optional[float] = None
+
+    @property
+    def capacity(self) -> int:
+        return int(self.limit)
+
+    def on_sample(self, latency: float, inflight: int, failed: bool = False):
+        """Update the limit with a finished request's latency and the in-flight count it saw"""
+        self.average_latency = latency if self.average_latency is None else 0.9 * self.average_latency + 0.1 * latency
+        baseline = min(self._recent) if self._recent else latency
+        self._recent.append(latency)
+        now = time.monotonic()
+        if failed or latency > self.tolerance * baseline:
+            if now - self._last_decrease >= baseline:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_decrease = now
+        elif inflight * 2 >= self.limit:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+
+class AdmissionController:
+    def __init__(self,
+                 limit: Optional[AIMDLimit] = None,
+                 queue_size: int = ANALYZE_QUEUE_SIZE,
+                 queue_timeout: float = ANALYZE_QUEUE_TIMEOUT,
+                 max_user_queue_share: float = 0.25):
+        self.limit = limit or AIMDLimit()
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        # No user may hold more than this share of the queue
+        self.user_queue_size = max(1, math.ceil(queue_size * max_user_queue_share))
+        self.inflight = 0
+        self._user_inflight: Dict[str, int] = {}
+        self._queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self.queued = 0
+
+    def retry_after(self) -> int:
+        """Seconds until the queue ahead is likely drained"""
+        latency = self.limit.average_latency or 1.0
+        return min(60, max(1, math.ceil(latency * (self.queued + 1) / max(self.limit.capacity, 1))))
+
+    def _grant(self, user_id: str):
+        self.inflight += 1
+        self._user_inflight[user_id] = self._user_inflight.get(user_id, 0) + 1
+
+    def _dispatch(self):
+        """Hand free slots to waiting users, fewest in flight first, ties in round-robin order"""
+        while self.queued and self.inflight < self.limit.capacity:
+            user_id = min(self._queues, key=lambda user: self._user_inflight.get(user, 0))
+            queue = self._queues[user_id]
+            waiter = queue.popleft()
+            self.queued -= 1
+            if queue:
+                self._queues.move_to_end(user_id)
+            else:
+                del self._queues[user_id]
+            # A waiter whose wait is being cancelled takes no slot
+            if not waiter.done():
+                self._grant(user_id)
+                waiter.set_result(None)
+
+    async def acquire(self, user_id: str):
+        """Wait for a slot; raises Rejected when the queue is full or the wait times out"""
+        if not self.queued and self.inflight < self.limit.capacity:
+            self._grant(user_id)
+            return
+        queue = self._queues.get(user_id)
+        if self.queued >= self.queue_size or (queue is not None and len(queue) >= self.user_queue_size):
+            raise Rejected(self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(user_id, deque()).append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as error:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as the wait ended: give the slot back
+                self.release(user_id)
+            else:
+                queue = self._queues.get(user_id)
+                if queue is not None and waiter in queue:
+                    queue.remove(waiter)
+                    self.queued -= 1
+                    if not queue:
+                        del self._queues[user_id]
+            if isinstance(error, asyncio.TimeoutError):
+                raise Rejected(self.retry_after())
+            raise
+
+    def release(self, user_id: str, latency: Optional[float] = None, failed: bool = False):
+        """Free a slot, feeding the latency of the finished request to the limit"""
+        if latency is not None:
+            self.limit.on_sample(latency, self.inflight, failed)
+        self.inflight -= 1
+        if self._user_inflight[user_id] == 1:
+            del self._user_inflight[user_id]
+        else:
+            self._user_inflight[user_id] -= 1
+        self._dispatch()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "limit": round(self.limit.limit, 2),
+            "inflight": self.inflight,
+            "queued": self.queued,
+            "average_latency": self.limit.average_latency
+        }
+
+def request_user(scope: Scope) -> str:
+    """Identify the tenant: the authenticated user, else the client address"""
+    user = scope.get("user")
+    if user is not None and getattr(user, "is_authenticated", False):
+        return f"user:{user.display_name}"
+    client = scope.get("client")
+    return f"address:{client[0]}" if client else "anonymous"
+
+class AdmissionMiddleware:
+    def __init__(self,
+                 app: ASGIApp,
+                 controllers: Dict[Tuple[str, str], AdmissionController],
+                 user_key: Callable[[Scope], str] = request_user):
+        self.app = app
+        self.controllers = controllers
+        self.user_key = user_key
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        controller = self.controllers.get((scope.get("method"), scope.get("path"))) if scope["type"] == "http" else None
+        if controller is None:
+            await self.app(scope, receive, send)
+            return
+
+        user_id = self.user_key(scope)
+
+        try:
+            await controller.acquire(user_id)
+        except Rejected as rejection:
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"retry-after", str(rejection.retry_after).encode())
+                ]
+            })
+            await send({"type": "http.response.body", "body": json.dumps({"detail": str(rejection)}).encode()})
+            return
+
+        status = 500
+
+        async def send_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.monotonic()
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            controller.release(user_id, time.monotonic() - start, failed=status >= 500)
+
+def analyze_admission() -> Dict[Tuple[str, str], AdmissionController]:
+    """Controllers for the routes that run the whole agent pipeline"""
+    return {("POST", "/analyze"): AdmissionController()}
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional
 from ..agents.orchestrator import MrsBeens
 from ..agents.social_media_agent import SocialMediaAgent
 from ..agents.interest_analysis_agent import InterestAnalysisAgent
@@ -8,13 +8,18 @@ from ..agents.learning_path_agent import LearningPathAgent
 from ..agents.braved_analysis_agent import BRAVEDAnalysisAgent
 from ..agents.balajis_analysis_agent import BALAJISAnalysisAgent
 from ..agents.neuroscience_agent import NeuroscienceAgent
-from ..lib.supabase_client import update_profile, get_profile
+from ..services.profile_service import get_profile_service
+from ..services.progress_hub import get_progress_hub
+from .caching import StaticJSON
+from .negotiation import NegotiatedResponse, NegotiatedRoute
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-router = APIRouter()
+# Internal consumers may send and receive application/msgpack instead of JSON
+router = APIRouter(route_class=NegotiatedRoute, default_response_class=NegotiatedResponse)
+profile_service = get_profile_service()
 
 # Initialize agents
 mrs_beens = MrsBeens()
@@ -38,6 +43,29 @@ mrs_beens.register_agent(braved_analysis_agent)
 mrs_beens.register_agent(balajis_analysis_agent)
 mrs_beens.register_agent(neuroscience_agent)
 
+# Fixed for the life of the process, so rendered and tagged once
+AGENTS = StaticJSON({
+    "agents": list(mrs_beens.specialized_agents.keys()),
+    "orchestrator": mrs_beens.name
+})
+FRAMEWORKS = StaticJSON({
+    "frameworks": [
+        {
+            "name": "BRAVED",
+            "components": ["Building", "Research", "Art", "Ventures", "Engineering", "Design"],
+            "description": "Framework for analyzing creative and technical interests"
+        },
+        {
+            "name": "BALAJIS",
+            "components": ["Bitcoin", "AI", "Longevity", "Autonomous", "Jobs", "Internet", "Space"],
+            "description": "Framework for analyzing future-oriented interests"
+        }
+    ]
+})
+
+# Results of an analysis that are written to the profile
+STORED_RESULTS = ("braved_scores", "balajis_scores", "learning_path")
+
 class AnalysisRequest(BaseModel):
     user_id: str
     task: str
@@ -46,32 +74,50 @@ class AnalysisRequest(BaseModel):
 class NeuroscienceRequest(BaseModel):
     user_id: str
 
+class MasteryTopics(BaseModel):
+    """Columnar topic table; a missing column or a null cell takes the per-topic default"""
+    name: List[str]
+    quiz_scores: Optional[List[Optional[List[float]]]] = None
+    project_completion: Optional[List[Optional[float]]] = None
+    time_spent: Optional[List[Optional[float]]] = None
+    expected_time: Optional[List[Optional[float]]] = None
+    engagement_score: Optional[List[Optional[float]]] = None
+
+class MasteryRequest(BaseModel):
+    # Profile whose neuroscience insights store the assessments
+    user_id: Optional[str] = None
+    topics: MasteryTopics
+
 @router.post("/analyze")
 async def analyze_profile(request: AnalysisRequest):
+    # Subscribers of /ws/analyses/{user_id} follow the analysis as it runs
+    progress = get_progress_hub().reporter(request.user_id)
     try:
         # Get the analysis from Mrs Beens and her team
-        result = await mrs_beens.execute(request.task, request.params)
+        result = await mrs_beens.execute(request.task, request.params, progress)
         
-        # Store the results in Supabase
-        await update_profile(request.user_id, {
-            "braved_scores": result.get("braved_scores", {}),
-            "balajis_scores": result.get("balajis_scores", {}),
-            "learning_path": result.get("learning_path", {})
-        })
+        # Store the results in Supabase: only what the task produced, and
+        # of that only the fields that changed
+        changes = {key: result[key] for key in STORED_RESULTS if result.get(key)}
+        if changes:
+            await profile_service.patch_profile(request.user_id, changes)
         
-        return {
+        progress("completed", task=request.task, learning_path=result.get("learning_path"))
+        # Returned as a response so the large result isn't walked by jsonable_encoder
+        return NegotiatedResponse({
             "status": "success",
             "data": result,
             "message": "Analysis completed and stored in Supabase"
-        }
+        })
     except Exception as e:
+        progress("failed", task=request.task, detail=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/neuroscience")
 async def get_neuroscience_insights(request: NeuroscienceRequest):
     try:
         # Get user data from Supabase
-        user_data = await get_profile(request.user_id)
+        user_data = await profile_service.get_profile(request.user_id)
         
         # Get insights from neuroscience agent
         insights = await neuroscience_agent.analyze_learning_patterns({
@@ -79,8 +125,12 @@ async def get_neuroscience_insights(request: NeuroscienceRequest):
             "profile": user_data
         })
         
-        # Store insights in Supabase
-        await update_profile(request.user_id, {
+        # Store insights in Supabase, keeping the stored mastery assessments
+        row = await profile_service.store.get_profile(request.user_id)
+        stored = (row or {}).get("neuroscience_insights") or {}
+        if "mastery_assessments" in stored:
+            insights = {**insights, "mastery_assessments": stored["mastery_assessments"]}
+        await profile_service.patch_profile(request.user_id, {
             "neuroscience_insights": insights
         })
         
@@ -88,26 +138,29 @@ async def get_neuroscience_insights(request: NeuroscienceRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/neuroscience/mastery")
+async def get_mastery_matrix(request: MasteryRequest):
+    """Assess mastery of every topic in one call"""
+    topics = request.topics.dict(exclude_none=True)
+    if len({len(values) for values in topics.values()}) > 1:
+        raise HTTPException(status_code=400, detail="topics columns must be of equal length")
+    try:
+        assessments = await neuroscience_agent.assess_mastery_levels(topics)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if request.user_id is not None:
+        # Stored with the profile's insights, where POST /reviews/{user_id}/seed reads them
+        row = await profile_service.store.get_profile(request.user_id)
+        if row is None:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        insights = {**(row.get("neuroscience_insights") or {}), "mastery_assessments": assessments}
+        await profile_service.patch_profile(request.user_id, {"neuroscience_insights": insights})
+    return {"user_id": request.user_id, "assessments": assessments}
+
 @router.get("/agents")
-async def list_agents():
-    return {
-        "agents": list(mrs_beens.specialized_agents.keys()),
-        "orchestrator": mrs_beens.name
-    }
+async def list_agents(request: Request):
+    return AGENTS.response(request)
 
 @router.get("/frameworks")
-async def list_frameworks():
-    return {
-        "frameworks": [
-            {
-                "name": "BRAVED",
-                "components": ["Building", "Research", "Art", "Ventures", "Engineering", "Design"],
-                "description": "Framework for analyzing creative and technical interests"
-            },
-            {
-                "name": "BALAJIS",
-                "components": ["Bitcoin", "AI", "Longevity", "Autonomous", "Jobs", "Internet", "Space"],
-                "description": "Framework for analyzing future-oriented interests"
-            }
-        ]
-    } 
\ No newline at end of file
+async def list_frameworks(request: Request):
+    return FRAMEWORKS.response(request)
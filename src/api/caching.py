@@ -0,0 +1,134 @@
+"""
+HTTP caching: ETags, conditional GETs and per-route Cache-Control.
+
+ETags are strong and quoted. CompressionMiddleware tags compressed bodies
+as "<etag>-gzip" / "<etag>-br" and MessagePack bodies are tagged
+"<etag>-msgpack" (see src/api/negotiation.py). If-None-Match matches only
+the forms this request's response could carry, given its Accept and
+Accept-Encoding, and a 304 echoes the matched form.
+"""
+import hashlib
+import re
+from typing import Any, Iterable, Optional, Tuple
+from fastapi import Request, Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.api.compression import negotiate_encoding
+from src.api.negotiation import NegotiatedResponse, representation_etag
+from src.api.responses import FastJSONResponse
+
+# (method, path pattern, Cache-Control), first match wins
+CACHE_POLICIES: Tuple[Tuple[str, str, str], ...] = (
+    # Static listings: only change on deploy
+    ("GET", r"/frameworks", "public, max-age=86400"),
+    ("GET", r"/agents", "public, max-age=3600"),
+    # Profiles: always revalidate, which is cheap with the row-version ETag
+    ("GET", r"/profiles/[^/]+", "private, no-cache"),
+    ("GET", r"/profiles/.*", "private, max-age=30"),
+    # Aggregates recomputed in the background
+    ("GET", r"/(stats|leaderboards)/.*", "public, max-age=60"),
+    ("GET", r"/.*", "private, no-cache"),
+    # Writes are never cached
+    (".*", r"/.*", "no-store")
+)
+_POLICIES = [
+    (re.compile(method), re.compile(path), cache_control)
+    for method, path, cache_control in CACHE_POLICIES
+]
+
+def cache_control_for(method: str, path: str) -> Optional[str]:
+    """Get the Cache-Control policy of a route"""
+    for method_pattern, path_pattern, cache_control in _POLICIES:
+        if method_pattern.fullmatch(method) and path_pattern.fullmatch(path):
+            return cache_control
+    return None
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from the parts identifying a representation (e.g. id and row version)"""
+    digest = hashlib.sha256("\x1f".join(map(str, parts)).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag of a rendered body"""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+def etag_matches(if_none_match: Optional[str], *etags: str) -> Optional[str]:
+    """
+    The first of etags that an If-None-Match header lists, or None.
+
+    Tags are compared weakly, as RFC 9110 asks; "*" matches the first.
+    """
+    if not if_none_match or not etags:
+        return None
+    if if_none_match.strip() == "*":
+        return etags[0]
+    tags: Iterable[str] = (tag.strip() for tag in if_none_match.split(","))
+    listed = {tag[2:] if tag.startswith("W/") else tag for tag in tags}
+    return next((etag for etag in etags if etag in listed), None)
+
+def representation_etags(request: Request, etag: str, negotiated: bool = True) -> Tuple[str, ...]:
+    """
+    The ETags this request's response could carry for a resource tagged etag.
+
+    That is the tag of the negotiated format (when negotiated), as is or,
+    since small bodies are sent uncompressed, with the suffix of the
+    encoding CompressionMiddleware would pick.
+    """
+    tag = representation_etag(etag) if negotiated else etag
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if encoding is None or not tag.startswith('"'):
+        return (tag,)
+    return (tag, f'{tag[:-1]}-{encoding}"')
+
+def not_modified(request: Request, etag: str, negotiated: bool = True) -> Optional[Response]:
+    """
+    A 304 response when the request's If-None-Match already has this ETag.
+
+    The 304 carries the matched representation's ETag and, for negotiated
+    responses, the same Vary: Accept as their 200.
+    """
+    matched = etag_matches(request.headers.get("if-none-match"), *representation_etags(request, etag, negotiated))
+    if matched is None:
+        return None
+    response = Response(status_code=304, headers={"ETag": matched})
+    if negotiated:
+        response.headers.add_vary_header("Accept")
+    return response
+
+def conditional_json(request: Request, content: Any, etag: str) -> Response:
+    """Render content tagged with etag, or 304 when the client has it"""
+    return not_modified(request, etag) or NegotiatedResponse(content, headers={"ETag": etag})
+
+class StaticJSON:
+    """A JSON body rendered and tagged once, served as bytes afterwards"""
+
+    def __init__(self, content: Any):
+        self.body = FastJSONResponse(content).body
+        self.etag = body_etag(self.body)
+
+    def response(self, request: Request) -> Response:
+        # Always JSON, whatever the Accept header
+        return not_modified(request, self.etag, negotiated=False) or Response(
+            self.body, media_type="application/json", headers={"ETag": self.etag}
+        )
+
+class CacheControlMiddleware:
+    """Add each route's Cache-Control policy to responses that don't set their own"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        cache_control = cache_control_for(scope["method"], scope["path"])
+
+        async def send_with_policy(message: Message):
+            if message["type"] == "http.response.start" and cache_control:
+                headers = MutableHeaders(scope=message)
+                if "cache-control" not in headers and message["status"] < 400:
+                    headers["Cache-Control"] = cache_control
+            await send(message)
+
+        await self.app(scope, receive, send_with_policy)
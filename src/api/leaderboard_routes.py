@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from src.api.admin import require_admin
+from src.services.leaderboard_service import get_leaderboard_service
+from src.services.profile_service import get_profile_service
+
+router = APIRouter(prefix="/leaderboards", tags=["leaderboards"])
+profile_service = get_profile_service()
+
+async def _loaded_leaderboards():
+    leaderboard_service = get_leaderboard_service()
+    if not leaderboard_service.loaded:
+        await leaderboard_service.load(profile_service.store)
+    return leaderboard_service
+
+@router.get("/{component}")
+async def get_leaderboard(component: str, limit: int = Query(10, ge=1, le=100)):
+    """Get the top learners for a BRAVED/BALAJIS component"""
+    leaderboard_service = await _loaded_leaderboards()
+    try:
+        return {"component": component, "entries": leaderboard_service.top(component, limit)}
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/{component}/profiles/{profile_id}")
+async def get_rank(component: str, profile_id: str):
+    """Get a learner's rank for a component"""
+    leaderboard_service = await _loaded_leaderboards()
+    try:
+        return leaderboard_service.rank(component, profile_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+@router.get("/{component}/profiles/{profile_id}/around")
+async def get_around(component: str, profile_id: str, radius: int = Query(5, ge=0, le=50)):
+    """Get the learners ranked just above and below a learner"""
+    leaderboard_service = await _loaded_leaderboards()
+    try:
+        return {"component": component, "entries": leaderboard_service.around(component, profile_id, radius)}
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+@router.post("/snapshot", dependencies=[Depends(require_admin)])
+async def save_snapshot():
+    """Persist the leaderboards so a restart doesn't rescan the profiles"""
+    leaderboard_service = await _loaded_leaderboards()
+    if not leaderboard_service.snapshot_path:
+        raise HTTPException(status_code=400, detail="No snapshot path configured")
+    if not leaderboard_service.save_snapshot():
+        raise HTTPException(status_code=409, detail="Another worker writes the leaderboard snapshot")
+    return {"message": "Leaderboard snapshot saved", "profiles": len(leaderboard_service)}
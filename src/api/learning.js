@@ -83,6 +83,33 @@ export async function generateLearningPath(userInterests, userGoals) {
   }
 }
 
+// Fetch the next weeks of a user's learning schedule; pass the returned
+// nextWeek back in to load the following page (null when the path ends)
+export async function getScheduleWeeks(userId, week = 0, weeks = 4) {
+  try {
+    const response = await axios.get(`/api/learning/${userId}/schedule?week=${week}&weeks=${weeks}`);
+    return {
+      weeks: response.data.weeks,
+      nextWeek: response.data.next_week,
+      totalWeeks: response.data.total_weeks
+    };
+  } catch (error) {
+    console.error('Error fetching learning schedule:', error);
+    return { weeks: [], nextWeek: null, totalWeeks: 0 };
+  }
+}
+
+// Follow a user's analysis as it runs. onEvent receives each progress event
+// (agent_started, agent_finished, partial_scores, completed, failed); call
+// the returned function to stop listening.
+export function subscribeToAnalysis(userId, onEvent) {
+  const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+  const socket = new WebSocket(`${protocol}://${window.location.host}/api/ws/analyses/${userId}`);
+  socket.onmessage = (message) => onEvent(JSON.parse(message.data));
+  socket.onerror = (error) => console.error('Analysis progress connection error:', error);
+  return () => socket.close();
+}
+
 // Generate basic learning content without AI service
 function generateBasicLearningPath(userInterests) {
   const learningPath = [];
@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+from src.services.learning_planner import catalog_from_modules, get_learning_planner, schedule_page
+from src.services.profile_service import ConcurrentUpdateError, get_profile_service
+from src.services.session_scheduler import (
+    DEFAULT_MAX_DAILY_HOURS, DEFAULT_WEEKLY_HOURS, WEEK_HOURS, NoSessionPlanError, get_session_scheduler
+)
+
+router = APIRouter(prefix="/learning", tags=["learning"])
+profile_service = get_profile_service()
+session_scheduler = get_session_scheduler()
+
+class ScheduleRequest(BaseModel):
+    modules: List[Dict[str, Any]]
+    start_date: Optional[datetime] = None
+    # Modules whose prerequisites are met that run side by side
+    max_parallel: int = Field(1, ge=1)
+
+def _page(modules: List[Dict[str, Any]], start_date: datetime, week: int, weeks: int,
+          max_parallel: int = 1) -> Dict[str, Any]:
+    try:
+        return schedule_page(modules, start_date, week, weeks, max_parallel)
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid learning modules: {e}")
+
+@router.put("/{profile_id}/path")
+async def store_learning_path(profile_id: str, request: ScheduleRequest):
+    """Plan a profile's learning modules and store them as its learning path"""
+    try:
+        schedule = get_learning_planner().schedule(
+            catalog_from_modules(request.modules),
+            max_parallel=request.max_parallel,
+            start_date=request.start_date or datetime.now()
+        ).to_dict(milestones=False)
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid learning modules: {e}")
+    learning_path = {"modules": request.modules, "schedule": schedule}
+    if not await profile_service.patch_profile(profile_id, {"learning_path": learning_path}):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return learning_path
+
+@router.get("/{profile_id}/schedule")
+async def get_schedule_weeks(profile_id: str,
+                             week: int = Query(0, ge=0, description="First week to return, from 0"),
+                             weeks: int = Query(4, ge=1, le=52)):
+    """Get the next weeks of a profile's stored learning path"""
+    row = await profile_service.store.get_profile(profile_id)
+    if not row:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    learning_path = row.get("learning_path") or {}
+    modules = learning_path.get("modules")
+    if not modules:
+        raise HTTPException(status_code=404, detail="Profile has no learning modules")
+    # Paged in the order and with the tracks the path was planned with
+    schedule = learning_path.get("schedule") or {}
+    start_date = schedule.get("start_date") or row["created_at"]
+    return _page(modules, datetime.fromisoformat(start_date), week, weeks, schedule.get("max_parallel", 1))
+
+@router.post("/schedule")
+async def create_schedule_weeks(request: ScheduleRequest,
+                                week: int = Query(0, ge=0),
+                                weeks: int = Query(4, ge=1, le=52)):
+    """Get the next weeks of a schedule for the given modules"""
+    return _page(request.modules, request.start_date or datetime.now(), week, weeks, request.max_parallel)
+
+class AvailabilityWindow(BaseModel):
+    day: int = Field(..., ge=0, le=6, description="0 is Monday")
+    start_hour: int = Field(..., ge=0, le=23)
+    end_hour: int = Field(..., ge=1, le=24)
+
+class SessionModule(BaseModel):
+    # Sessions are reported by module id; modules without one by their position
+    module_id: Optional[str] = None
+    title: str
+    # Hours of sessions; without it, duration_weeks of weekly_hours
+    hours: Optional[int] = Field(None, ge=0)
+    duration_weeks: int = Field(1, ge=0)
+
+    class Config:
+        extra = "allow"
+
+class SessionPlanRequest(BaseModel):
+    modules: List[SessionModule]
+    availability: List[AvailabilityWindow]
+    optimal_learning_times: List[Dict[str, Any]] = []
+    optimal_weekly_slots: List[Dict[str, Any]] = []
+    start_date: Optional[datetime] = None
+    weekly_hours: int = Field(DEFAULT_WEEKLY_HOURS, ge=1, le=WEEK_HOURS)
+    max_daily_hours: int = Field(DEFAULT_MAX_DAILY_HOURS, ge=1, le=24)
+    # IANA time zone the availability and optimal hours are local to
+    timezone: str = "UTC"
+
+class MissedSession(BaseModel):
+    start: datetime
+
+@router.post("/{profile_id}/sessions")
+async def plan_sessions(profile_id: str, request: SessionPlanRequest):
+    """Pack learning sessions into the learner's availability, best hours first"""
+    try:
+        plan = await session_scheduler.plan(
+            profile_id,
+            [module.dict(exclude_none=True) for module in request.modules],
+            [window.dict() for window in request.availability],
+            request.optimal_learning_times,
+            request.optimal_weekly_slots,
+            request.start_date,
+            request.weekly_hours,
+            request.max_daily_hours,
+            request.timezone
+        )
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"modules": plan.module_windows(), "sessions": plan.sessions(until=plan.start + timedelta(weeks=4))}
+
+@router.get("/{profile_id}/sessions")
+async def get_sessions(profile_id: str, since: Optional[datetime] = None, until: Optional[datetime] = None):
+    """Get a learner's planned sessions in a time range"""
+    try:
+        plan = await session_scheduler.get_plan(profile_id)
+    except NoSessionPlanError:
+        raise HTTPException(status_code=404, detail="No session plan for this profile")
+    return plan.sessions(since, until)
+
+@router.post("/{profile_id}/sessions/missed")
+async def reschedule_missed_session(profile_id: str, missed: MissedSession):
+    """Move a missed session to the next best free hours"""
+    try:
+        return {"rescheduled": await session_scheduler.reschedule(profile_id, missed.start)}
+    except NoSessionPlanError:
+        raise HTTPException(status_code=404, detail="No session plan for this profile")
+    except KeyError:
+        raise HTTPException(status_code=404, detail="No session starts at that time")
+    except ConcurrentUpdateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
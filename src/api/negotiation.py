@@ -0,0 +1,126 @@
+"""
+JSON / MessagePack content negotiation.
+
+Routers built with route_class=NegotiatedRoute accept request bodies sent
+as application/msgpack and, with default_response_class=NegotiatedResponse,
+answer in MessagePack when the Accept header prefers it over JSON. The
+schema is the same in both formats. MessagePack is only offered when the
+msgpack package is installed.
+"""
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, Optional
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+import numpy as np
+from src.api.responses import FastJSONResponse
+
+try:
+    import msgpack
+except ImportError:  # optional dependency, JSON only without it
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+# Also seen in the wild before application/msgpack was registered
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+# Response format negotiated for the request being handled
+_response_format: ContextVar[str] = ContextVar("response_format", default="json")
+
+def negotiate_format(accept: str) -> str:
+    """Pick "msgpack" or "json" from an Accept header, honouring q-values; JSON wins ties"""
+    if msgpack is None or not accept:
+        return "json"
+    weights = {}
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[media_type.strip().lower()] = quality
+
+    msgpack_quality = max(weights.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    json_quality = max(weights.get(media_type, 0.0) for media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"))
+    return "msgpack" if msgpack_quality > json_quality else "json"
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    # Pydantic models, datetimes, sets, ...
+    return jsonable_encoder(value)
+
+def packb(content: Any) -> bytes:
+    return msgpack.packb(content, default=_msgpack_default, use_bin_type=True)
+
+def unpackb(body: bytes) -> Any:
+    return msgpack.unpackb(body, raw=False, strict_map_key=False)
+
+def representation_etag(etag: str) -> str:
+    """The strong ETag of the negotiated representation of a resource tagged etag"""
+    if _response_format.get() == "msgpack" and etag.startswith('"'):
+        return f'{etag[:-1]}-msgpack"'
+    return etag
+
+class NegotiatedResponse(FastJSONResponse):
+    """
+    orjson JSON, or MessagePack when the request negotiated it.
+
+    Varies on Accept, and a strong ETag of a MessagePack body gets a
+    "-msgpack" suffix since it names different bytes than the JSON one.
+    """
+
+    def __init__(self, content: Any = None, *args: Any, **kwargs: Any):
+        self.wire_format = _response_format.get()
+        super().__init__(content, *args, **kwargs)
+        self.headers.add_vary_header("Accept")
+        etag = self.headers.get("etag")
+        if etag:
+            self.headers["ETag"] = representation_etag(etag)
+
+    def render(self, content: Any) -> bytes:
+        if self.wire_format == "msgpack":
+            self.media_type = MSGPACK_MEDIA_TYPE
+            return packb(content)
+        return super().render(content)
+
+class _MsgpackRequest(Request):
+    """A request whose MessagePack body is read through json()"""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = unpackb(await self.body())
+        return self._json
+
+def _is_msgpack(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.split(";")[0].strip().lower() in MSGPACK_MEDIA_TYPES
+
+class NegotiatedRoute(APIRoute):
+    """Route that accepts MessagePack bodies and negotiates its response format"""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def negotiated_handler(request: Request) -> Response:
+            if msgpack is not None and _is_msgpack(request.headers.get("content-type")):
+                # FastAPI only parses application/json bodies, through request.json()
+                scope = dict(request.scope)
+                scope["headers"] = [
+                    (name, JSON_MEDIA_TYPE.encode() if name == b"content-type" else value)
+                    for name, value in request.scope["headers"]
+                ]
+                request = _MsgpackRequest(scope, request.receive)
+            token = _response_format.set(negotiate_format(request.headers.get("accept", "")))
+            try:
+                return await handler(request)
+            finally:
+                _response_format.reset(token)
+
+        return negotiated_handler
@@ -1,10 +1,22 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import List, Optional
+from datetime import datetime
+from src.api.caching import conditional_json, make_etag, not_modified
+from src.api.negotiation import NegotiatedResponse, NegotiatedRoute
 from src.models.profile import Profile
-from src.services.profile_service import ProfileService
+from src.services.profile_service import ConcurrentUpdateError, get_profile_service
+from src.services.similarity_service import get_similarity_service
 
-router = APIRouter(prefix="/profiles", tags=["profiles"])
-profile_service = ProfileService()
+# Internal consumers may send and receive application/msgpack instead of JSON
+router = APIRouter(
+    prefix="/profiles",
+    tags=["profiles"],
+    route_class=NegotiatedRoute,
+    default_response_class=NegotiatedResponse
+)
+profile_service = get_profile_service()
+# Created here so its score listener sees every write from startup on
+similarity_service = get_similarity_service()
 
 @router.post("/", response_model=Profile)
 async def create_profile(profile: Profile):
@@ -14,14 +26,72 @@ async def create_profile(profile: Profile):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/search", response_model=List[Profile])
+async def search_profiles(
+    min_score: List[str] = Query([], description="Score threshold as component:minimum, e.g. ai:70"),
+    interest: List[str] = Query([], description="Match profiles having any of these interests"),
+    created_after: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """Search profiles by score thresholds, interests and creation time"""
+    try:
+        min_scores = {}
+        for threshold in min_score:
+            component, _, minimum = threshold.partition(":")
+            min_scores[component] = int(minimum)
+        return await profile_service.search_profiles(
+            min_scores=min_scores,
+            interests=interest,
+            created_after=created_after.isoformat() if created_after else None,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/top/{component}", response_model=List[Profile])
+async def get_top_profiles(component: str, limit: int = Query(10, ge=1, le=100)):
+    """Get the highest scoring profiles for a framework component"""
+    try:
+        return await profile_service.top_profiles(component, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/{profile_id}", response_model=Profile)
-async def get_profile(profile_id: str):
-    """Get a profile by ID"""
+async def get_profile(profile_id: str, request: Request):
+    """
+    Get a profile by ID.
+
+    The ETag comes from the row version, so a matching If-None-Match is
+    answered with 304 from the version alone, without loading the profile.
+    """
+    if request.headers.get("if-none-match"):
+        version = await profile_service.get_profile_version(profile_id)
+        if version:
+            response = not_modified(request, make_etag(profile_id, version))
+            if response:
+                return response
     profile = await profile_service.get_profile(profile_id)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
+    if profile.updated_at:
+        return conditional_json(request, profile.dict(), make_etag(profile_id, profile.updated_at))
     return profile
 
+@router.get("/{profile_id}/similar")
+async def get_similar_profiles(
+    profile_id: str,
+    k: int = Query(10, ge=1, le=100),
+    metric: str = Query("cosine", regex="^(cosine|euclidean)$")
+):
+    """Get the learners whose BRAVED/BALAJIS scores are closest to this profile"""
+    if not similarity_service.loaded:
+        await similarity_service.load(profile_service.store)
+    try:
+        similar = similarity_service.similar(profile_id, k, metric)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return {"profile_id": profile_id, "metric": metric, "similar": similar}
+
 @router.get("/", response_model=List[Profile])
 async def get_all_profiles():
     """Get all profiles"""
@@ -30,7 +100,10 @@ async def get_all_profiles():
 @router.put("/{profile_id}", response_model=Profile)
 async def update_profile(profile_id: str, profile: Profile):
     """Update a profile"""
-    updated_profile = await profile_service.update_profile(profile_id, profile)
+    try:
+        updated_profile = await profile_service.update_profile(profile_id, profile)
+    except ConcurrentUpdateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not updated_profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     return updated_profile
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, WebSocket
+from src.services.progress_hub import get_progress_hub
+
+router = APIRouter(prefix="/ws", tags=["progress"])
+
+@router.websocket("/analyses/{user_id}")
+async def analysis_progress(websocket: WebSocket, user_id: str):
+    """
+    Stream a user's analysis progress as JSON messages.
+
+    Events are agent_started, agent_finished and partial_scores while the
+    agents run, then completed (with the learning path) or failed.
+    Messages from the client are ignored.
+
+    Events of an analysis running on another worker arrive through the
+    event feed, within EVENT_POLL_INTERVAL seconds.
+    """
+    await websocket.accept()
+    hub = get_progress_hub()
+    subscriber = hub.subscribe(user_id, websocket.send_text)
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    finally:
+        hub.unsubscribe(user_id, subscriber)
@@ -0,0 +1,24 @@
+from typing import Any
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+def _default(value: Any) -> Any:
+    # Anything orjson can't serialize natively (pydantic models, sets, ...)
+    return jsonable_encoder(value)
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered by orjson.
+
+    Used as the apps' default response class. Routes with large payloads
+    return it directly, which also skips FastAPI's jsonable_encoder pass
+    over the whole result.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
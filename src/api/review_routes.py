@@ -0,0 +1,75 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+from src.services.profile_service import ConcurrentUpdateError, get_profile_service
+from src.services.review_scheduler import ReviewService, get_review_service
+
+router = APIRouter(prefix="/reviews", tags=["reviews"])
+review_service = get_review_service()
+profile_service = get_profile_service()
+
+class ReviewResult(BaseModel):
+    quality: int = Field(..., ge=0, le=5, description="Recall quality, 0 (forgotten) to 5 (perfect)")
+
+async def _loaded_reviews() -> ReviewService:
+    # Built from the store on first use; other workers' writes arrive through the event feed
+    if not review_service.loaded:
+        await review_service.load()
+    return review_service
+
+@router.get("/users/due")
+async def get_users_due(within: int = Query(3600, ge=0, description="Seconds from now"),
+                        limit: Optional[int] = Query(None, ge=1)):
+    """Get the users with reviews due soon"""
+    service = await _loaded_reviews()
+    return service.scheduler.users_due(within_seconds=within, limit=limit)
+
+@router.get("/{user_id}/due")
+async def get_due_reviews(user_id: str, limit: Optional[int] = Query(None, ge=1)):
+    """Get a user's items that are due for review"""
+    service = await _loaded_reviews()
+    await service.refresh(user_id)
+    return {
+        "user_id": user_id,
+        "next_due": service.scheduler.next_due(user_id),
+        "items": service.scheduler.due_items(user_id, limit=limit)
+    }
+
+@router.post("/{user_id}/seed")
+async def seed_reviews(user_id: str):
+    """
+    Schedule first reviews from the profile's stored neuroscience insights:
+    the retention patterns of POST /neuroscience and the mastery
+    assessments of POST /neuroscience/mastery.
+    """
+    row = await profile_service.store.get_profile(user_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    insights = row.get("neuroscience_insights") or {}
+    service = await _loaded_reviews()
+    try:
+        seeded = await service.seed(
+            user_id, insights.get("retention_patterns") or {}, insights.get("mastery_assessments") or []
+        )
+    except ConcurrentUpdateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"user_id": user_id, "seeded": seeded, "next_due": service.scheduler.next_due(user_id)}
+
+@router.post("/{user_id}/items/{item_id}")
+async def record_review(user_id: str, item_id: str, result: ReviewResult):
+    """Record a review and schedule the next one"""
+    service = await _loaded_reviews()
+    try:
+        return await service.review(user_id, item_id, result.quality)
+    except ConcurrentUpdateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get("/{user_id}/items/{item_id}")
+async def get_review_state(user_id: str, item_id: str):
+    """Get the review state of an item"""
+    service = await _loaded_reviews()
+    await service.refresh(user_id)
+    try:
+        return service.scheduler.state(user_id, item_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Review item not found")
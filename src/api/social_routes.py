@@ -0,0 +1,52 @@
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import Dict, List
+
+router = APIRouter(tags=["social"])
+
+class SocialMediaAnalysis(BaseModel):
+    twitter_handle: str
+    interests: List[str]
+    braved_scores: Dict[str, int]
+    balajis_scores: Dict[str, int]
+
+@router.post("/analyze-social-media")
+async def analyze_social_media(data: SocialMediaAnalysis):
+    """
+    Analyze social media posts and update profile with insights
+    This is where Mrs Beens and other agents would work together
+    """
+    try:
+        # TODO: Implement social media analysis
+        # 1. Mrs Beens coordinates the analysis
+        # 2. Social Media Agent fetches and analyzes posts
+        # 3. Interest Analysis Agent categorizes interests
+        # 4. BRAVED Analysis Agent calculates scores
+        # 5. BALAJIS Analysis Agent calculates scores
+        # 6. Learning Path Agent generates path
+        # 7. Neuroscience Agent provides insights
+        
+        return {
+            "message": "Analysis completed",
+            "interests": data.interests,
+            "braved_scores": data.braved_scores,
+            "balajis_scores": data.balajis_scores
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/update-learning-path/{profile_id}")
+async def update_learning_path(profile_id: str):
+    """
+    Update learning path based on current scores and interests
+    """
+    try:
+        # TODO: Implement learning path generation
+        # 1. Get current profile data
+        # 2. Analyze scores and interests
+        # 3. Generate personalized learning path
+        # 4. Update profile in Supabase
+        
+        return {"message": "Learning path updated"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException
+from src.api.admin import require_admin
+from src.services.profile_service import get_profile_service
+from src.services.stats_service import get_stats_service
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+profile_service = get_profile_service()
+
+async def _loaded_stats():
+    stats_service = get_stats_service()
+    if not stats_service.loaded:
+        await stats_service.load(profile_service.store)
+    return stats_service
+
+@router.get("/percentiles/{profile_id}")
+async def get_percentiles(profile_id: str):
+    """Get how a profile's scores compare with every other learner"""
+    stats_service = await _loaded_stats()
+    try:
+        return {"profile_id": profile_id, "components": stats_service.percentiles(profile_id)}
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+@router.get("/distributions")
+async def get_distributions():
+    """Get the score distribution of every BRAVED/BALAJIS component"""
+    stats_service = await _loaded_stats()
+    return stats_service.distributions()
+
+@router.post("/rebuild", dependencies=[Depends(require_admin)])
+async def rebuild_stats():
+    """Rebuild the aggregates from the profile store (scans every profile; admin only)"""
+    stats_service = get_stats_service()
+    await stats_service.load(profile_service.store)
+    return {"message": "Statistics rebuilt", "profiles": stats_service.count}
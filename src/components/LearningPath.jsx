@@ -1,7 +1,35 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
+import { getScheduleWeeks } from '../api/learning';
+
+const SCHEDULE_PAGE_WEEKS = 4;
 
 const LearningPath = ({ learningPath, completedLessons, userId }) => {
+  // Weekly schedule, fetched a page at a time
+  const [scheduleWeeks, setScheduleWeeks] = useState([]);
+  const [nextWeek, setNextWeek] = useState(0);
+  const [loadingSchedule, setLoadingSchedule] = useState(false);
+
+  const loadMoreWeeks = async () => {
+    if (nextWeek === null || loadingSchedule) return;
+    setLoadingSchedule(true);
+    const page = await getScheduleWeeks(userId, nextWeek, SCHEDULE_PAGE_WEEKS);
+    setScheduleWeeks(weeks => [...weeks, ...page.weeks]);
+    setNextWeek(page.nextWeek);
+    setLoadingSchedule(false);
+  };
+
+  useEffect(() => {
+    setScheduleWeeks([]);
+    setNextWeek(0);
+    if (userId) {
+      getScheduleWeeks(userId, 0, SCHEDULE_PAGE_WEEKS).then(page => {
+        setScheduleWeeks(page.weeks);
+        setNextWeek(page.nextWeek);
+      });
+    }
+  }, [userId]);
+
   // Check if a lesson has been completed
   const isLessonCompleted = (lessonId) => {
     return completedLessons.includes(lessonId);
@@ -102,6 +130,24 @@ const LearningPath = ({ learningPath, completedLessons, userId }) => {
         ))}
       </div>
       
+      {scheduleWeeks.length > 0 && (
+        <div className="path-schedule">
+          <h3>Your schedule</h3>
+          {scheduleWeeks.map(week => (
+            <div key={week.week} className="schedule-week">
+              <span className="schedule-week-number">Week {week.week}</span>
+              <span className="schedule-week-module">{week.module_title}</span>
+              <p className="schedule-week-tasks">{week.tasks}</p>
+            </div>
+          ))}
+          {nextWeek !== null && (
+            <button className="load-weeks-btn" onClick={loadMoreWeeks} disabled={loadingSchedule}>
+              {loadingSchedule ? 'Loading...' : `Show next ${SCHEDULE_PAGE_WEEKS} weeks`}
+            </button>
+          )}
+        </div>
+      )}
+      
       {completedLessons.length === learningPath.length && (
         <div className="path-completed">
           <h3>Congratulations! You've completed this learning path.</h3>
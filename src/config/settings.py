@@ -8,10 +8,55 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
 
+# Seconds between two polls of the event log through which worker processes
+# share changes (see src.services.event_feed), and seconds events are kept
+EVENT_POLL_INTERVAL = float(os.getenv("EVENT_POLL_INTERVAL", "0.5"))
+EVENT_RETENTION = float(os.getenv("EVENT_RETENTION", "3600"))
+
+# Key expected in the X-Admin-Key header of maintenance routes (full-table
+# rebuilds and the like); they are disabled while it is unset
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+
+# Storage settings ("supabase" or "sqlite")
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase")
+SQLITE_PATH = os.getenv("SQLITE_PATH", "braved_balajis.db")
+
+# Leaderboard snapshot, written on shutdown and read on startup
+LEADERBOARD_SNAPSHOT_PATH = os.getenv("LEADERBOARD_SNAPSHOT_PATH", "leaderboard_snapshot.npz")
+
+# Columnar per-user activity logs (one directory per user)
+ACTIVITY_LOG_PATH = os.getenv("ACTIVITY_LOG_PATH", "activity_log")
+
 # API settings
 API_HOST = "0.0.0.0"
 API_PORT = 8000
 
+# Responses at least this many bytes are gzip/brotli compressed when the client accepts it
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+
+# Seconds a profile version cached by this process answers If-None-Match
+# without asking the database; writes from other processes evict it when
+# the event feed delivers them, so this only bounds staleness while the
+# event log can't be read
+PROFILE_VERSION_TTL = float(os.getenv("PROFILE_VERSION_TTL", "2"))
+# Profiles whose version this process keeps, least recently used dropped first
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "10000"))
+
+# Profiles read from the database skip pydantic validation; this share of
+# rows (0-1) is validated anyway and mismatches are logged, for debugging
+PROFILE_VALIDATION_SAMPLE_RATE = float(os.getenv("PROFILE_VALIDATION_SAMPLE_RATE", "0"))
+
+# Admission control for /analyze, per worker: the concurrency limit starts at
+# the initial value and adapts to latency up to the maximum; requests over it
+# wait in a queue of this size for at most the timeout (seconds)
+ANALYZE_INITIAL_CONCURRENCY = int(os.getenv("ANALYZE_INITIAL_CONCURRENCY", "8"))
+ANALYZE_MAX_CONCURRENCY = int(os.getenv("ANALYZE_MAX_CONCURRENCY", "64"))
+ANALYZE_QUEUE_SIZE = int(os.getenv("ANALYZE_QUEUE_SIZE", "64"))
+ANALYZE_QUEUE_TIMEOUT = float(os.getenv("ANALYZE_QUEUE_TIMEOUT", "15"))
+
+# Twitter API v2 base URL; point it at a stand-in (see loadtest/) to run without Twitter
+TWITTER_API_URL = os.getenv("TWITTER_API_URL", "https://api.twitter.com")
+
 # CORS settings
 CORS_ORIGINS = [
     "http://localhost:5173",  # Frontend development server
@@ -36,4 +81,10 @@ BALAJIS_FRAMEWORK = {
     "joy": "Joy",
     "influence": "Influence",
     "skills": "Skills"
+}
+
+# Profile column holding each framework component's score
+SCORE_COLUMNS = {
+    **{component: "braved_scores" for component in BRAVED_FRAMEWORK},
+    **{component: "balajis_scores" for component in BALAJIS_FRAMEWORK}
 } 
\ No newline at end of file
@@ -1,29 +1,95 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from src.api import profile_routes
-
-app = FastAPI(
-    title="BRAVED/BALAJIS Framework API",
-    description="API for managing user profiles and learning paths",
-    version="1.0.0"
+from src.api import (
+    activity_routes, agent_routes, leaderboard_routes, learning_routes, profile_routes,
+    progress_routes, review_routes, social_routes, stats_routes
 )
+from src.api.admission import AdmissionMiddleware, analyze_admission
+from src.api.caching import CacheControlMiddleware
+from src.api.compression import CompressionMiddleware
+from src.api.responses import FastJSONResponse
+from src.services.event_feed import get_event_feed
+from src.services.learning_planner import LEVELS
+from src.services.leaderboard_service import get_leaderboard_service
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+ROUTERS = (
+    profile_routes.router,
+    stats_routes.router,
+    leaderboard_routes.router,
+    review_routes.router,
+    activity_routes.router,
+    learning_routes.router,
+    social_routes.router,
+    agent_routes.router,
+    progress_routes.router
 )
 
-# Include routers
-app.include_router(profile_routes.router)
+async def start_event_feed():
+    # Started in each worker, after the fork, so that every worker gets its own origin
+    await get_event_feed().start()
+
+async def stop_event_feed():
+    await get_event_feed().stop()
+
+async def save_leaderboards():
+    leaderboard_service = get_leaderboard_service()
+    if leaderboard_service.loaded:
+        leaderboard_service.save_snapshot()
 
-@app.get("/")
 async def root():
     return {
         "message": "Welcome to BRAVED/BALAJIS Framework API",
         "docs_url": "/docs",
         "redoc_url": "/redoc"
-    } 
\ No newline at end of file
+    }
+
+def create_app() -> FastAPI:
+    """Build the API with every router mounted"""
+    app = FastAPI(
+        title="BRAVED/BALAJIS Framework API",
+        description="API for managing user profiles and learning paths",
+        version="1.0.0",
+        default_response_class=FastJSONResponse
+    )
+
+    # Innermost, so that 429 responses still get CORS headers
+    app.add_middleware(AdmissionMiddleware, controllers=analyze_admission())
+
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # In production, replace with specific origins
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(CacheControlMiddleware)
+    app.add_middleware(CompressionMiddleware)
+
+    for router in ROUTERS:
+        app.include_router(router)
+    app.add_event_handler("startup", start_event_feed)
+    app.add_event_handler("shutdown", stop_event_feed)
+    app.add_event_handler("shutdown", save_leaderboards)
+    app.add_api_route("/", root, methods=["GET"])
+    return app
+
+def preload():
+    """
+    Build read-only state that would otherwise be built lazily in each worker.
+
+    Called in the gunicorn master before workers fork (see gunicorn.conf.py),
+    so the agents' keyword tables, the static listings and the resource
+    recommendations of every known interest keyword are shared copy-on-write.
+    """
+    keywords = [
+        keyword
+        for keywords in agent_routes.interest_analysis_agent.categories.values()
+        for keyword in keywords
+    ]
+    asyncio.run(agent_routes.learning_path_agent.recommend_resources_bulk(
+        [(keyword, "", level) for keyword in keywords for level in LEVELS]
+    ))
+
+app = create_app()
@@ -1,6 +1,15 @@
-from pydantic import BaseModel
-from typing import List, Dict, Optional
+import logging
+import random
+from pydantic import BaseModel, ValidationError
+from typing import Any, List, Dict, Optional
 from datetime import datetime
+from src.config.settings import PROFILE_VALIDATION_SAMPLE_RATE
+from src.models.scores import ScoreVector
+
+logger = logging.getLogger(__name__)
+
+# Row columns copied (one level deep) so models don't share containers with cached rows
+_CONTAINER_FIELDS = ("interests", "braved_scores", "balajis_scores", "learning_path")
 
 class LearningStep(BaseModel):
     title: str
@@ -48,10 +57,58 @@ class Profile(BaseModel):
         "influence": 0,
         "skills": 0
     }
-    learning_path: Dict[str, List[Dict[str, str]]] = {"steps": []}
+    # Generated paths hold modules with objectives, resources and a schedule
+    learning_path: Dict[str, Any] = {"steps": []}
     created_at: Optional[str] = None
+    # Row version, bumped by the database on every update
+    updated_at: Optional[str] = None
 
     class Config:
         json_encoders = {
             datetime: lambda v: v.isoformat()
-        } 
\ No newline at end of file
+        }
+
+    @classmethod
+    def from_db_row(cls, row: Dict[str, Any]) -> "Profile":
+        """
+        Build a profile from a row of our own profiles table without validating it.
+
+        The schema already guarantees the column types, so the row is used as
+        is, the way construct() does, with its containers copied one level
+        deep. PROFILE_VALIDATION_SAMPLE_RATE re-validates a random share of
+        rows and logs any that validation would have rejected or changed.
+        """
+        fields = cls.__fields__
+        if all(name in row for name in fields):
+            values = {name: row[name] for name in fields}
+            for name in _CONTAINER_FIELDS:
+                if values[name] is not None:
+                    values[name] = values[name].copy()
+            profile = cls.__new__(cls)
+            object.__setattr__(profile, "__dict__", values)
+            object.__setattr__(profile, "__fields_set__", set(fields))
+        else:
+            # Rows from before a column existed: construct() fills in defaults
+            profile = cls.construct(**{
+                name: row[name].copy() if name in _CONTAINER_FIELDS and row[name] is not None else row[name]
+                for name in fields if name in row
+            })
+
+        if PROFILE_VALIDATION_SAMPLE_RATE and random.random() < PROFILE_VALIDATION_SAMPLE_RATE:
+            try:
+                validated = cls(**row)
+            except ValidationError as error:
+                logger.warning("Profile row %s fails validation: %s", row.get("id"), error)
+            else:
+                if validated.dict() != profile.dict():
+                    logger.warning("Profile row %s changes under validation", row.get("id"))
+        return profile
+
+    def score_vector(self) -> ScoreVector:
+        """The profile's scores as a compact ScoreVector"""
+        return ScoreVector.from_dicts(self.braved_scores, self.balajis_scores)
+
+    def with_scores(self, scores: ScoreVector) -> "Profile":
+        """A copy of the profile with its score columns set from a ScoreVector"""
+        braved_scores, balajis_scores = scores.to_dicts()
+        return self.copy(update={"braved_scores": braved_scores, "balajis_scores": balajis_scores})
@@ -0,0 +1,108 @@
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, Tuple, Union
+import numpy as np
+from src.config.settings import BRAVED_FRAMEWORK, BALAJIS_FRAMEWORK
+
+# Order of the framework components in a score vector
+SCORE_KEYS = list(BRAVED_FRAMEWORK) + list(BALAJIS_FRAMEWORK)
+# Scores are integers in 0-MAX_SCORE
+MAX_SCORE = 100
+
+_INDEX = {key: index for index, key in enumerate(SCORE_KEYS)}
+_BRAVED_COUNT = len(BRAVED_FRAMEWORK)
+
+def score_vector(braved_scores: Dict[str, int], balajis_scores: Dict[str, int]) -> np.ndarray:
+    """Build the 13-dimensional score vector of a profile"""
+    scores = {**(braved_scores or {}), **(balajis_scores or {})}
+    return np.array([scores.get(key, 0) for key in SCORE_KEYS], dtype=np.float32)
+
+class ScoreVector:
+    """
+    A profile's 13 framework scores in SCORE_KEYS order.
+
+    Scores are integers in 0-MAX_SCORE, so the vector is one immutable
+    13-byte string: about 100 bytes per profile against about 600 for the
+    two score dicts, and hashable. Components read as attributes
+    (vector.ai) or by key or index, as_array() is a zero-copy uint8 view
+    for vector math, and to_dicts()/from_dicts() convert to and from the
+    braved_scores/balajis_scores JSON form at the edges. Keys outside the
+    frameworks are dropped and values are clipped into range.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, values: Union[bytes, Sequence[int], np.ndarray] = ()):
+        if isinstance(values, bytes):
+            if len(values) != len(SCORE_KEYS):
+                raise ValueError(f"A score vector is {len(SCORE_KEYS)} bytes, got {len(values)}")
+            data = values
+        else:
+            array = np.zeros(len(SCORE_KEYS), dtype=np.float32)
+            array[:len(values)] = values
+            data = np.clip(array, 0, MAX_SCORE).astype(np.uint8).tobytes()
+        object.__setattr__(self, "_data", data)
+
+    @classmethod
+    def from_dicts(cls,
+                   braved_scores: Optional[Mapping[str, Any]],
+                   balajis_scores: Optional[Mapping[str, Any]]) -> "ScoreVector":
+        """Build a vector from the JSON score columns"""
+        return cls(score_vector(braved_scores, balajis_scores))
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "ScoreVector":
+        """Build a vector from a profile row or model dict"""
+        return cls.from_dicts(row.get("braved_scores"), row.get("balajis_scores"))
+
+    def to_dicts(self) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """The (braved_scores, balajis_scores) JSON form"""
+        scores = dict(zip(SCORE_KEYS, self._data))
+        return (
+            {key: scores[key] for key in SCORE_KEYS[:_BRAVED_COUNT]},
+            {key: scores[key] for key in SCORE_KEYS[_BRAVED_COUNT:]}
+        )
+
+    def as_array(self) -> np.ndarray:
+        """A read-only uint8 view of the scores, without copying"""
+        return np.frombuffer(self._data, dtype=np.uint8)
+
+    def tobytes(self) -> bytes:
+        return self._data
+
+    def replace(self, **scores: int) -> "ScoreVector":
+        """A copy with some components changed"""
+        values = bytearray(self._data)
+        for key, score in scores.items():
+            values[_INDEX[key]] = min(max(int(score), 0), MAX_SCORE)
+        return ScoreVector(bytes(values))
+
+    def __getitem__(self, key: Union[str, int]) -> int:
+        return self._data[_INDEX[key] if isinstance(key, str) else key]
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("ScoreVector is immutable; use replace()")
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._data)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ScoreVector):
+            return self._data == other._data
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._data)
+
+    def __reduce__(self):
+        return ScoreVector, (self._data,)
+
+    def __repr__(self) -> str:
+        return "ScoreVector({})".format(", ".join(f"{key}={score}" for key, score in zip(SCORE_KEYS, self._data)))
+
+def _component(index: int) -> property:
+    return property(lambda vector: vector._data[index])
+
+for _index, _key in enumerate(SCORE_KEYS):
+    setattr(ScoreVector, _key, _component(_index))
@@ -0,0 +1,160 @@
+"""
+Changes shared between the worker processes through the profile store.
+
+Services that keep state in each process (cached profile versions, score
+indexes, review queues, analysis progress) publish what changed as an
+event on a channel. Events are batched into the store's event log, and
+every process polls the log and hands the events of other processes to the
+handlers of their channel, which reload or forget their copy of the state.
+The log is the only thing the workers share, so any number of them (and of
+hosts) stay in step within EVENT_POLL_INTERVAL seconds.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from src.config.settings import EVENT_POLL_INTERVAL, EVENT_RETENTION
+from src.storage import get_profile_store
+from src.storage.base import ProfileStore
+
+logger = logging.getLogger(__name__)
+
+# Called with (key, data) for each event another process published on the channel
+EventHandler = Callable[[str, Any], Awaitable[None]]
+
+# Events read from the log per query
+READ_BATCH_SIZE = 1000
+# Seconds a gap in the event ids is waited for: an id taken by a transaction
+# that hasn't committed yet appears later, one of a rolled back insert never
+GAP_TIMEOUT = 5.0
+
+class EventFeed:
+    def __init__(self, store: Optional[ProfileStore] = None,
+                 poll_interval: float = EVENT_POLL_INTERVAL,
+                 retention: float = EVENT_RETENTION):
+        self.store = store or get_profile_store()
+        self.poll_interval = poll_interval
+        self.retention = retention
+        # Set when the feed starts, so that workers forked from one master differ
+        self.origin: Optional[str] = None
+        self._handlers: Dict[str, List[EventHandler]] = {}
+        self._outbox: List[Dict[str, Any]] = []
+        # Every event up to _after was handled; _seen are the ones handled past a gap
+        self._after: Optional[int] = None
+        self._seen: Set[int] = set()
+        self._gap_since: Optional[float] = None
+        self._pruned_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self.origin is not None
+
+    def add_handler(self, channel: str, handler: EventHandler):
+        """Register a callback for the events other processes publish on a channel"""
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def publish(self, channel: str, key: str, data: Any = None):
+        """
+        Queue an event for the other processes; written with the next poll.
+
+        Nothing is queued while the feed isn't running (scripts, tests):
+        there is no other process to tell.
+        """
+        if self.running:
+            self._outbox.append({"origin": self.origin, "channel": channel, "key": key, "data": data})
+
+    async def start(self, poll: bool = True):
+        """Start publishing, and with poll, follow the log in a background task"""
+        if self.running:
+            return
+        self.origin = uuid.uuid4().hex
+        if poll:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop following the log, writing the events still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.running:
+            await self.flush()
+            self.origin = None
+
+    async def flush(self):
+        """Write the queued events"""
+        events, self._outbox = self._outbox, []
+        try:
+            await self.store.append_events(events)
+        except Exception:
+            self._outbox[:0] = events
+            raise
+
+    async def poll(self):
+        """Write the queued events, then handle the new events of other processes"""
+        if self._after is None:
+            # Only events published from now on concern this process
+            self._after = await self.store.latest_event_id()
+        await self.flush()
+        read_after = self._after
+        while True:
+            events = await self.store.read_events(read_after, READ_BATCH_SIZE)
+            for event in events:
+                if event["id"] in self._seen:
+                    continue
+                self._seen.add(event["id"])
+                if event["origin"] != self.origin:
+                    await self._dispatch(event)
+            if len(events) < READ_BATCH_SIZE:
+                break
+            read_after = events[-1]["id"]
+        self._advance()
+        if time.monotonic() - self._pruned_at > self.retention / 10:
+            self._pruned_at = time.monotonic()
+            before = datetime.now(timezone.utc) - timedelta(seconds=self.retention)
+            await self.store.prune_events(before.isoformat())
+
+    def _advance(self):
+        """Move _after over the handled events, past a gap once it's waited for long enough"""
+        while self._seen:
+            if self._after + 1 in self._seen:
+                self._after += 1
+                self._seen.discard(self._after)
+                self._gap_since = None
+            elif self._gap_since is None:
+                self._gap_since = time.monotonic()
+                return
+            elif time.monotonic() - self._gap_since > GAP_TIMEOUT:
+                self._after = min(self._seen) - 1
+            else:
+                return
+
+    async def _dispatch(self, event: Dict[str, Any]):
+        for handler in self._handlers.get(event["channel"], ()):
+            try:
+                await handler(event["key"], event["data"])
+            except Exception:
+                logger.exception("Handling %s event for %s failed", event["channel"], event["key"])
+
+    async def _run(self):
+        while True:
+            try:
+                await self.poll()
+            except Exception:
+                logger.exception("Polling the event log failed")
+            await asyncio.sleep(self.poll_interval)
+
+_event_feed: Optional[EventFeed] = None
+
+def get_event_feed() -> EventFeed:
+    """Get the event feed of this process"""
+    global _event_feed
+    if _event_feed is None:
+        _event_feed = EventFeed()
+    return _event_feed
@@ -0,0 +1,267 @@
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+import numpy as np
+from sortedcontainers import SortedList
+from src.config.settings import LEADERBOARD_SNAPSHOT_PATH
+from src.models.scores import SCORE_KEYS, ScoreVector
+from src.services.profile_service import get_profile_service
+from src.storage.base import ProfileStore
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single process is assumed
+    fcntl = None
+
+# Past this share of stale snapshot rows, a full scan is cheaper than fetching them one by one
+CATCH_UP_LIMIT = 0.1
+
+class LeaderboardService:
+    """
+    Per-component leaderboards for the BRAVED/BALAJIS scores.
+
+    Each component has a SortedList of (-score, profile_id) entries, so score
+    writes are O(log n) and rank, top-k and around-me queries are
+    O(log n + k). Ties share a rank and are listed by profile id.
+
+    The vectors can be saved to a snapshot file along with each profile's
+    updated_at. A restart then only lists the ids and versions of the stored
+    profiles and fetches the ones written or deleted since, instead of
+    reading every profile. Only one process at a time writes the snapshot
+    (the one holding a lock on <snapshot>.lock).
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = LEADERBOARD_SNAPSHOT_PATH):
+        self.snapshot_path = snapshot_path
+        self._boards = {key: SortedList() for key in SCORE_KEYS}
+        self._vectors: Dict[str, bytes] = {}
+        # updated_at of each profile's row when its vector was taken
+        self._versions: Dict[str, Optional[str]] = {}
+        # Score writes seen while load() reads the store, replayed after it
+        self._pending: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+        self._load_lock = asyncio.Lock()
+        self._writer_lock = None
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    @staticmethod
+    def _board_index(component: str) -> int:
+        if component not in SCORE_KEYS:
+            raise ValueError(f"Unknown score component: {component}")
+        return SCORE_KEYS.index(component)
+
+    def upsert(self, profile_id: str, braved_scores: Dict[str, int], balajis_scores: Dict[str, int],
+               version: Optional[str] = None):
+        """Place a profile on every board with its current scores"""
+        vector = ScoreVector.from_dicts(braved_scores, balajis_scores).tobytes()
+        old = self._vectors.get(profile_id)
+        for index, key in enumerate(SCORE_KEYS):
+            score = vector[index]
+            if old is not None:
+                if old[index] == score:
+                    continue
+                self._boards[key].remove((-old[index], profile_id))
+            self._boards[key].add((-score, profile_id))
+        self._vectors[profile_id] = vector
+        self._versions[profile_id] = version
+
+    def remove(self, profile_id: str):
+        """Take a profile off every board"""
+        previous = self._vectors.pop(profile_id, None)
+        self._versions.pop(profile_id, None)
+        if previous is not None:
+            for key, score in zip(SCORE_KEYS, previous):
+                self._boards[key].remove((-score, profile_id))
+
+    def on_profile_write(self, profile_id: str, row: Optional[Dict[str, Any]]):
+        """ProfileService score listener"""
+        if self._pending is not None:
+            # Applied now, the write could be overwritten by the rows being loaded
+            self._pending[profile_id] = row
+        elif row is None:
+            self.remove(profile_id)
+        else:
+            self.upsert(profile_id, row.get("braved_scores"), row.get("balajis_scores"), row.get("updated_at"))
+
+    def _rebuild(self, profile_ids: List[str], vectors: np.ndarray, versions: List[Optional[str]]):
+        # SortedList bulk construction sorts once instead of n inserts
+        self._boards = {
+            key: SortedList(zip((-vectors[:, index].astype(np.int64)).tolist(), profile_ids))
+            for index, key in enumerate(SCORE_KEYS)
+        }
+        self._vectors = {profile_id: vector.tobytes() for profile_id, vector in zip(profile_ids, vectors)}
+        self._versions = dict(zip(profile_ids, versions))
+
+    async def load(self, store: ProfileStore, page_size: int = 5000):
+        """
+        Build the boards from the snapshot brought up to date, or from the store.
+
+        Score writes made meanwhile are held back and applied afterwards, the
+        last write of a profile winning.
+        """
+        async with self._load_lock:
+            self._pending = {}
+            try:
+                if not (self.load_snapshot() and await self._catch_up(store, page_size)):
+                    await self._scan(store, page_size)
+                self.loaded = True
+            finally:
+                pending, self._pending = self._pending, None
+                for profile_id, row in pending.items():
+                    self.on_profile_write(profile_id, row)
+
+    async def _scan(self, store: ProfileStore, page_size: int):
+        profile_ids = []
+        versions = []
+        vectors = bytearray()
+        offset = 0
+        while True:
+            rows = await store.list_profiles(limit=page_size, offset=offset)
+            for row in rows:
+                profile_ids.append(row["id"])
+                versions.append(row.get("updated_at"))
+                vectors += ScoreVector.from_row(row).tobytes()
+            if len(rows) < page_size:
+                break
+            offset += page_size
+        self._rebuild(
+            profile_ids, np.frombuffer(bytes(vectors), dtype=np.uint8).reshape(-1, len(SCORE_KEYS)), versions
+        )
+
+    async def _catch_up(self, store: ProfileStore, page_size: int) -> bool:
+        """
+        Apply the writes and deletes made since the loaded snapshot.
+
+        Returns False, leaving the boards as they are, when so much changed
+        that a full scan is cheaper.
+        """
+        stored = {}
+        offset = 0
+        while True:
+            rows = await store.list_profile_versions(limit=page_size, offset=offset)
+            stored.update((row["id"], row["updated_at"]) for row in rows)
+            if len(rows) < page_size:
+                break
+            offset += page_size
+
+        stale = [
+            profile_id for profile_id, version in stored.items()
+            if version is None or self._versions.get(profile_id) != version
+        ]
+        if len(stale) > CATCH_UP_LIMIT * len(stored):
+            return False
+        for profile_id in [profile_id for profile_id in self._vectors if profile_id not in stored]:
+            self.remove(profile_id)
+        for profile_id in stale:
+            row = await store.get_profile(profile_id)
+            if row is None:
+                self.remove(profile_id)
+            else:
+                self.upsert(profile_id, row.get("braved_scores"), row.get("balajis_scores"), row.get("updated_at"))
+        return True
+
+    def is_snapshot_writer(self) -> bool:
+        """
+        Whether this process writes the snapshot.
+
+        The first process to lock <snapshot>.lock keeps the lock for as long
+        as it runs, so other workers never overwrite its snapshot; when it
+        exits, the next one to ask takes over.
+        """
+        if self._writer_lock is None and self.snapshot_path:
+            if fcntl is None:
+                return True
+            lock_file = open(f"{self.snapshot_path}.lock", "a")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+            self._writer_lock = lock_file
+        return self._writer_lock is not None
+
+    def save_snapshot(self) -> bool:
+        """Write the current vectors and versions to the snapshot file, if this process is the writer"""
+        if not self.snapshot_path or not self.is_snapshot_writer():
+            return False
+        profile_ids = list(self._vectors)
+        vectors = np.frombuffer(b"".join(self._vectors.values()), dtype=np.uint8).reshape(-1, len(SCORE_KEYS))
+        versions = [self._versions.get(profile_id) or "" for profile_id in profile_ids]
+        temporary_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as snapshot:
+            np.savez(
+                snapshot, keys=np.array(SCORE_KEYS), profile_ids=np.array(profile_ids, dtype=str),
+                vectors=vectors, versions=np.array(versions, dtype=str)
+            )
+        os.replace(temporary_path, self.snapshot_path)
+        return True
+
+    def load_snapshot(self) -> bool:
+        """Rebuild the boards from the snapshot file, if it exists and matches"""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        with np.load(self.snapshot_path) as snapshot:
+            # Snapshots without versions can't be brought up to date
+            if snapshot["keys"].tolist() != SCORE_KEYS or "versions" not in snapshot.files:
+                return False
+            versions = [version or None for version in snapshot["versions"].tolist()]
+            self._rebuild(snapshot["profile_ids"].tolist(), snapshot["vectors"], versions)
+        return True
+
+    def _entries(self, key: str, start: int, stop: int) -> List[Dict[str, Any]]:
+        """List board positions [start, stop) with competition ranks"""
+        board = self._boards[key]
+        entries = []
+        rank = None
+        previous_score = None
+        for position, (negative_score, profile_id) in enumerate(board.islice(start, stop), start):
+            if negative_score != previous_score:
+                # Only the first entry needs a search; later ones start a new
+                # rank exactly where their score group begins
+                rank = board.bisect_left((negative_score, "")) + 1 if rank is None else position + 1
+                previous_score = negative_score
+            entries.append({"rank": rank, "profile_id": profile_id, "score": -negative_score})
+        return entries
+
+    def top(self, component: str, k: int = 10) -> List[Dict[str, Any]]:
+        """Get the k highest scoring profiles on a board"""
+        key = SCORE_KEYS[self._board_index(component)]
+        return self._entries(key, 0, k)
+
+    def rank(self, component: str, profile_id: str) -> Dict[str, Any]:
+        """Get a profile's rank and score on a board"""
+        index = self._board_index(component)
+        vector = self._vectors.get(profile_id)
+        if vector is None:
+            raise KeyError(profile_id)
+        key = SCORE_KEYS[index]
+        score = int(vector[index])
+        return {
+            "rank": self._boards[key].bisect_left((-score, "")) + 1,
+            "profile_id": profile_id,
+            "score": score,
+            "total": len(self._boards[key])
+        }
+
+    def around(self, component: str, profile_id: str, radius: int = 5) -> List[Dict[str, Any]]:
+        """Get the entries ranked just above and below a profile"""
+        index = self._board_index(component)
+        vector = self._vectors.get(profile_id)
+        if vector is None:
+            raise KeyError(profile_id)
+        key = SCORE_KEYS[index]
+        board = self._boards[key]
+        position = board.index((-vector[index], profile_id))
+        return self._entries(key, max(position - radius, 0), position + radius + 1)
+
+_leaderboard_service: Optional[LeaderboardService] = None
+
+def get_leaderboard_service() -> LeaderboardService:
+    """Get the process-wide leaderboards, kept current by the shared ProfileService"""
+    global _leaderboard_service
+    if _leaderboard_service is None:
+        _leaderboard_service = LeaderboardService()
+        get_profile_service().add_score_listener(_leaderboard_service.on_profile_write)
+    return _leaderboard_service
@@ -0,0 +1,406 @@
+import bisect
+import hashlib
+import json
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from itertools import takewhile
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+
+LEVELS = ("beginner", "intermediate", "advanced")
+DEFAULT_MODULE_WEEKS = 4
+# Compiled DAGs kept, most recently used catalog versions first
+COMPILED_CACHE_SIZE = 8
+
+Catalog = Mapping  # module id -> module dict
+
+def catalog_from_recommendations(framework: str, recommendations: Dict[str, Any]) -> Catalog:
+    """
+    Turn the learning paths of BRAVED/BALAJIS recommendations into modules.
+
+    Each component's beginner, intermediate and advanced stages become one
+    module, each requiring the stage before it.
+    """
+    catalog = {}
+    for component, recommendation in recommendations.items():
+        previous = None
+        for level in LEVELS:
+            path = recommendation.get("learning_path", {}).get(level)
+            if not path:
+                continue
+            module_id = f"{framework}.{component}.{level}"
+            catalog[module_id] = {
+                "title": path["title"],
+                "framework": framework,
+                "component": recommendation.get("name", component),
+                "level": level,
+                "steps": list(path.get("steps", [])),
+                "duration_weeks": DEFAULT_MODULE_WEEKS,
+                "prerequisites": [previous] if previous else []
+            }
+            previous = module_id
+    return catalog
+
+def catalog_version(catalog: Catalog) -> str:
+    """Content hash identifying a catalog, including its module order (which breaks ties in plans)"""
+    encoded = json.dumps(list(catalog.items()), sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+class FrozenCatalog(Mapping):
+    """
+    A read-only deep copy of a catalog.
+
+    Later changes to the caller's dicts don't reach it, and its version is
+    hashed once, so planning again with the same FrozenCatalog skips the
+    hash.
+    """
+
+    def __init__(self, catalog: Catalog, version: Optional[str] = None):
+        if version is not None:
+            self.version = version
+        else:
+            # Hashed from the caller's dicts: read-only proxies aren't JSON serializable
+            self.version = catalog_version(catalog)
+        self._modules = {module_id: _freeze(module) for module_id, module in catalog.items()}
+
+    def __getitem__(self, module_id: str):
+        return self._modules[module_id]
+
+    def __iter__(self):
+        return iter(self._modules)
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+class CompiledDag:
+    """
+    A catalog's prerequisite graph in compressed sparse row form.
+
+    Modules are numbered in topological order, so every traversal below is
+    a single O(V + E) sweep over the arrays. The modules are kept from a
+    FrozenCatalog, so a cached DAG can't change under its callers.
+    """
+
+    def __init__(self, catalog: Catalog):
+        if not isinstance(catalog, FrozenCatalog):
+            catalog = FrozenCatalog(catalog)
+        ids = list(catalog)
+        index = {module_id: position for position, module_id in enumerate(ids)}
+        edges: List[Tuple[int, int]] = []
+        for module_id, module in catalog.items():
+            for prerequisite in module.get("prerequisites", []):
+                if prerequisite not in index:
+                    raise ValueError(f"{module_id} requires unknown module {prerequisite}")
+                edges.append((index[prerequisite], index[module_id]))
+
+        # Kahn's algorithm over the input numbering
+        successors = self._csr(len(ids), edges)
+        indegree = np.bincount([child for _, child in edges], minlength=len(ids))
+        order = [position for position in range(len(ids)) if indegree[position] == 0]
+        for position in order:
+            for child in successors[1][successors[0][position]:successors[0][position + 1]].tolist():
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    order.append(child)
+        if len(order) < len(ids):
+            raise ValueError("Module prerequisites contain a cycle")
+
+        # Renumber so that prerequisites always come first
+        rank = np.empty(len(ids), dtype=np.intp)
+        rank[order] = np.arange(len(ids))
+        self.ids = [ids[position] for position in order]
+        self.index = {module_id: position for position, module_id in enumerate(self.ids)}
+        self.modules = [catalog[module_id] for module_id in self.ids]
+        ranked_edges = [(int(rank[parent]), int(rank[child])) for parent, child in edges]
+        self.successors = self._csr(len(ids), ranked_edges)
+        self.predecessors = self._csr(len(ids), [(child, parent) for parent, child in ranked_edges])
+        self.durations = np.array(
+            [module.get("duration_weeks", DEFAULT_MODULE_WEEKS) for module in self.modules], dtype=np.int64
+        )
+
+    @staticmethod
+    def _csr(size: int, edges: List[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+        sources = np.array([source for source, _ in edges], dtype=np.intp)
+        targets = np.array([target for _, target in edges], dtype=np.intp)
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(size + 1, dtype=np.intp)
+        np.cumsum(np.bincount(sources, minlength=size), out=indptr[1:])
+        return indptr, targets[order]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def required(self, targets: Iterable[str], completed: Iterable[str] = ()) -> np.ndarray:
+        """Mark the targets and every prerequisite they need, minus completed modules"""
+        needed = np.zeros(len(self.ids), dtype=bool)
+        done = np.zeros(len(self.ids), dtype=bool)
+        for module_id in completed:
+            if module_id in self.index:
+                done[self.index[module_id]] = True
+        for module_id in targets:
+            if module_id not in self.index:
+                raise KeyError(module_id)
+            position = self.index[module_id]
+            needed[position] = not done[position]
+        indptr, parents = self.predecessors
+        # Reverse topological order: a module's need is final before its parents are visited
+        for position in range(len(self.ids) - 1, -1, -1):
+            if needed[position]:
+                for parent in parents[indptr[position]:indptr[position + 1]].tolist():
+                    if not done[parent]:
+                        needed[parent] = True
+        return needed
+
+    def stages(self, needed: np.ndarray, max_parallel: int) -> List[List[int]]:
+        """
+        Group the needed modules into stages that can run side by side.
+
+        A module's depth is one more than its deepest needed prerequisite;
+        modules of equal depth share a stage, split into groups of at most
+        max_parallel tracks.
+        """
+        depth = np.zeros(len(self.ids), dtype=np.intp)
+        indptr, children = self.successors
+        for position in np.flatnonzero(needed).tolist():
+            for child in children[indptr[position]:indptr[position + 1]].tolist():
+                if needed[child] and depth[child] <= depth[position]:
+                    depth[child] = depth[position] + 1
+
+        by_depth: Dict[int, List[int]] = {}
+        for position in np.flatnonzero(needed).tolist():
+            by_depth.setdefault(int(depth[position]), []).append(position)
+        stages = []
+        for level in sorted(by_depth):
+            modules = by_depth[level]
+            stages.extend(modules[start:start + max_parallel] for start in range(0, len(modules), max_parallel))
+        return stages
+
+def _module_tasks(module: Dict[str, Any]) -> List[str]:
+    return module.get("objectives") or module.get("steps") or [module["title"]]
+
+def catalog_from_modules(modules: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Turn learning path modules into a planner catalog.
+
+    Modules are known by their "module_id", or by their position when they
+    have none; only what the planner reads is copied, so the catalog
+    version doesn't change with resources and other extras.
+    """
+    return {
+        module.get("module_id", f"module.{index}"): {
+            "title": module["title"],
+            "duration_weeks": module["duration_weeks"],
+            "objectives": list(_module_tasks(module)),
+            "prerequisites": list(module.get("prerequisites", []))
+        }
+        for index, module in enumerate(modules)
+    }
+
+class StagedSchedule:
+    """
+    A planned path: the needed modules in stages, each stage starting when
+    the longest module of the one before ends.
+
+    Only the stage layout is computed up front; module milestones and
+    weekly entries are built as they are iterated, so paging deep into a
+    long path builds nothing before the requested week.
+    """
+
+    def __init__(self, dag: CompiledDag, stages: List[List[int]], start_date: datetime, max_parallel: int):
+        self.dag = dag
+        self.stages = stages
+        self.start_date = start_date
+        self.max_parallel = max_parallel
+        self.stage_weeks = [int(dag.durations[stage].max()) for stage in stages]
+        # Week each stage starts at, from 0; the last entry is the total
+        self.stage_starts = np.concatenate([[0], np.cumsum(self.stage_weeks, dtype=np.int64)]).tolist()
+
+    @property
+    def total_weeks(self) -> int:
+        return self.stage_starts[-1]
+
+    def _date(self, week: int) -> str:
+        return (self.start_date + timedelta(weeks=week)).isoformat()
+
+    def _module(self, stage_number: int, track: int, position: int, milestones: bool) -> Dict[str, Any]:
+        module = self.dag.modules[position]
+        weeks = int(self.dag.durations[position])
+        first_week = self.stage_starts[stage_number - 1]
+        entry = {
+            "module_id": self.dag.ids[position],
+            "module_title": module["title"],
+            "prerequisites": list(module.get("prerequisites", [])),
+            "stage": stage_number,
+            "track": track,
+            "start_date": self._date(first_week),
+            "end_date": self._date(first_week + weeks),
+            "weekly_commitment": "5-7 hours"
+        }
+        if milestones:
+            tasks = _module_tasks(module)
+            entry["milestones"] = [
+                {"week": week + 1, "description": f"Week {week + 1} objectives", "tasks": tasks[week % len(tasks)]}
+                for week in range(weeks)
+            ]
+        return entry
+
+    def iter_modules(self, milestones: bool = True) -> Iterator[Dict[str, Any]]:
+        """Yield the schedule of each module in plan order, building one module at a time"""
+        for stage_number, stage in enumerate(self.stages, 1):
+            for track, position in enumerate(stage, 1):
+                yield self._module(stage_number, track, position, milestones)
+
+    def iter_weeks(self, start_week: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the weekly milestones of every module from start_week on, in
+        week order (modules running side by side share a week).
+
+        Stages that end before start_week are skipped from the stage layout
+        alone.
+        """
+        first_stage = max(bisect.bisect_right(self.stage_starts, start_week) - 1, 0)
+        for stage_index in range(first_stage, len(self.stages)):
+            stage = self.stages[stage_index]
+            stage_start = self.stage_starts[stage_index]
+            for week in range(max(start_week - stage_start, 0), self.stage_weeks[stage_index]):
+                for position in stage:
+                    if week >= self.dag.durations[position]:
+                        continue
+                    module = self.dag.modules[position]
+                    tasks = _module_tasks(module)
+                    yield {
+                        "week": stage_start + week + 1,
+                        "module_id": self.dag.ids[position],
+                        "module_title": module["title"],
+                        "module_week": week + 1,
+                        "start_date": self._date(stage_start + week),
+                        "end_date": self._date(stage_start + week + 1),
+                        "description": f"Week {week + 1} objectives",
+                        "tasks": tasks[week % len(tasks)]
+                    }
+
+    def page(self, week: int = 0, weeks: int = 4) -> Dict[str, Any]:
+        """Get weeks [week, week + weeks) of the schedule, with the cursor of the next page"""
+        entries = list(takewhile(lambda entry: entry["week"] <= week + weeks, self.iter_weeks(week)))
+        return {
+            "start_date": self.start_date.isoformat(),
+            "total_weeks": self.total_weeks,
+            "week": week,
+            "weeks": entries,
+            "next_week": week + weeks if self.total_weeks > week + weeks else None
+        }
+
+    def to_dict(self, milestones: bool = True) -> Dict[str, Any]:
+        """The whole schedule; without milestones, only module and stage dates"""
+        return {
+            "start_date": self.start_date.isoformat(),
+            "max_parallel": self.max_parallel,
+            "modules": list(self.iter_modules(milestones)),
+            "stages": [
+                {
+                    "stage": stage_number,
+                    "start_date": self._date(self.stage_starts[stage_number - 1]),
+                    "duration_weeks": self.stage_weeks[stage_number - 1],
+                    "modules": [self.dag.ids[position] for position in stage]
+                }
+                for stage_number, stage in enumerate(self.stages, 1)
+            ],
+            "end_date": self._date(self.total_weeks),
+            "total_duration_weeks": self.total_weeks
+        }
+
+def _modules_schedule(modules: Iterable[Dict[str, Any]], start_date: datetime, max_parallel: int) -> StagedSchedule:
+    return get_learning_planner().schedule(catalog_from_modules(modules), max_parallel=max_parallel, start_date=start_date)
+
+def iter_module_schedule(modules: Iterable[Dict[str, Any]],
+                         start_date: datetime,
+                         max_parallel: int = 1) -> Iterator[Dict[str, Any]]:
+    """Yield the schedule of each module in planner order, computing one module at a time"""
+    return _modules_schedule(modules, start_date, max_parallel).iter_modules()
+
+def iter_schedule_weeks(modules: Iterable[Dict[str, Any]],
+                        start_date: datetime,
+                        start_week: int = 0,
+                        max_parallel: int = 1) -> Iterator[Dict[str, Any]]:
+    """Yield the weekly milestones of the planned modules, starting at start_week"""
+    return _modules_schedule(modules, start_date, max_parallel).iter_weeks(start_week)
+
+def schedule_page(modules: List[Dict[str, Any]],
+                  start_date: datetime,
+                  week: int = 0,
+                  weeks: int = 4,
+                  max_parallel: int = 1) -> Dict[str, Any]:
+    """Get weeks [week, week + weeks) of the planned modules' schedule, with the cursor of the next page"""
+    return _modules_schedule(modules, start_date, max_parallel).page(week, weeks)
+
+class LearningPlanner:
+    def __init__(self, cache_size: int = COMPILED_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._compiled: "OrderedDict[str, CompiledDag]" = OrderedDict()
+
+    def compile(self, catalog: Catalog, version: Optional[str] = None) -> CompiledDag:
+        """
+        Get the compiled DAG of a catalog, compiling it once per version.
+
+        A FrozenCatalog is looked up by its own version; any other catalog
+        is hashed on every call.
+        """
+        if version is None:
+            version = catalog.version if isinstance(catalog, FrozenCatalog) else catalog_version(catalog)
+        dag = self._compiled.get(version)
+        if dag is None:
+            if not isinstance(catalog, FrozenCatalog):
+                catalog = FrozenCatalog(catalog, version)
+            dag = self._compiled[version] = CompiledDag(catalog)
+            if len(self._compiled) > self.cache_size:
+                self._compiled.popitem(last=False)
+        else:
+            self._compiled.move_to_end(version)
+        return dag
+
+    def schedule(self,
+                 catalog: Catalog,
+                 targets: Optional[Iterable[str]] = None,
+                 completed: Iterable[str] = (),
+                 max_parallel: int = 2,
+                 start_date: Optional[datetime] = None,
+                 version: Optional[str] = None) -> StagedSchedule:
+        """
+        Stage the modules needed to reach the targets (default: every module).
+
+        Modules run in prerequisite order; modules whose prerequisites are
+        met together run in parallel tracks, up to max_parallel at a time.
+        """
+        if max_parallel < 1:
+            raise ValueError("max_parallel must be at least 1")
+        dag = self.compile(catalog, version)
+        needed = dag.required(dag.ids if targets is None else targets, completed)
+        return StagedSchedule(dag, dag.stages(needed, max_parallel), start_date or datetime.now(), max_parallel)
+
+    def plan(self,
+             catalog: Catalog,
+             targets: Optional[Iterable[str]] = None,
+             completed: Iterable[str] = (),
+             max_parallel: int = 2,
+             start_date: Optional[datetime] = None,
+             version: Optional[str] = None) -> Dict[str, Any]:
+        """Schedule the modules needed to reach the targets, with every module's milestones (see schedule)"""
+        return self.schedule(catalog, targets, completed, max_parallel, start_date, version).to_dict()
+
+_learning_planner: Optional[LearningPlanner] = None
+
+def get_learning_planner() -> LearningPlanner:
+    """Get the planner (and its compiled DAG cache) shared by this process"""
+    global _learning_planner
+    if _learning_planner is None:
+        _learning_planner = LearningPlanner()
+    return _learning_planner
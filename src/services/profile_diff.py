@@ -0,0 +1,57 @@
+from typing import Any, Dict, List, Tuple
+
+# JSONB columns holding flat score maps; a write to one of these only
+# carries the keys it changes, the rest are kept from the stored row.
+SCORE_COLUMNS = ("braved_scores", "balajis_scores")
+
+# Columns the database owns and that are never sent on update
+READ_ONLY_COLUMNS = ("id", "created_at", "updated_at")
+
+
+def merge_changes(row: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply a (possibly partial) set of changes on top of a stored row"""
+    merged = dict(row)
+    for column, value in changes.items():
+        if column in SCORE_COLUMNS and isinstance(value, dict):
+            merged[column] = {**(row.get(column) or {}), **value}
+        else:
+            merged[column] = value
+    return merged
+
+
+def diff_row(old: Dict[str, Any], new: Dict[str, Any],
+             merge_scores: bool = True) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+    """
+    Compare a new version of a profile row against the stored one.
+
+    Returns the PATCH payload (only the columns that changed) together with
+    the individual score keys that changed inside the JSONB score columns.
+    Score maps are merged into the stored ones unless merge_scores is false,
+    in which case they replace them and missing keys count as changed.
+    """
+    payload = {}
+    changed_keys = {}
+
+    for column, value in new.items():
+        if column in READ_ONLY_COLUMNS:
+            continue
+
+        current = old.get(column)
+        if column in SCORE_COLUMNS and isinstance(value, dict) and not merge_scores:
+            current = current or {}
+            keys = [key for key in {**current, **value} if current.get(key) != value.get(key)]
+            if keys:
+                changed_keys[column] = keys
+                payload[column] = value
+        elif column in SCORE_COLUMNS and isinstance(value, dict):
+            current = current or {}
+            keys = [key for key, score in value.items() if current.get(key) != score]
+            if keys:
+                changed_keys[column] = keys
+                # PostgREST replaces a JSONB column as a whole, so the
+                # merged map is sent; it is bounded by the framework size.
+                payload[column] = {**current, **value}
+        elif current != value:
+            payload[column] = value
+
+    return payload, changed_keys
@@ -1,68 +1,178 @@
-from typing import List, Optional
-from src.config.database import get_supabase_headers, get_supabase_url
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+from src.config.settings import PROFILE_CACHE_SIZE, PROFILE_VERSION_TTL
 from src.models.profile import Profile
-import requests
+from src.services.event_feed import EventFeed, get_event_feed
+from src.services.profile_diff import diff_row, merge_changes
+from src.storage import get_profile_store
+from src.storage.base import ProfileStore
+
+# Called with (profile_id, row) whenever a profile's scores are written;
+# row is None when the profile was deleted.
+ScoreListener = Callable[[str, Optional[Dict[str, Any]]], None]
+
+# Times a write is diffed again after another writer changed the row first
+PATCH_ATTEMPTS = 3
+
+class ConcurrentUpdateError(Exception):
+    """A profile kept changing under an update, which was therefore not applied"""
+
+# Event feed channel of profile writes, keyed by profile id
+PROFILES_CHANNEL = "profiles"
 
 class ProfileService:
-    def __init__(self):
-        self.headers = get_supabase_headers()
-        self.base_url = get_supabase_url()
-        self.table = "profiles"
+    def __init__(self, store: Optional[ProfileStore] = None, cache_size: int = PROFILE_CACHE_SIZE,
+                 feed: Optional[EventFeed] = None):
+        self.store = store or get_profile_store()
+        # Rows this process last read or wrote by id, most recent last; they
+        # only answer version checks, updates are diffed against a fresh read
+        self._rows: Dict[str, Dict[str, Any]] = OrderedDict()
+        # When each cached row was last read from or written to the database
+        self._row_times: Dict[str, float] = {}
+        self.cache_size = cache_size
+        self._score_listeners: List[ScoreListener] = []
+        # Writes are announced to the other worker processes, and theirs
+        # evict cached rows and reach the score listeners of this one
+        self.feed = feed
+        if feed is not None:
+            feed.add_handler(PROFILES_CHANNEL, self._on_remote_write)
+
+    def add_score_listener(self, listener: ScoreListener):
+        """Register a callback for score writes (indexes, aggregates, leaderboards)"""
+        self._score_listeners.append(listener)
+
+    def _notify_scores(self, profile_id: str, row: Optional[Dict[str, Any]]):
+        for listener in self._score_listeners:
+            listener(profile_id, row)
+
+    def _publish(self, profile_id: str, scores: bool):
+        if self.feed is not None:
+            self.feed.publish(PROFILES_CHANNEL, profile_id, {"scores": scores})
+
+    async def _on_remote_write(self, profile_id: str, data: Dict[str, Any]):
+        """Another process wrote the profile: drop its cached row and reindex changed scores"""
+        self._forget(profile_id)
+        if data.get("scores") and self._score_listeners:
+            # Read now, so listeners see the latest row even if events were batched
+            self._notify_scores(profile_id, await self.store.get_profile(profile_id))
+
+    def _remember(self, row: Dict[str, Any]) -> Profile:
+        """Cache a row returned by the database and build its model (unvalidated, see Profile.from_db_row)"""
+        if row.get("id"):
+            self._rows[row["id"]] = row
+            self._rows.move_to_end(row["id"])
+            self._row_times[row["id"]] = time.monotonic()
+            while len(self._rows) > self.cache_size:
+                evicted, _ = self._rows.popitem(last=False)
+                del self._row_times[evicted]
+        return Profile.from_db_row(row)
+
+    def _forget(self, profile_id: str):
+        self._rows.pop(profile_id, None)
+        self._row_times.pop(profile_id, None)
 
     async def create_profile(self, profile: Profile) -> Profile:
         """Create a new profile"""
-        data = profile.dict(exclude={'id', 'created_at'})
-        response = requests.post(
-            f"{self.base_url}/rest/v1/{self.table}",
-            headers=self.headers,
-            json=data
-        )
-        response.raise_for_status()
-        return Profile(**response.json()[0])
+        data = profile.dict(exclude={'id', 'created_at', 'updated_at'})
+        row = await self.store.create_profile(data)
+        self._notify_scores(row["id"], row)
+        self._publish(row["id"], scores=True)
+        return self._remember(row)
 
     async def get_profile(self, profile_id: str) -> Optional[Profile]:
         """Get a profile by ID"""
-        response = requests.get(
-            f"{self.base_url}/rest/v1/{self.table}",
-            headers=self.headers,
-            params={"id": f"eq.{profile_id}"}
-        )
-        response.raise_for_status()
-        data = response.json()
-        if data:
-            return Profile(**data[0])
+        row = await self.store.get_profile(profile_id)
+        if row:
+            return self._remember(row)
+        self._forget(profile_id)
         return None
 
+    async def get_profile_version(self, profile_id: str) -> Optional[str]:
+        """
+        Get a profile's row version (updated_at).
+
+        A cached row younger than PROFILE_VERSION_TTL seconds answers without
+        a database call; otherwise only the version column is fetched.
+        """
+        row = self._rows.get(profile_id)
+        if row is not None and time.monotonic() - self._row_times[profile_id] <= PROFILE_VERSION_TTL:
+            return row.get("updated_at")
+        return await self.store.get_profile_version(profile_id)
+
     async def get_all_profiles(self) -> List[Profile]:
         """Get all profiles"""
-        response = requests.get(
-            f"{self.base_url}/rest/v1/{self.table}",
-            headers=self.headers
-        )
-        response.raise_for_status()
-        return [Profile(**profile) for profile in response.json()]
+        return [Profile.from_db_row(row) for row in await self.store.list_profiles()]
+
+    async def search_profiles(self,
+                              min_scores: Optional[Dict[str, int]] = None,
+                              interests: Optional[List[str]] = None,
+                              created_after: Optional[str] = None,
+                              limit: int = 100) -> List[Profile]:
+        """
+        Find profiles by score thresholds, interests and creation time.
+
+        min_scores maps framework components (e.g. "ai", "build") to a minimum
+        score; interests matches profiles having any of the given interests.
+        Every filter is backed by an index on the profiles table.
+        """
+        rows = await self.store.search_profiles(min_scores, interests, created_after, limit)
+        return [Profile.from_db_row(row) for row in rows]
+
+    async def top_profiles(self, component: str, limit: int = 10) -> List[Profile]:
+        """Get the highest scoring profiles for a framework component"""
+        return [Profile.from_db_row(row) for row in await self.store.top_profiles(component, limit)]
 
     async def update_profile(self, profile_id: str, profile: Profile) -> Optional[Profile]:
-        """Update a profile"""
-        data = profile.dict(exclude={'id', 'created_at'})
-        response = requests.patch(
-            f"{self.base_url}/rest/v1/{self.table}",
-            headers=self.headers,
-            params={"id": f"eq.{profile_id}"},
-            json=data
+        """Replace a profile's fields, sending only the ones that changed"""
+        return await self.patch_profile(
+            profile_id, profile.dict(exclude={'id', 'created_at', 'updated_at'}), merge_scores=False
         )
-        response.raise_for_status()
-        data = response.json()
-        if data:
-            return Profile(**data[0])
-        return None
+
+    async def patch_profile(self, profile_id: str, changes: Dict[str, Any],
+                            merge_scores: bool = True) -> Optional[Profile]:
+        """
+        Apply a partial update to a profile.
+
+        Score maps may contain only the keys being changed (unless
+        merge_scores is false, when they replace the stored maps). The
+        changes are diffed against the row as read now and written only if
+        it is still that version; when another writer got in between, the
+        diff is redone against its row, up to PATCH_ATTEMPTS times.
+        """
+        for _ in range(PATCH_ATTEMPTS):
+            row = await self.store.get_profile(profile_id)
+            if row is None:
+                self._forget(profile_id)
+                return None
+
+            new = merge_changes(row, changes) if merge_scores else {**row, **changes}
+            payload, changed_keys = diff_row(row, new, merge_scores)
+            if not payload:
+                return self._remember(row)
+
+            updated = await self.store.update_profile(profile_id, payload, expected_version=row.get("updated_at"))
+            if updated:
+                if changed_keys:
+                    self._notify_scores(profile_id, updated)
+                self._publish(profile_id, scores=bool(changed_keys))
+                return self._remember(updated)
+        raise ConcurrentUpdateError(f"Profile {profile_id} changed during the update")
 
     async def delete_profile(self, profile_id: str) -> bool:
         """Delete a profile"""
-        response = requests.delete(
-            f"{self.base_url}/rest/v1/{self.table}",
-            headers=self.headers,
-            params={"id": f"eq.{profile_id}"}
-        )
-        response.raise_for_status()
-        return bool(response.json()) 
\ No newline at end of file
+        self._forget(profile_id)
+        deleted = await self.store.delete_profile(profile_id)
+        if deleted:
+            self._notify_scores(profile_id, None)
+            self._publish(profile_id, scores=True)
+        return deleted
+
+_profile_service: Optional[ProfileService] = None
+
+def get_profile_service() -> ProfileService:
+    """Get the ProfileService shared by all routes of this process"""
+    global _profile_service
+    if _profile_service is None:
+        _profile_service = ProfileService(feed=get_event_feed())
+    return _profile_service
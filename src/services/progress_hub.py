@@ -0,0 +1,125 @@
+"""
+Fan-out of analysis progress events to WebSocket subscribers.
+
+Each event is serialized once and the same string is queued for every
+subscriber of the user. An idle subscriber is a small slotted object with
+no task or buffer of its own: a sender task and a bounded buffer exist only
+while it has events waiting to go out, and a subscriber too slow to keep up
+loses its oldest pending events rather than growing without bound.
+
+Events are also published on the event feed, so a client subscribed to any
+worker follows an analysis running on another one.
+"""
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set
+import orjson
+from src.services.event_feed import EventFeed, get_event_feed
+
+# Events buffered per subscriber before the oldest are dropped
+MAX_PENDING_EVENTS = 64
+# Users whose latest event is kept for clients that subscribe mid-analysis
+LATEST_EVENTS_KEPT = 1024
+# Event feed channel of progress events, keyed by user id
+PROGRESS_CHANNEL = "progress"
+
+Send = Callable[[str], Awaitable[None]]
+# Reports one event of an analysis, e.g. progress("agent_started", agent="LearningPathAgent")
+ProgressReporter = Callable[..., None]
+
+class Subscriber:
+    __slots__ = ("send", "pending", "closed")
+
+    def __init__(self, send: Send):
+        self.send = send
+        # Created when events are waiting, dropped once they are sent
+        self.pending: Optional[Deque[str]] = None
+        self.closed = False
+
+    def push(self, payload: str):
+        if self.closed:
+            return
+        if self.pending is not None:
+            # A sender task is already draining the buffer
+            self.pending.append(payload)
+            return
+        self.pending = deque((payload,), maxlen=MAX_PENDING_EVENTS)
+        asyncio.get_running_loop().create_task(self._drain())
+
+    async def _drain(self):
+        try:
+            while self.pending:
+                await self.send(self.pending.popleft())
+        except Exception:
+            # The connection is gone; the endpoint unsubscribes it
+            self.closed = True
+        finally:
+            self.pending = None
+
+class ProgressHub:
+    def __init__(self, feed: Optional[EventFeed] = None):
+        self._subscribers: Dict[str, Set[Subscriber]] = {}
+        self._latest: "OrderedDict[str, str]" = OrderedDict()
+        self.feed = feed
+        if feed is not None:
+            feed.add_handler(PROGRESS_CHANNEL, self._on_remote_event)
+
+    def subscribe(self, user_id: str, send: Send) -> Subscriber:
+        """Subscribe to a user's events; the latest one, if any, is sent first"""
+        subscriber = Subscriber(send)
+        self._subscribers.setdefault(user_id, set()).add(subscriber)
+        latest = self._latest.get(user_id)
+        if latest is not None:
+            subscriber.push(latest)
+        return subscriber
+
+    def unsubscribe(self, user_id: str, subscriber: Subscriber):
+        subscriber.closed = True
+        subscribers = self._subscribers.get(user_id)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[user_id]
+
+    def subscriber_count(self, user_id: Optional[str] = None) -> int:
+        if user_id is not None:
+            return len(self._subscribers.get(user_id, ()))
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, user_id: str, event: str, **data: Any):
+        """Send an event to every subscriber of the user, in every worker, serializing it once"""
+        payload = orjson.dumps(
+            {"user_id": user_id, "event": event, "timestamp": time.time(), **data},
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+        self._deliver(user_id, payload)
+        if self.feed is not None:
+            self.feed.publish(PROGRESS_CHANNEL, user_id, payload)
+
+    async def _on_remote_event(self, user_id: str, payload: str):
+        """An event of an analysis another worker runs"""
+        self._deliver(user_id, payload)
+
+    def _deliver(self, user_id: str, payload: str):
+        self._latest[user_id] = payload
+        self._latest.move_to_end(user_id)
+        if len(self._latest) > LATEST_EVENTS_KEPT:
+            self._latest.popitem(last=False)
+        for subscriber in self._subscribers.get(user_id, ()):
+            subscriber.push(payload)
+
+    def reporter(self, user_id: str) -> ProgressReporter:
+        """A callback publishing events of one user's analysis"""
+        def report(event: str, **data: Any):
+            self.publish(user_id, event, **data)
+        return report
+
+_progress_hub: Optional[ProgressHub] = None
+
+def get_progress_hub() -> ProgressHub:
+    """Get the progress hub of this process, following the other workers' events"""
+    global _progress_hub
+    if _progress_hub is None:
+        _progress_hub = ProgressHub(feed=get_event_feed())
+    return _progress_hub
@@ -0,0 +1,298 @@
+import heapq
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+import numpy as np
+from src.services.event_feed import EventFeed, get_event_feed
+from src.services.profile_service import PATCH_ATTEMPTS, ConcurrentUpdateError
+from src.storage import get_profile_store
+from src.storage.base import ProfileStore
+
+DAY_SECONDS = 86400.0
+MIN_EASE = 1.3
+START_EASE = 2.5
+
+# user_state kind of a user's review document, and event feed channel of
+# review writes (keyed by user id)
+REVIEWS_KIND = "reviews"
+REVIEWS_CHANNEL = "reviews"
+
+T = TypeVar("T")
+
+class ReviewScheduler:
+    """
+    SM-2 spaced-repetition scheduler for every (user, item) pair.
+
+    Review state lives in parallel arrays indexed by slot: ease, interval in
+    days, repetition count and next due time (epoch seconds). Each user has
+    a min-heap of (due, slot) and a global min-heap holds each user's
+    earliest due time, so "what is due for this user" and "which users have
+    reviews due soon" read heap tops instead of scanning every item.
+    Rescheduled entries are left in the heaps and skipped when stale.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._ease = np.full(capacity, START_EASE, dtype=np.float32)
+        self._interval = np.zeros(capacity, dtype=np.float32)
+        self._repetitions = np.zeros(capacity, dtype=np.int32)
+        self._due = np.zeros(capacity, dtype=np.float64)
+        self._keys: List[Optional[Tuple[str, str]]] = [None] * capacity
+        self._slots: Dict[Tuple[str, str], int] = {}
+        self._size = 0
+
+        self._user_slots: Dict[str, List[int]] = {}
+        self._user_heaps: Dict[str, List[Tuple[float, int]]] = {}
+        # Earliest due time per user as last pushed to the global heap
+        self._user_next: Dict[str, float] = {}
+        self._users_heap: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self):
+        capacity = len(self._keys) * 2
+        for name, fill in (("_ease", START_EASE), ("_interval", 0), ("_repetitions", 0), ("_due", 0)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+        self._keys.extend([None] * (capacity - len(self._keys)))
+
+    def _slot(self, user_id: str, item_id: str) -> int:
+        key = (user_id, item_id)
+        slot = self._slots.get(key)
+        if slot is None:
+            if self._size == len(self._keys):
+                self._grow()
+            slot = self._size
+            self._size += 1
+            self._slots[key] = slot
+            self._keys[slot] = key
+            self._user_slots.setdefault(user_id, []).append(slot)
+        return slot
+
+    def _is_current(self, entry: Tuple[float, int]) -> bool:
+        return self._due[entry[1]] == entry[0]
+
+    def _schedule(self, user_id: str, slot: int, due: float):
+        self._due[slot] = due
+        heap = self._user_heaps.setdefault(user_id, [])
+        heapq.heappush(heap, (due, slot))
+        if len(heap) > 2 * len(self._user_slots[user_id]) + 16:
+            heap[:] = [(float(self._due[slot]), slot) for slot in self._user_slots[user_id]]
+            heapq.heapify(heap)
+        self._refresh_user(user_id)
+
+    def _refresh_user(self, user_id: str):
+        """Drop stale heap tops and publish the user's earliest due time"""
+        heap = self._user_heaps[user_id]
+        while heap and not self._is_current(heap[0]):
+            heapq.heappop(heap)
+        if not heap:
+            return
+        earliest = heap[0][0]
+        if self._user_next.get(user_id) != earliest:
+            self._user_next[user_id] = earliest
+            heapq.heappush(self._users_heap, (earliest, user_id))
+            if len(self._users_heap) > 2 * len(self._user_next) + 64:
+                self._users_heap = [(due, user) for user, due in self._user_next.items()]
+                heapq.heapify(self._users_heap)
+
+    def review(self, user_id: str, item_id: str, quality: int, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Record a review graded 0 (blackout) to 5 (perfect recall) and
+        schedule the next one with the SM-2 rules.
+        """
+        if not 0 <= quality <= 5:
+            raise ValueError("quality must be between 0 and 5")
+        now = time.time() if now is None else now
+        slot = self._slot(user_id, item_id)
+
+        repetitions = int(self._repetitions[slot])
+        if quality < 3:
+            repetitions = 0
+            interval = 1.0
+        else:
+            if repetitions == 0:
+                interval = 1.0
+            elif repetitions == 1:
+                interval = 6.0
+            else:
+                interval = round(float(self._interval[slot]) * float(self._ease[slot]))
+            repetitions += 1
+
+        lapse = 5 - quality
+        self._ease[slot] = max(MIN_EASE, float(self._ease[slot]) + 0.1 - lapse * (0.08 + lapse * 0.02))
+        self._interval[slot] = interval
+        self._repetitions[slot] = repetitions
+        self._schedule(user_id, slot, now + interval * DAY_SECONDS)
+        return self._state(slot)
+
+    def seed(self, user_id: str, item_id: str, ratio: float, now: Optional[float] = None) -> bool:
+        """Schedule an item the user has no review history for, graded from a 0-1 success ratio"""
+        if (user_id, item_id) in self._slots:
+            return False
+        quality = int(round(min(max(ratio, 0.0), 1.0) * 5))
+        self.review(user_id, item_id, quality, now)
+        return True
+
+    def seed_from_retention(self, user_id: str, retention_patterns: Dict[str, Any], now: Optional[float] = None) -> int:
+        """Seed one item per topic from NeuroscienceAgent retention patterns"""
+        seeded = 0
+        for topic, counts in retention_patterns.get("topic_retention", {}).items():
+            if counts.get("total_questions"):
+                ratio = counts["correct_answers"] / counts["total_questions"]
+                seeded += self.seed(user_id, topic, ratio, now)
+        return seeded
+
+    def seed_from_mastery(self, user_id: str, assessment: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """Seed a topic from a NeuroscienceAgent mastery assessment (score 0-100)"""
+        if not assessment.get("topic"):
+            return False
+        return self.seed(user_id, assessment["topic"], assessment.get("score", 0.0) / 100, now)
+
+    def _state(self, slot: int) -> Dict[str, Any]:
+        user_id, item_id = self._keys[slot]
+        return {
+            "user_id": user_id,
+            "item_id": item_id,
+            "due": float(self._due[slot]),
+            "interval_days": float(self._interval[slot]),
+            "ease": round(float(self._ease[slot]), 4),
+            "repetitions": int(self._repetitions[slot])
+        }
+
+    def document(self, user_id: str) -> Dict[str, Dict[str, Any]]:
+        """A user's review state by item, as stored in the user's review document"""
+        document = {}
+        for slot in self._user_slots.get(user_id, ()):
+            state = self._state(slot)
+            document[state.pop("item_id")] = {key: value for key, value in state.items() if key != "user_id"}
+        return document
+
+    def load_user(self, user_id: str, document: Dict[str, Dict[str, Any]]):
+        """Replace the review state of the user's items with a stored review document"""
+        for item_id, state in document.items():
+            slot = self._slot(user_id, item_id)
+            self._ease[slot] = state["ease"]
+            self._interval[slot] = state["interval_days"]
+            self._repetitions[slot] = state["repetitions"]
+            self._schedule(user_id, slot, state["due"])
+
+    def state(self, user_id: str, item_id: str) -> Dict[str, Any]:
+        """Get the review state of an item"""
+        slot = self._slots.get((user_id, item_id))
+        if slot is None:
+            raise KeyError((user_id, item_id))
+        return self._state(slot)
+
+    def next_due(self, user_id: str) -> Optional[float]:
+        """Get when the user's next review is due"""
+        return self._user_next.get(user_id)
+
+    @staticmethod
+    def _heap_entries_until(heap: List[Tuple], horizon: float):
+        """Yield heap entries due at or before horizon, visiting only those nodes and their children"""
+        pending = [0] if heap and heap[0][0] <= horizon else []
+        while pending:
+            index = pending.pop()
+            yield heap[index]
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap) and heap[child][0] <= horizon:
+                    pending.append(child)
+
+    def due_items(self, user_id: str, now: Optional[float] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the user's items due for review, most overdue first"""
+        now = time.time() if now is None else now
+        heap = self._user_heaps.get(user_id, [])
+        due = sorted({entry for entry in self._heap_entries_until(heap, now) if self._is_current(entry)})
+        return [self._state(slot) for _, slot in due[:limit]]
+
+    def users_due(self, within_seconds: float = 3600, now: Optional[float] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the users with a review due in the next within_seconds, soonest first"""
+        now = time.time() if now is None else now
+        due = sorted({
+            (earliest, user_id)
+            for earliest, user_id in self._heap_entries_until(self._users_heap, now + within_seconds)
+            if self._user_next.get(user_id) == earliest
+        })
+        return [{"user_id": user_id, "next_due": earliest} for earliest, user_id in due[:limit]]
+
+class ReviewService:
+    """
+    Review queues stored as one user_state document per user.
+
+    Every write is a version-checked read-modify-write of the user's
+    document, so workers never overwrite each other's reviews. Each worker
+    indexes the documents in a ReviewScheduler for the due queries; writes
+    of other workers reach it through the event feed.
+    """
+
+    def __init__(self, store: Optional[ProfileStore] = None, feed: Optional[EventFeed] = None,
+                 scheduler: Optional[ReviewScheduler] = None):
+        self.store = store or get_profile_store()
+        self.scheduler = scheduler or ReviewScheduler()
+        self.loaded = False
+        self.feed = feed
+        if feed is not None:
+            feed.add_handler(REVIEWS_CHANNEL, self._on_remote_write)
+
+    async def load(self):
+        """Index every user's stored reviews"""
+        for row in await self.store.list_user_states(REVIEWS_KIND):
+            self.scheduler.load_user(row["user_id"], row["data"])
+        self.loaded = True
+
+    async def refresh(self, user_id: str):
+        """Index the user's stored reviews as they are now"""
+        row = await self.store.get_user_state(user_id, REVIEWS_KIND)
+        if row is not None:
+            self.scheduler.load_user(user_id, row["data"])
+
+    async def _on_remote_write(self, user_id: str, data: Any):
+        await self.refresh(user_id)
+
+    async def _update(self, user_id: str, change: Callable[[ReviewScheduler], T]) -> T:
+        """Apply a change to the user's stored reviews, redone if another writer got in between"""
+        for _ in range(PATCH_ATTEMPTS):
+            row = await self.store.get_user_state(user_id, REVIEWS_KIND)
+            # The change runs on a scheduler holding only this user's stored reviews
+            scratch = ReviewScheduler(capacity=max(len(row["data"]) if row else 0, 1))
+            if row is not None:
+                scratch.load_user(user_id, row["data"])
+            result = change(scratch)
+            document = scratch.document(user_id)
+            if document == (row["data"] if row else {}):
+                return result
+            if row is None:
+                saved = await self.store.create_user_state(user_id, REVIEWS_KIND, document)
+            else:
+                saved = await self.store.update_user_state(user_id, REVIEWS_KIND, document, row["updated_at"])
+            if saved:
+                self.scheduler.load_user(user_id, document)
+                if self.feed is not None:
+                    self.feed.publish(REVIEWS_CHANNEL, user_id)
+                return result
+        raise ConcurrentUpdateError(f"Reviews of {user_id} changed during the update")
+
+    async def review(self, user_id: str, item_id: str, quality: int, now: Optional[float] = None) -> Dict[str, Any]:
+        """Record a review (see ReviewScheduler.review) and store it"""
+        if not 0 <= quality <= 5:
+            raise ValueError("quality must be between 0 and 5")
+        return await self._update(user_id, lambda scheduler: scheduler.review(user_id, item_id, quality, now))
+
+    async def seed(self, user_id: str, retention_patterns: Dict[str, Any],
+                   mastery_assessments: List[Dict[str, Any]], now: Optional[float] = None) -> int:
+        """Schedule first reviews from NeuroscienceAgent retention patterns and mastery assessments"""
+        def seed(scheduler: ReviewScheduler) -> int:
+            seeded = scheduler.seed_from_retention(user_id, retention_patterns, now)
+            return seeded + sum(scheduler.seed_from_mastery(user_id, assessment, now) for assessment in mastery_assessments)
+        return await self._update(user_id, seed)
+
+_review_service: Optional[ReviewService] = None
+
+def get_review_service() -> ReviewService:
+    """Get the review service of this process"""
+    global _review_service
+    if _review_service is None:
+        _review_service = ReviewService(feed=get_event_feed())
+    return _review_service
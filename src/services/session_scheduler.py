@@ -0,0 +1,348 @@
+import bisect
+from collections import Counter
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, Dict, Iterable, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import numpy as np
+from src.services.profile_service import PATCH_ATTEMPTS, ConcurrentUpdateError
+from src.storage import get_profile_store
+from src.storage.base import ProfileStore
+
+WEEK_HOURS = 7 * 24
+DEFAULT_WEEKLY_HOURS = 6
+DEFAULT_MAX_DAILY_HOURS = 2
+# Sessions are packed, and catch-up sessions searched for, this many weeks ahead at most
+MAX_SEARCH_WEEKS = 520
+# user_state kind of a learner's session plan
+SESSION_PLAN_KIND = "session_plan"
+
+class NoSessionPlanError(KeyError):
+    """The learner has no stored session plan"""
+
+def learner_zone(name: str) -> tzinfo:
+    """The IANA time zone (e.g. "Europe/Berlin") learner availability is given in"""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone: {name}")
+
+def availability_mask(availability: Iterable[Dict[str, int]]) -> np.ndarray:
+    """
+    Turn weekly availability windows into a 168-slot mask.
+
+    Each window is {"day": 0-6 (Monday first), "start_hour": 0-23,
+    "end_hour": 1-24}; the end hour is exclusive.
+    """
+    mask = np.zeros(WEEK_HOURS, dtype=bool)
+    for window in availability:
+        day, start, end = window["day"], window["start_hour"], window["end_hour"]
+        if not (0 <= day < 7 and 0 <= start < end <= 24):
+            raise ValueError(f"Invalid availability window: {window}")
+        mask[day * 24 + start:day * 24 + end] = True
+    return mask
+
+def slot_scores(optimal_times: Iterable[Dict[str, Any]] = (),
+                optimal_weekly_slots: Iterable[Dict[str, Any]] = ()) -> np.ndarray:
+    """
+    Score every hour of the week from NeuroscienceAgent's analysis.
+
+    Hours take their "optimal_learning_times" success rate; day x hour
+    slots from "optimal_weekly_slots" override them where present.
+    """
+    scores = np.zeros(WEEK_HOURS, dtype=np.float64)
+    for entry in optimal_times:
+        scores[entry["hour"]::24] = entry["success_rate"]
+    for entry in optimal_weekly_slots:
+        scores[entry["day"] * 24 + entry["hour"]] = entry["success_rate"]
+    return scores
+
+class SessionPlan:
+    """
+    Learning sessions packed into a learner's weekly availability.
+
+    Every week, the learner's best-scoring free hours are taken first (ties
+    go to the earlier hour), up to weekly_hours per week and max_daily_hours
+    per day, and filled with module hours in module order. Booked hours are
+    kept as a sorted list of hour offsets from the Monday of the start week;
+    consecutive hours of one module are reported as a single session.
+    Modules are known by their "module_id" (by their position without
+    one), so modules sharing a title stay apart.
+
+    Availability and scores are hours of the learner's local week in the
+    plan's time zone, so a session stays at the same clock time across
+    daylight saving changes. Naive datetimes taken are in that zone; every
+    datetime returned carries its offset.
+    """
+
+    def __init__(self,
+                 modules: List[Dict[str, Any]],
+                 available: np.ndarray,
+                 scores: np.ndarray,
+                 start_date: datetime,
+                 weekly_hours: int = DEFAULT_WEEKLY_HOURS,
+                 max_daily_hours: int = DEFAULT_MAX_DAILY_HOURS,
+                 time_zone: str = "UTC"):
+        if not available.any():
+            raise ValueError("No available hours to schedule sessions in")
+        if weekly_hours < 1 or max_daily_hours < 1:
+            raise ValueError("weekly_hours and max_daily_hours must be at least 1")
+        self._setup(available, scores, weekly_hours, max_daily_hours, time_zone)
+        start_date = self._local(start_date).replace(minute=0, second=0, microsecond=0)
+        self.origin = (start_date - timedelta(days=start_date.weekday())).replace(hour=0)
+        self.modules = [
+            {"module_id": module.get("module_id", f"module.{index}"), "module_title": module["title"]}
+            for index, module in enumerate(modules)
+        ]
+        self._pack(modules, self._hour(start_date))
+
+    def _setup(self, available: np.ndarray, scores: np.ndarray, weekly_hours: int, max_daily_hours: int,
+               time_zone: str):
+        self.available = available
+        self.scores = scores
+        self.weekly_hours = weekly_hours
+        self.max_daily_hours = max_daily_hours
+        self.time_zone = time_zone
+        self.zone = learner_zone(time_zone)
+        # Available weekly slots, best first; computed once and reused every week
+        slots = np.flatnonzero(available)
+        self._ranked = slots[np.lexsort((slots, -scores[slots]))].tolist()
+        self._booked: List[int] = []
+        # Module (position in self.modules) booked at each hour
+        self._modules: Dict[int, int] = {}
+        self._daily = Counter()
+
+    def _local(self, moment: datetime) -> datetime:
+        """A datetime as the naive wall-clock time of the plan's zone"""
+        if moment.tzinfo is None:
+            return moment
+        return moment.astimezone(self.zone).replace(tzinfo=None)
+
+    def _hour(self, moment: datetime) -> int:
+        return int((self._local(moment) - self.origin).total_seconds() // 3600)
+
+    def _datetime(self, hour: int) -> str:
+        return (self.origin + timedelta(hours=hour)).replace(tzinfo=self.zone).isoformat()
+
+    @property
+    def start(self) -> datetime:
+        """The Monday the plan's hours count from, in the plan's zone"""
+        return self.origin.replace(tzinfo=self.zone)
+
+    def _book(self, hour: int, module: int):
+        bisect.insort(self._booked, hour)
+        self._modules[hour] = module
+        self._daily[hour // 24] += 1
+
+    def _release(self, hour: int) -> int:
+        self._booked.pop(bisect.bisect_left(self._booked, hour))
+        self._daily[hour // 24] -= 1
+        return self._modules.pop(hour)
+
+    def _free_hours(self, week: int, earliest: int) -> Iterable[int]:
+        """Free available hours of a week, best scoring first"""
+        base = week * WEEK_HOURS
+        for slot in self._ranked:
+            hour = base + slot
+            if hour >= earliest and hour not in self._modules and self._daily[hour // 24] < self.max_daily_hours:
+                yield hour
+
+    def _pack(self, modules: List[Dict[str, Any]], earliest: int):
+        queue = [
+            [index, module.get("hours", module.get("duration_weeks", 1) * self.weekly_hours)]
+            for index, module in enumerate(modules)
+        ]
+        position = 0
+        week = earliest // WEEK_HOURS
+        while position < len(queue):
+            if week > earliest // WEEK_HOURS + MAX_SEARCH_WEEKS:
+                raise ValueError(f"The modules don't fit in {MAX_SEARCH_WEEKS} weeks of sessions")
+            chosen = []
+            for hour in self._free_hours(week, earliest):
+                chosen.append(hour)
+                self._daily[hour // 24] += 1
+                if len(chosen) == self.weekly_hours:
+                    break
+            for hour in chosen:
+                self._daily[hour // 24] -= 1
+            # Fill the week's chosen hours in calendar order
+            for hour in sorted(chosen):
+                while position < len(queue) and queue[position][1] <= 0:
+                    position += 1
+                if position == len(queue):
+                    break
+                self._book(hour, queue[position][0])
+                queue[position][1] -= 1
+            while position < len(queue) and queue[position][1] <= 0:
+                position += 1
+            week += 1
+
+    def reschedule(self, missed: datetime, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Move a missed session to the best free hours from now on.
+
+        Only the missed session's hours move; every other booking stays
+        where it is. Returns the catch-up sessions.
+        """
+        hour = self._hour(missed)
+        if hour not in self._modules:
+            raise KeyError(missed.isoformat())
+        module = self._modules[hour]
+        # The whole session: the run of consecutive hours booked for this module
+        first = last = hour
+        while self._modules.get(first - 1) == module:
+            first -= 1
+        while self._modules.get(last + 1) == module:
+            last += 1
+        for session_hour in range(first, last + 1):
+            self._release(session_hour)
+
+        earliest = self._hour(now or datetime.now(timezone.utc)) + 1
+        needed = last - first + 1
+        moved = []
+        week = earliest // WEEK_HOURS
+        while len(moved) < needed:
+            if week > earliest // WEEK_HOURS + MAX_SEARCH_WEEKS:
+                raise ValueError("No free hours left to reschedule the session")
+            for free_hour in self._free_hours(week, earliest):
+                self._book(free_hour, module)
+                moved.append(free_hour)
+                if len(moved) == needed:
+                    break
+            week += 1
+        return self._sessions(sorted(moved))
+
+    def _sessions(self, hours: List[int]) -> List[Dict[str, Any]]:
+        sessions = []
+        for hour in hours:
+            module = self._modules[hour]
+            if sessions and sessions[-1]["_end"] == hour and sessions[-1]["_module"] == module:
+                sessions[-1]["_end"] += 1
+                sessions[-1]["_score"] += float(self.scores[hour % WEEK_HOURS])
+                continue
+            sessions.append({"_module": module, "_start": hour, "_end": hour + 1,
+                             "_score": float(self.scores[hour % WEEK_HOURS])})
+        return [
+            {
+                **self.modules[session["_module"]],
+                "start": self._datetime(session["_start"]),
+                "end": self._datetime(session["_end"]),
+                "hours": session["_end"] - session["_start"],
+                "expected_success_rate": round(session["_score"] / (session["_end"] - session["_start"]), 4)
+            }
+            for session in sessions
+        ]
+
+    def sessions(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get the planned sessions starting in [since, until)"""
+        first = bisect.bisect_left(self._booked, self._hour(since)) if since else 0
+        last = bisect.bisect_left(self._booked, self._hour(until)) if until else len(self._booked)
+        return self._sessions(self._booked[first:last])
+
+    def module_windows(self) -> List[Dict[str, Any]]:
+        """Get when each module's sessions begin and end, in module order"""
+        windows: Dict[int, List[int]] = {}
+        for hour in self._booked:
+            window = windows.setdefault(self._modules[hour], [hour, hour])
+            window[1] = hour + 1
+        return [
+            {
+                **module,
+                "start_date": self._datetime(windows[index][0]),
+                "end_date": self._datetime(windows[index][1])
+            }
+            for index, module in enumerate(self.modules) if index in windows
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The plan as a JSON document, bookings included"""
+        slots = np.flatnonzero(self.scores)
+        return {
+            "modules": self.modules,
+            "available": np.flatnonzero(self.available).tolist(),
+            "scores": dict(zip(slots.tolist(), self.scores[slots].tolist())),
+            "origin": self.origin.isoformat(),
+            "time_zone": self.time_zone,
+            "weekly_hours": self.weekly_hours,
+            "max_daily_hours": self.max_daily_hours,
+            "booked": [[hour, self._modules[hour]] for hour in self._booked]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SessionPlan":
+        """Rebuild a plan from to_dict, with its bookings as they were"""
+        available = np.zeros(WEEK_HOURS, dtype=bool)
+        available[data["available"]] = True
+        scores = np.zeros(WEEK_HOURS, dtype=np.float64)
+        for slot, score in data["scores"].items():
+            scores[int(slot)] = score
+        plan = cls.__new__(cls)
+        plan._setup(available, scores, data["weekly_hours"], data["max_daily_hours"], data["time_zone"])
+        plan.origin = datetime.fromisoformat(data["origin"])
+        plan.modules = data["modules"]
+        for hour, module in data["booked"]:
+            plan._book(hour, module)
+        return plan
+
+class SessionScheduler:
+    """
+    Session plans of every learner, kept in the profile store (one
+    user_state document each) so missed sessions can be re-planned in
+    place by any worker.
+    """
+
+    def __init__(self, store: Optional[ProfileStore] = None):
+        self.store = store or get_profile_store()
+
+    async def plan(self,
+                   user_id: str,
+                   modules: List[Dict[str, Any]],
+                   availability: Iterable[Dict[str, int]],
+                   optimal_times: Iterable[Dict[str, Any]] = (),
+                   optimal_weekly_slots: Iterable[Dict[str, Any]] = (),
+                   start_date: Optional[datetime] = None,
+                   weekly_hours: int = DEFAULT_WEEKLY_HOURS,
+                   max_daily_hours: int = DEFAULT_MAX_DAILY_HOURS,
+                   time_zone: str = "UTC") -> SessionPlan:
+        """Build and store a new plan for a learner, replacing the previous one"""
+        plan = SessionPlan(
+            modules,
+            availability_mask(availability),
+            slot_scores(optimal_times, optimal_weekly_slots),
+            start_date or datetime.now(timezone.utc),
+            weekly_hours,
+            max_daily_hours,
+            time_zone
+        )
+        data = plan.to_dict()
+        if not await self.store.update_user_state(user_id, SESSION_PLAN_KIND, data):
+            if not await self.store.create_user_state(user_id, SESSION_PLAN_KIND, data):
+                # Created by another request in between; the latest plan wins
+                await self.store.update_user_state(user_id, SESSION_PLAN_KIND, data)
+        return plan
+
+    async def get_plan(self, user_id: str) -> SessionPlan:
+        row = await self.store.get_user_state(user_id, SESSION_PLAN_KIND)
+        if row is None:
+            raise NoSessionPlanError(user_id)
+        return SessionPlan.from_dict(row["data"])
+
+    async def reschedule(self, user_id: str, missed: datetime, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Move a missed session (see SessionPlan.reschedule) and store the plan"""
+        for _ in range(PATCH_ATTEMPTS):
+            row = await self.store.get_user_state(user_id, SESSION_PLAN_KIND)
+            if row is None:
+                raise NoSessionPlanError(user_id)
+            plan = SessionPlan.from_dict(row["data"])
+            rescheduled = plan.reschedule(missed, now)
+            if await self.store.update_user_state(user_id, SESSION_PLAN_KIND, plan.to_dict(), row["updated_at"]):
+                return rescheduled
+        raise ConcurrentUpdateError(f"Session plan of {user_id} changed during the update")
+
+_session_scheduler: Optional[SessionScheduler] = None
+
+def get_session_scheduler() -> SessionScheduler:
+    """Get the session plans shared by this process"""
+    global _session_scheduler
+    if _session_scheduler is None:
+        _session_scheduler = SessionScheduler()
+    return _session_scheduler
@@ -0,0 +1,155 @@
+from typing import Any, Dict, List, Optional
+import numpy as np
+from src.models.scores import SCORE_KEYS, ScoreVector
+from src.services.profile_service import get_profile_service
+from src.storage.base import ProfileStore
+
+# Rows scored per matrix product; keeps the float32 temporaries small
+CHUNK_SIZE = 65536
+
+class SimilarityService:
+    """
+    "Learners like you" index over profile score vectors.
+
+    Vectors live in one contiguous uint8 matrix: scores are integers in
+    0-100, so the quantization is lossless and a million profiles take
+    13 MB. Queries are exact flat scans done in float32 chunks, which answer
+    top-k in milliseconds without the build cost of a tree index. Rows are
+    updated in place on score writes and freed slots are reused.
+    """
+
+    METRICS = ("cosine", "euclidean")
+
+    def __init__(self, capacity: int = 1024):
+        self._vectors = np.zeros((capacity, len(SCORE_KEYS)), dtype=np.uint8)
+        self._sq_norms = np.zeros(capacity, dtype=np.float32)
+        self._active = np.zeros(capacity, dtype=bool)
+        self._ids: List[Optional[str]] = [None] * capacity
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._size = 0
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _grow(self):
+        capacity = len(self._ids) * 2
+        vectors = np.zeros((capacity, len(SCORE_KEYS)), dtype=np.uint8)
+        vectors[:self._size] = self._vectors[:self._size]
+        sq_norms = np.zeros(capacity, dtype=np.float32)
+        sq_norms[:self._size] = self._sq_norms[:self._size]
+        active = np.zeros(capacity, dtype=bool)
+        active[:self._size] = self._active[:self._size]
+        self._vectors, self._sq_norms, self._active = vectors, sq_norms, active
+        self._ids.extend([None] * (capacity - len(self._ids)))
+
+    def upsert(self, profile_id: str, braved_scores: Dict[str, int], balajis_scores: Dict[str, int]):
+        """Insert or update the vector of a profile"""
+        slot = self._slots.get(profile_id)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                if self._size == len(self._ids):
+                    self._grow()
+                slot = self._size
+                self._size += 1
+            self._slots[profile_id] = slot
+            self._ids[slot] = profile_id
+            self._active[slot] = True
+
+        vector = ScoreVector.from_dicts(braved_scores, balajis_scores).as_array()
+        self._vectors[slot] = vector
+        self._sq_norms[slot] = float(vector @ vector.astype(np.float32))
+
+    def remove(self, profile_id: str):
+        """Drop a profile from the index"""
+        slot = self._slots.pop(profile_id, None)
+        if slot is not None:
+            self._active[slot] = False
+            self._ids[slot] = None
+            self._free.append(slot)
+
+    def on_profile_write(self, profile_id: str, row: Optional[Dict[str, Any]]):
+        """ProfileService score listener"""
+        if row is None:
+            self.remove(profile_id)
+        else:
+            self.upsert(profile_id, row.get("braved_scores"), row.get("balajis_scores"))
+
+    async def load(self, store: ProfileStore, page_size: int = 5000):
+        """Bulk build the index from every stored profile"""
+        offset = 0
+        while True:
+            rows = await store.list_profiles(limit=page_size, offset=offset)
+            for row in rows:
+                self.upsert(row["id"], row.get("braved_scores"), row.get("balajis_scores"))
+            if len(rows) < page_size:
+                break
+            offset += page_size
+        self.loaded = True
+
+    def similar(self, profile_id: str, k: int = 10, metric: str = "cosine") -> List[Dict[str, Any]]:
+        """
+        Find the k profiles closest to the given one.
+
+        Results are ordered best first with a "score" that is the cosine
+        similarity or the euclidean distance, depending on the metric.
+        """
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        slot = self._slots.get(profile_id)
+        if slot is None:
+            raise KeyError(profile_id)
+
+        query = self._vectors[slot].astype(np.float32)
+        query_sq_norm = self._sq_norms[slot]
+        best_scores = np.empty(0, dtype=np.float32)
+        best_slots = np.empty(0, dtype=np.int64)
+
+        for start in range(0, self._size, CHUNK_SIZE):
+            stop = min(start + CHUNK_SIZE, self._size)
+            dots = self._vectors[start:stop].astype(np.float32) @ query
+            if metric == "cosine":
+                norms = np.sqrt(self._sq_norms[start:stop] * query_sq_norm)
+                # Higher is better; negate so both metrics are minimized
+                scores = -np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+            else:
+                scores = np.maximum(self._sq_norms[start:stop] - 2 * dots + query_sq_norm, 0)
+            excluded = ~self._active[start:stop]
+            if start <= slot < stop:
+                excluded[slot - start] = True
+            scores[excluded] = np.inf
+
+            if len(scores) > k:
+                candidates = np.argpartition(scores, k)[:k]
+            else:
+                candidates = np.arange(len(scores))
+            best_scores = np.concatenate([best_scores, scores[candidates]])
+            best_slots = np.concatenate([best_slots, candidates + start])
+            if len(best_scores) > k:
+                keep = np.argpartition(best_scores, k)[:k]
+                best_scores, best_slots = best_scores[keep], best_slots[keep]
+
+        order = np.argsort(best_scores, kind="stable")
+        results = []
+        for index in order:
+            if not np.isfinite(best_scores[index]):
+                continue
+            score = float(best_scores[index])
+            results.append({
+                "profile_id": self._ids[best_slots[index]],
+                "score": -score if metric == "cosine" else float(np.sqrt(score))
+            })
+        return results
+
+_similarity_service: Optional[SimilarityService] = None
+
+def get_similarity_service() -> SimilarityService:
+    """Get the process-wide index, kept current by the shared ProfileService"""
+    global _similarity_service
+    if _similarity_service is None:
+        _similarity_service = SimilarityService()
+        get_profile_service().add_score_listener(_similarity_service.on_profile_write)
+    return _similarity_service
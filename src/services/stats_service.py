@@ -0,0 +1,163 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+import numpy as np
+from src.models.scores import MAX_SCORE, SCORE_KEYS, ScoreVector
+from src.services.profile_service import get_profile_service
+from src.storage.base import ProfileStore
+
+REPORTED_QUANTILES = (10, 25, 50, 75, 90)
+
+class StatsService:
+    """
+    Cohort score distributions for every BRAVED/BALAJIS component.
+
+    Because scores are small integers, a 101-bin histogram per component is
+    an exact distribution sketch: percentiles and quantiles read from it are
+    exact, cost O(1) and need no t-digest. Histograms, sums and each
+    profile's last vector are updated incrementally on every score write.
+    """
+
+    def __init__(self):
+        self._histograms = np.zeros((len(SCORE_KEYS), MAX_SCORE + 1), dtype=np.int64)
+        self._sums = np.zeros(len(SCORE_KEYS), dtype=np.int64)
+        self._cumulative: Optional[np.ndarray] = None
+        # Last counted vector per profile, as uint8 bytes (13 bytes each)
+        self._vectors: Dict[str, bytes] = {}
+        # Score writes seen while load() scans the store, replayed after it
+        self._pending: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+        self._load_lock = asyncio.Lock()
+        self.loaded = False
+
+    @property
+    def count(self) -> int:
+        return len(self._vectors)
+
+    def _apply(self, vector: np.ndarray, sign: int):
+        self._histograms[np.arange(len(SCORE_KEYS)), vector] += sign
+        self._sums += sign * vector.astype(np.int64)
+        self._cumulative = None
+
+    def upsert(self, profile_id: str, braved_scores: Dict[str, int], balajis_scores: Dict[str, int]):
+        """Count a profile's current scores, replacing its previous ones"""
+        previous = self._vectors.get(profile_id)
+        if previous is not None:
+            self._apply(np.frombuffer(previous, dtype=np.uint8), -1)
+        vector = ScoreVector.from_dicts(braved_scores, balajis_scores)
+        self._apply(vector.as_array(), 1)
+        self._vectors[profile_id] = vector.tobytes()
+
+    def remove(self, profile_id: str):
+        """Stop counting a profile"""
+        previous = self._vectors.pop(profile_id, None)
+        if previous is not None:
+            self._apply(np.frombuffer(previous, dtype=np.uint8), -1)
+
+    def on_profile_write(self, profile_id: str, row: Optional[Dict[str, Any]]):
+        """ProfileService score listener"""
+        if self._pending is not None:
+            # Counted now, the write would be overwritten by the rebuild
+            self._pending[profile_id] = row
+            return
+        if row is None:
+            self.remove(profile_id)
+        else:
+            self.upsert(profile_id, row.get("braved_scores"), row.get("balajis_scores"))
+
+    def rebuild(self, rows: List[Dict[str, Any]]):
+        """Recompute every aggregate from a full set of profile rows"""
+        vectors = np.frombuffer(
+            b"".join(ScoreVector.from_row(row).tobytes() for row in rows), dtype=np.uint8
+        ).reshape(-1, len(SCORE_KEYS))
+        self._histograms = np.stack([
+            np.bincount(vectors[:, index], minlength=MAX_SCORE + 1) for index in range(len(SCORE_KEYS))
+        ]).astype(np.int64)
+        self._sums = vectors.sum(axis=0, dtype=np.int64)
+        self._vectors = {row["id"]: vector.tobytes() for row, vector in zip(rows, vectors)}
+        self._cumulative = None
+
+    async def load(self, store: ProfileStore, page_size: int = 5000):
+        """
+        Rebuild the aggregates from every stored profile.
+
+        Score writes made while the pages are read are held back and applied
+        on top of the rebuilt aggregates, the last write of a profile winning.
+        """
+        async with self._load_lock:
+            rows = []
+            offset = 0
+            self._pending = {}
+            try:
+                while True:
+                    page = await store.list_profiles(limit=page_size, offset=offset)
+                    rows.extend(
+                        {"id": row["id"], "braved_scores": row.get("braved_scores"),
+                         "balajis_scores": row.get("balajis_scores")}
+                        for row in page
+                    )
+                    if len(page) < page_size:
+                        break
+                    offset += page_size
+                self.rebuild(rows)
+                self.loaded = True
+            finally:
+                pending, self._pending = self._pending, None
+                for profile_id, row in pending.items():
+                    self.on_profile_write(profile_id, row)
+
+    def _cumulative_counts(self) -> np.ndarray:
+        # Recomputed lazily after writes; 13 x 101 additions
+        if self._cumulative is None:
+            self._cumulative = np.cumsum(self._histograms, axis=1)
+        return self._cumulative
+
+    def percentiles(self, profile_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get where each of a profile's scores ranks in the cohort.
+
+        The percentile is the share of profiles scoring below, counting ties
+        as half; "top_percent" is the share scoring the same or higher.
+        """
+        vector = self._vectors.get(profile_id)
+        if vector is None:
+            raise KeyError(profile_id)
+
+        total = self.count
+        cumulative = self._cumulative_counts()
+        result = {}
+        for index, score in enumerate(np.frombuffer(vector, dtype=np.uint8)):
+            below = cumulative[index, score - 1] if score > 0 else 0
+            equal = self._histograms[index, score]
+            result[SCORE_KEYS[index]] = {
+                "score": int(score),
+                "percentile": round(100.0 * (below + equal / 2) / total, 2),
+                "top_percent": round(100.0 * (total - below) / total, 2)
+            }
+        return result
+
+    def distributions(self) -> Dict[str, Dict[str, Any]]:
+        """Get the histogram, mean and quantiles of every component"""
+        total = self.count
+        cumulative = self._cumulative_counts()
+        result = {}
+        for index, key in enumerate(SCORE_KEYS):
+            quantiles = {}
+            for quantile in REPORTED_QUANTILES:
+                rank = max(int(np.ceil(total * quantile / 100)), 1)
+                quantiles[f"p{quantile}"] = int(np.searchsorted(cumulative[index], rank)) if total else None
+            result[key] = {
+                "count": total,
+                "mean": float(self._sums[index] / total) if total else None,
+                "quantiles": quantiles,
+                "histogram": self._histograms[index].tolist()
+            }
+        return result
+
+_stats_service: Optional[StatsService] = None
+
+def get_stats_service() -> StatsService:
+    """Get the process-wide aggregates, kept current by the shared ProfileService"""
+    global _stats_service
+    if _stats_service is None:
+        _stats_service = StatsService()
+        get_profile_service().add_score_listener(_stats_service.on_profile_write)
+    return _stats_service
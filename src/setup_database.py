@@ -45,11 +45,80 @@ def setup_database():
             learning_path JSONB DEFAULT '{
                 "steps": []
             }',
-            created_at TIMESTAMPTZ DEFAULT NOW()
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            -- Row version, bumped by the trigger below on every update
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp(),
+            -- Learning pattern analysis stored by POST /neuroscience
+            neuroscience_insights JSONB
         );
 
-        -- Enable Row Level Security
+        -- Tables created before these columns existed (see supabase/migrations)
+        ALTER TABLE profiles
+            ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp(),
+            ADD COLUMN IF NOT EXISTS neuroscience_insights JSONB;
+
+        -- clock_timestamp() rather than now(): two updates in one transaction
+        -- must still produce different versions.
+        CREATE OR REPLACE FUNCTION set_profiles_updated_at()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.updated_at = clock_timestamp();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DROP TRIGGER IF EXISTS profiles_set_updated_at ON profiles;
+        CREATE TRIGGER profiles_set_updated_at
+            BEFORE UPDATE ON profiles
+            FOR EACH ROW EXECUTE FUNCTION set_profiles_updated_at();
+
+        -- Indexes for interest, recency and per-score queries
+        CREATE INDEX IF NOT EXISTS profiles_interests_idx ON profiles USING GIN (interests);
+        CREATE INDEX IF NOT EXISTS profiles_created_at_idx ON profiles (created_at);
+        CREATE INDEX IF NOT EXISTS profiles_braved_bitcoin_idx ON profiles ((braved_scores -> 'bitcoin'));
+        CREATE INDEX IF NOT EXISTS profiles_braved_real_world_idx ON profiles ((braved_scores -> 'real_world'));
+        CREATE INDEX IF NOT EXISTS profiles_braved_ai_idx ON profiles ((braved_scores -> 'ai'));
+        CREATE INDEX IF NOT EXISTS profiles_braved_vrar_idx ON profiles ((braved_scores -> 'vrar'));
+        CREATE INDEX IF NOT EXISTS profiles_braved_emotional_idx ON profiles ((braved_scores -> 'emotional'));
+        CREATE INDEX IF NOT EXISTS profiles_braved_decentralization_idx ON profiles ((braved_scores -> 'decentralization'));
+        CREATE INDEX IF NOT EXISTS profiles_balajis_build_idx ON profiles ((balajis_scores -> 'build'));
+        CREATE INDEX IF NOT EXISTS profiles_balajis_attention_idx ON profiles ((balajis_scores -> 'attention'));
+        CREATE INDEX IF NOT EXISTS profiles_balajis_leverage_idx ON profiles ((balajis_scores -> 'leverage'));
+        CREATE INDEX IF NOT EXISTS profiles_balajis_algorithms_idx ON profiles ((balajis_scores -> 'algorithms'));
+        CREATE INDEX IF NOT EXISTS profiles_balajis_joy_idx ON profiles ((balajis_scores -> 'joy'));
+        CREATE INDEX IF NOT EXISTS profiles_balajis_influence_idx ON profiles ((balajis_scores -> 'influence'));
+        CREATE INDEX IF NOT EXISTS profiles_balajis_skills_idx ON profiles ((balajis_scores -> 'skills'));
+
+        -- State shared by the API's worker processes: an event log each
+        -- worker polls, and one versioned JSON document per user and kind
+        CREATE TABLE IF NOT EXISTS events (
+            id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+            origin TEXT NOT NULL,
+            channel TEXT NOT NULL,
+            key TEXT NOT NULL,
+            data JSONB,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        CREATE INDEX IF NOT EXISTS events_created_at_idx ON events (created_at);
+
+        CREATE TABLE IF NOT EXISTS user_state (
+            user_id TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            data JSONB NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp(),
+            PRIMARY KEY (user_id, kind)
+        );
+
+        DROP TRIGGER IF EXISTS user_state_set_updated_at ON user_state;
+        CREATE TRIGGER user_state_set_updated_at
+            BEFORE UPDATE ON user_state
+            FOR EACH ROW EXECUTE FUNCTION set_profiles_updated_at();
+
+        -- Enable Row Level Security (events and user_state are only used
+        -- with the service key, so they get no policies)
         ALTER TABLE profiles ENABLE ROW LEVEL SECURITY;
+        ALTER TABLE events ENABLE ROW LEVEL SECURITY;
+        ALTER TABLE user_state ENABLE ROW LEVEL SECURITY;
 
         -- Create policy to allow public read access
         CREATE POLICY IF NOT EXISTS "Allow public read access"
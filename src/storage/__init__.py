@@ -0,0 +1,22 @@
+"""
+Storage backends for the BRAVED/BALAJIS Framework
+"""
+from typing import Optional
+from src.config.settings import STORAGE_BACKEND, SQLITE_PATH
+from src.storage.base import ProfileStore
+
+_profile_store: Optional[ProfileStore] = None
+
+def get_profile_store() -> ProfileStore:
+    """Get the profile store selected by STORAGE_BACKEND, shared per process"""
+    global _profile_store
+    if _profile_store is None:
+        if STORAGE_BACKEND == "sqlite":
+            from src.storage.sqlite_store import SQLiteProfileStore
+            _profile_store = SQLiteProfileStore(SQLITE_PATH)
+        elif STORAGE_BACKEND == "supabase":
+            from src.storage.supabase_store import SupabaseProfileStore
+            _profile_store = SupabaseProfileStore()
+        else:
+            raise ValueError(f"Unknown storage backend: {STORAGE_BACKEND}")
+    return _profile_store
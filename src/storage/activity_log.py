@@ -0,0 +1,326 @@
+"""
+Append-only columnar activity log, one directory per user.
+
+Every append writes an immutable segment: a directory holding one .npy
+file per column, sorted by timestamp, plus a meta.json with the row count,
+time bounds and the segment's string dictionaries (activity types and
+topics are stored as int32 codes). Scans memory-map only the columns they
+need, skip segments outside the time range and binary-search the rest.
+Compaction merges a user's segments into one.
+
+A merged segment lists the segments it replaces in its meta.json, and
+listings leave those out, so the rename that makes it visible also hides
+them: a crash before they are deleted can't duplicate their events, and
+the next compaction deletes them.
+
+Several processes may share a log: scans hold a shared flock on the user's
+.lock file and compaction an exclusive one, so a scan never sees a segment
+deleted under it. All of this is blocking file I/O; async callers run it
+in a thread.
+"""
+import json
+import os
+import re
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Union
+import numpy as np
+from src.config.settings import ACTIVITY_LOG_PATH
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single process is assumed
+    fcntl = None
+
+# Timestamps are UTC microseconds since the epoch; utc_offset is the
+# event's offset from UTC in seconds (0 for naive timestamps), so local
+# wall-clock hours can be recovered
+COLUMNS = {
+    "timestamp": np.int64,
+    "utc_offset": np.int32,
+    "type": np.int32,
+    "topic": np.int32,
+    "engagement_score": np.float64,
+    "success_rate": np.float64,
+    "total_questions": np.int64,
+    "correct_answers": np.int64
+}
+CODED_COLUMNS = {"type": "types", "topic": "topics"}
+USER_ID_PATTERN = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]*")
+# Segment metadata kept in memory, least recently used first out
+META_CACHE_SIZE = 4096
+
+Timestamp = Union[datetime, str, int, float]
+
+class ActivityScan(NamedTuple):
+    """Scanned columns; "type" and "topic" hold codes into types and topics (-1 when absent)"""
+    columns: Dict[str, np.ndarray]
+    types: List[str]
+    topics: List[str]
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+def to_micros(timestamp: Timestamp) -> int:
+    """Convert a datetime, ISO string or epoch seconds to UTC microseconds"""
+    if isinstance(timestamp, (int, float)):
+        return int(round(timestamp * 1_000_000))
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    delta = timestamp - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+def utc_offset(timestamp: Timestamp) -> int:
+    """The offset from UTC, in seconds, of a datetime or ISO string (0 when naive or epoch seconds)"""
+    if isinstance(timestamp, (int, float)):
+        return 0
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    offset = timestamp.utcoffset()
+    return int(offset.total_seconds()) if offset is not None else 0
+
+class ActivityLog:
+    def __init__(self, root: str = ACTIVITY_LOG_PATH, max_segments: int = 32):
+        self.root = root
+        # Appends compact a user's log once it has more segments than this
+        self.max_segments = max_segments
+        self._meta: Dict[str, Dict[str, Any]] = OrderedDict()
+        # Routes call the log from threadpool threads
+        self._meta_lock = threading.Lock()
+
+    def _user_dir(self, user_id: str) -> str:
+        if not USER_ID_PATTERN.fullmatch(user_id):
+            raise ValueError(f"Invalid user id: {user_id!r}")
+        return os.path.join(self.root, user_id)
+
+    def _segments(self, user_id: str, replaced: bool = False) -> List[str]:
+        """List a user's segments in time order, leaving out (or only listing) those a merged segment replaces"""
+        directory = self._user_dir(user_id)
+        if not os.path.isdir(directory):
+            return []
+        paths = [
+            os.path.join(directory, name)
+            for name in sorted(os.listdir(directory))
+            if name.startswith("seg-")
+        ]
+        metas = {}
+        for path in paths:
+            try:
+                metas[path] = self._segment_meta(path)
+            except FileNotFoundError:
+                # Removed by a compaction in another process since the listing
+                continue
+        hidden = {os.path.join(directory, name) for meta in metas.values() for name in meta.get("replaces", ())}
+        return [path for path in metas if (path in hidden) == replaced]
+
+    def _remove_segment(self, path: str):
+        # Renamed first, so a crash mid-delete never leaves a half-deleted segment listed
+        trash = os.path.join(os.path.dirname(path), f".trash-{uuid.uuid4().hex}")
+        os.rename(path, trash)
+        with self._meta_lock:
+            self._meta.pop(path, None)
+        shutil.rmtree(trash)
+
+    @contextmanager
+    def _locked(self, user_id: str, exclusive: bool, blocking: bool = True):
+        """Hold the user's log lock; yields False when not blocking and another process holds it"""
+        directory = self._user_dir(user_id)
+        if fcntl is None or not os.path.isdir(directory):
+            yield True
+            return
+        with open(os.path.join(directory, ".lock"), "a") as lock_file:
+            operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+            try:
+                fcntl.flock(lock_file, operation if blocking else operation | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _segment_meta(self, path: str) -> Dict[str, Any]:
+        with self._meta_lock:
+            meta = self._meta.get(path)
+            if meta is not None:
+                self._meta.move_to_end(path)
+                return meta
+        with open(os.path.join(path, "meta.json")) as meta_file:
+            meta = json.load(meta_file)
+        with self._meta_lock:
+            self._meta[path] = meta
+            if len(self._meta) > META_CACHE_SIZE:
+                self._meta.popitem(last=False)
+        return meta
+
+    def _write_segment(self, user_id: str, columns: Dict[str, np.ndarray], types: List[str], topics: List[str],
+                       replaces: Sequence[str] = ()) -> str:
+        """Write sorted columns as a new segment, made visible (and the segments it replaces hidden) by a single rename"""
+        directory = self._user_dir(user_id)
+        os.makedirs(directory, exist_ok=True)
+        temporary = os.path.join(directory, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(temporary)
+        for name, values in columns.items():
+            np.save(os.path.join(temporary, f"{name}.npy"), values)
+        timestamps = columns["timestamp"]
+        with open(os.path.join(temporary, "meta.json"), "w") as meta_file:
+            json.dump({
+                "count": len(timestamps),
+                "min_timestamp": int(timestamps[0]),
+                "max_timestamp": int(timestamps[-1]),
+                "types": types,
+                "topics": topics,
+                "replaces": [os.path.basename(path) for path in replaces]
+            }, meta_file)
+        # Names sort by first timestamp, so listings come out in time order
+        path = os.path.join(directory, f"seg-{int(timestamps[0]):020d}-{uuid.uuid4().hex[:8]}")
+        os.rename(temporary, path)
+        return path
+
+    def append(self, user_id: str, events: Iterable[Dict[str, Any]]) -> int:
+        """
+        Append events to a user's log as one new segment.
+
+        Events are dicts with "timestamp" and optionally "type",
+        "engagement_score", "success_rate" and, for quizzes, "topic",
+        "total_questions" and "correct_answers".
+        """
+        columns: Dict[str, List[Any]] = {name: [] for name in COLUMNS}
+        dictionaries: Dict[str, Dict[str, int]] = {"types": {}, "topics": {}}
+        for event in events:
+            columns["timestamp"].append(to_micros(event["timestamp"]))
+            columns["utc_offset"].append(utc_offset(event["timestamp"]))
+            for column, dictionary_name in CODED_COLUMNS.items():
+                value = event.get(column)
+                dictionary = dictionaries[dictionary_name]
+                columns[column].append(-1 if value is None else dictionary.setdefault(value, len(dictionary)))
+            for column in ("engagement_score", "success_rate", "total_questions", "correct_answers"):
+                columns[column].append(event.get(column) or 0)
+        if not columns["timestamp"]:
+            return 0
+
+        arrays = {name: np.array(values, dtype=COLUMNS[name]) for name, values in columns.items()}
+        order = np.argsort(arrays["timestamp"], kind="stable")
+        self._write_segment(
+            user_id,
+            {name: values[order] for name, values in arrays.items()},
+            list(dictionaries["types"]),
+            list(dictionaries["topics"])
+        )
+        if len(self._segments(user_id)) > self.max_segments:
+            # Left to the next append while another process reads or compacts
+            self.compact(user_id, blocking=False)
+        return len(order)
+
+    def scan(self,
+             user_id: str,
+             start: Optional[Timestamp] = None,
+             end: Optional[Timestamp] = None,
+             columns: Optional[Sequence[str]] = None) -> ActivityScan:
+        """
+        Read a user's events with start <= timestamp < end, in time order.
+
+        Only the requested columns are read; segments outside the range are
+        skipped from their metadata alone.
+        """
+        names = list(columns or COLUMNS)
+        unknown = set(names) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown activity columns: {', '.join(sorted(unknown))}")
+        if "timestamp" not in names:
+            names.insert(0, "timestamp")
+        low = to_micros(start) if start is not None else None
+        high = to_micros(end) if end is not None else None
+        with self._locked(user_id, exclusive=False):
+            return self._scan(self._segments(user_id), names, low, high)
+
+    def _scan(self, segments: List[str], names: List[str], low: Optional[int], high: Optional[int]) -> ActivityScan:
+        parts: Dict[str, List[np.ndarray]] = {name: [] for name in names}
+        vocabularies: Dict[str, Dict[str, int]] = {"types": {}, "topics": {}}
+        for path in segments:
+            meta = self._segment_meta(path)
+            if (low is not None and meta["max_timestamp"] < low) or (high is not None and meta["min_timestamp"] >= high):
+                continue
+            timestamps = np.load(os.path.join(path, "timestamp.npy"), mmap_mode="r")
+            first = int(np.searchsorted(timestamps, low, side="left")) if low is not None else 0
+            last = int(np.searchsorted(timestamps, high, side="left")) if high is not None else len(timestamps)
+            if first >= last:
+                continue
+            for name in names:
+                column_path = os.path.join(path, f"{name}.npy")
+                if not os.path.exists(column_path):
+                    # Segments written before the column existed
+                    parts[name].append(np.zeros(last - first, dtype=COLUMNS[name]))
+                    continue
+                values = np.load(column_path, mmap_mode="r")[first:last]
+                dictionary_name = CODED_COLUMNS.get(name)
+                if dictionary_name:
+                    # Map segment-local codes to codes of this scan; -1 stays -1
+                    vocabulary = vocabularies[dictionary_name]
+                    remap = np.array(
+                        [vocabulary.setdefault(value, len(vocabulary)) for value in meta[dictionary_name]] + [-1],
+                        dtype=np.int32
+                    )
+                    values = remap[values]
+                parts[name].append(values)
+
+        if not parts["timestamp"]:
+            result = {name: np.empty(0, dtype=COLUMNS[name]) for name in names}
+        else:
+            result = {name: np.concatenate(values) for name, values in parts.items()}
+            if len(parts["timestamp"]) > 1:
+                order = np.argsort(result["timestamp"], kind="stable")
+                result = {name: values[order] for name, values in result.items()}
+        return ActivityScan(result, list(vocabularies["types"]), list(vocabularies["topics"]))
+
+    def compact(self, user_id: str, blocking: bool = True) -> int:
+        """
+        Merge all of a user's segments into one; returns how many were merged.
+
+        Without blocking, nothing is merged while another process holds the
+        user's lock.
+        """
+        with self._locked(user_id, exclusive=True, blocking=blocking) as locked:
+            if not locked:
+                return 0
+            # Left behind by a compaction that stopped before deleting them
+            for path in self._segments(user_id, replaced=True):
+                self._remove_segment(path)
+            directory = self._user_dir(user_id)
+            for name in os.listdir(directory) if os.path.isdir(directory) else ():
+                if name.startswith(".trash-"):
+                    shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+            # Listed under the lock, so segments another process merged are gone
+            segments = self._segments(user_id)
+            if len(segments) < 2:
+                return 0
+            # Appends made meanwhile add segments that are neither merged nor removed
+            scan = self._scan(segments, list(COLUMNS), None, None)
+            self._write_segment(user_id, scan.columns, scan.types, scan.topics, replaces=segments)
+            for path in segments:
+                self._remove_segment(path)
+        return len(segments)
+
+    def delete(self, user_id: str):
+        """Remove a user's whole log"""
+        with self._locked(user_id, exclusive=True):
+            for path in self._segments(user_id) + self._segments(user_id, replaced=True):
+                with self._meta_lock:
+                    self._meta.pop(path, None)
+            shutil.rmtree(self._user_dir(user_id), ignore_errors=True)
+
+_activity_log: Optional[ActivityLog] = None
+
+def get_activity_log() -> ActivityLog:
+    """Get the activity log shared by this process"""
+    global _activity_log
+    if _activity_log is None:
+        _activity_log = ActivityLog()
+    return _activity_log
@@ -0,0 +1,155 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+from src.config.settings import SCORE_COLUMNS
+
+# Columns of the profiles table, in schema order
+PROFILE_COLUMNS = (
+    "id",
+    "username",
+    "interests",
+    "braved_scores",
+    "balajis_scores",
+    "learning_path",
+    "created_at",
+    "updated_at",
+    "neuroscience_insights"
+)
+
+# Columns of the events table, through which worker processes share changes
+EVENT_COLUMNS = ("id", "origin", "channel", "key", "data", "created_at")
+# Columns of the user_state table: one JSON document per user and kind
+USER_STATE_COLUMNS = ("user_id", "kind", "data", "updated_at")
+
+def score_column(component: str) -> str:
+    """Get the profile column holding a framework component's score"""
+    if component not in SCORE_COLUMNS:
+        raise ValueError(f"Unknown score component: {component}")
+    return SCORE_COLUMNS[component]
+
+class ProfileStore(ABC):
+    """
+    Storage backend for profile rows.
+
+    Rows are plain dicts shaped like the Supabase profiles table; building
+    models and diffing updates is left to ProfileService. The store also
+    holds what worker processes must share besides profiles: an append-only
+    event log (see src.services.event_feed) and per-user state documents.
+    """
+
+    @abstractmethod
+    async def create_profile(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a profile and return the stored row"""
+        pass
+
+    @abstractmethod
+    async def get_profile(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """Get a profile row by ID"""
+        pass
+
+    async def get_profile_version(self, profile_id: str) -> Optional[str]:
+        """Get a profile's updated_at without its other columns"""
+        row = await self.get_profile(profile_id)
+        return row.get("updated_at") if row else None
+
+    @abstractmethod
+    async def list_profiles(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """List profile rows, oldest first"""
+        pass
+
+    async def list_profile_versions(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """List the id and updated_at of profiles, oldest first"""
+        rows = await self.list_profiles(limit, offset)
+        return [{"id": row["id"], "updated_at": row.get("updated_at")} for row in rows]
+
+    @abstractmethod
+    async def update_profile(self, profile_id: str, data: Dict[str, Any],
+                             expected_version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Update the given columns of a profile and return the stored row.
+
+        With expected_version, the row is only updated while its updated_at
+        still equals it; otherwise (or when there is no such profile) None
+        is returned.
+        """
+        pass
+
+    @abstractmethod
+    async def delete_profile(self, profile_id: str) -> bool:
+        """Delete a profile"""
+        pass
+
+    @abstractmethod
+    async def bulk_create(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert many profiles at once"""
+        pass
+
+    @abstractmethod
+    async def bulk_update(self, updates: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Update many profiles, given a mapping of ID to changed columns"""
+        pass
+
+    @abstractmethod
+    async def bulk_delete(self, profile_ids: List[str]) -> int:
+        """Delete many profiles and return how many were removed"""
+        pass
+
+    @abstractmethod
+    async def search_profiles(self,
+                              min_scores: Optional[Dict[str, int]] = None,
+                              interests: Optional[List[str]] = None,
+                              created_after: Optional[str] = None,
+                              limit: int = 100) -> List[Dict[str, Any]]:
+        """Find profiles by score thresholds, any-of interests and creation time"""
+        pass
+
+    @abstractmethod
+    async def top_profiles(self, component: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get the highest scoring profiles for a framework component"""
+        pass
+
+    @abstractmethod
+    async def append_events(self, events: List[Dict[str, Any]]) -> None:
+        """Append events (origin, channel, key and data) to the event log; ids are assigned in order"""
+        pass
+
+    @abstractmethod
+    async def read_events(self, after_id: int, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Get the events with an id above after_id, oldest first"""
+        pass
+
+    @abstractmethod
+    async def latest_event_id(self) -> int:
+        """Get the id of the newest event, 0 when the log is empty"""
+        pass
+
+    @abstractmethod
+    async def prune_events(self, before: str) -> int:
+        """Delete the events created before an ISO timestamp and return how many were removed"""
+        pass
+
+    @abstractmethod
+    async def get_user_state(self, user_id: str, kind: str) -> Optional[Dict[str, Any]]:
+        """Get a user's state document of the given kind"""
+        pass
+
+    @abstractmethod
+    async def list_user_states(self, kind: str) -> List[Dict[str, Any]]:
+        """Get every user's state document of the given kind"""
+        pass
+
+    @abstractmethod
+    async def create_user_state(self, user_id: str, kind: str, data: Any) -> Optional[Dict[str, Any]]:
+        """Store a new state document and return its row, or None when the user already has one"""
+        pass
+
+    @abstractmethod
+    async def update_user_state(self, user_id: str, kind: str, data: Any,
+                                expected_version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Replace a state document and return the stored row.
+
+        updated_at is the document's version; with expected_version, the
+        document is only replaced while its updated_at still equals it.
+        None is returned when it wasn't replaced.
+        """
+        pass
@@ -0,0 +1,372 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+import weakref
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from src.config.settings import BRAVED_FRAMEWORK, BALAJIS_FRAMEWORK
+from src.storage.base import EVENT_COLUMNS, PROFILE_COLUMNS, USER_STATE_COLUMNS, ProfileStore, score_column
+
+# Columns stored as JSON text
+JSON_COLUMNS = ("interests", "braved_scores", "balajis_scores", "learning_path", "neuroscience_insights")
+
+def _defaults() -> Dict[str, Any]:
+    """Column defaults, matching the Supabase schema"""
+    return {
+        "username": None,
+        "interests": [],
+        "braved_scores": {key: 0 for key in BRAVED_FRAMEWORK},
+        "balajis_scores": {key: 0 for key in BALAJIS_FRAMEWORK},
+        "learning_path": {"steps": []},
+        "neuroscience_insights": None
+    }
+
+def _to_utc(timestamp: str) -> str:
+    """Normalize an ISO timestamp so stored values compare as strings"""
+    value = datetime.fromisoformat(timestamp)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+class SQLiteProfileStore(ProfileStore):
+    """
+    Local profile storage in a single SQLite file.
+
+    The database runs in WAL mode and keeps the JSONB columns of the Supabase
+    schema as JSON text. Score keys get expression indexes on json_extract and
+    interests are mirrored into an indexed side table, so the score and
+    interest queries don't scan the whole table.
+    """
+
+    def __init__(self, path: str = "braved_balajis.db"):
+        self.path = path
+        self._connect()
+        self._create_schema()
+        # A connection must not be used across fork (e.g. gunicorn workers
+        # forked from a preloaded master), so each child opens its own
+        reconnect = weakref.WeakMethod(self._connect)
+        os.register_at_fork(after_in_child=lambda: reconnect() and reconnect()())
+
+    def _connect(self):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+
+    def _create_schema(self):
+        statements = [
+            """
+            CREATE TABLE IF NOT EXISTS profiles (
+                id TEXT PRIMARY KEY,
+                username TEXT,
+                interests TEXT NOT NULL DEFAULT '[]',
+                braved_scores TEXT NOT NULL DEFAULT '{}',
+                balajis_scores TEXT NOT NULL DEFAULT '{}',
+                learning_path TEXT NOT NULL DEFAULT '{"steps": []}',
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                neuroscience_insights TEXT NOT NULL DEFAULT 'null'
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS profile_interests (
+                profile_id TEXT NOT NULL REFERENCES profiles (id) ON DELETE CASCADE,
+                interest TEXT NOT NULL,
+                PRIMARY KEY (interest, profile_id)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                origin TEXT NOT NULL,
+                channel TEXT NOT NULL,
+                key TEXT NOT NULL,
+                data TEXT NOT NULL DEFAULT 'null',
+                created_at TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS user_state (
+                user_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                data TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (user_id, kind)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS profiles_created_at_idx ON profiles (created_at)",
+            "CREATE INDEX IF NOT EXISTS events_created_at_idx ON events (created_at)",
+            "CREATE INDEX IF NOT EXISTS profile_interests_profile_idx ON profile_interests (profile_id)"
+        ]
+        for component in list(BRAVED_FRAMEWORK) + list(BALAJIS_FRAMEWORK):
+            column = score_column(component)
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS profiles_{column.split('_')[0]}_{component}_idx "
+                f"ON profiles ({self._score_expression(component)})"
+            )
+        with self._lock:
+            for statement in statements:
+                self._conn.execute(statement)
+            # Databases created before profiles had a row version
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(profiles)")}
+            if "updated_at" not in columns:
+                self._conn.execute("ALTER TABLE profiles ADD COLUMN updated_at TEXT NOT NULL DEFAULT ''")
+                self._conn.execute("UPDATE profiles SET updated_at = created_at")
+            if "neuroscience_insights" not in columns:
+                self._conn.execute("ALTER TABLE profiles ADD COLUMN neuroscience_insights TEXT NOT NULL DEFAULT 'null'")
+
+    @staticmethod
+    def _score_expression(component: str) -> str:
+        # Must stay textually identical between index and queries
+        return f"json_extract({score_column(component)}, '$.{component}')"
+
+    @staticmethod
+    def _decode(row: sqlite3.Row) -> Dict[str, Any]:
+        data = dict(row)
+        for column in JSON_COLUMNS:
+            data[column] = json.loads(data[column])
+        return data
+
+    @staticmethod
+    def _check_columns(data: Dict[str, Any]):
+        unknown = set(data) - set(PROFILE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown profile columns: {', '.join(sorted(unknown))}")
+
+    def _insert(self, data: Dict[str, Any]) -> str:
+        self._check_columns(data)
+        row = {**_defaults(), **data}
+        row["id"] = row.get("id") or str(uuid.uuid4())
+        row["created_at"] = _to_utc(row["created_at"]) if row.get("created_at") else datetime.now(timezone.utc).isoformat()
+        row["updated_at"] = datetime.now(timezone.utc).isoformat()
+        values = [json.dumps(row[column]) if column in JSON_COLUMNS else row[column] for column in PROFILE_COLUMNS]
+        self._conn.execute(
+            f"INSERT INTO profiles ({', '.join(PROFILE_COLUMNS)}) VALUES ({', '.join('?' * len(PROFILE_COLUMNS))})",
+            values
+        )
+        self._replace_interests(row["id"], row["interests"])
+        return row["id"]
+
+    def _update(self, profile_id: str, data: Dict[str, Any], expected_version: Optional[str] = None) -> bool:
+        self._check_columns(data)
+        data = {column: value for column, value in data.items() if column not in ("id", "created_at", "updated_at")}
+        where, params = "id = ?", [profile_id]
+        if expected_version is not None:
+            where, params = "id = ? AND updated_at = ?", [profile_id, expected_version]
+        if not data:
+            return self._conn.execute(f"SELECT 1 FROM profiles WHERE {where}", params).fetchone() is not None
+        # updated_at is the row version, bumped on every write like the Supabase trigger does
+        assignments = ", ".join(f"{column} = ?" for column in data)
+        values = [json.dumps(value) if column in JSON_COLUMNS else value for column, value in data.items()]
+        cursor = self._conn.execute(
+            f"UPDATE profiles SET {assignments}, updated_at = ? WHERE {where}",
+            values + [datetime.now(timezone.utc).isoformat()] + params
+        )
+        if cursor.rowcount and "interests" in data:
+            self._replace_interests(profile_id, data["interests"])
+        return cursor.rowcount > 0
+
+    def _replace_interests(self, profile_id: str, interests: List[str]):
+        self._conn.execute("DELETE FROM profile_interests WHERE profile_id = ?", (profile_id,))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO profile_interests (profile_id, interest) VALUES (?, ?)",
+            [(profile_id, interest) for interest in interests]
+        )
+
+    def _select(self, where: str = "", params: tuple = (), suffix: str = "") -> List[Dict[str, Any]]:
+        sql = f"SELECT {', '.join(PROFILE_COLUMNS)} FROM profiles {where} {suffix}"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._decode(row) for row in rows]
+
+    def _select_ids(self, profile_ids: List[str]) -> List[Dict[str, Any]]:
+        rows = self._select(f"WHERE id IN ({', '.join('?' * len(profile_ids))})", tuple(profile_ids))
+        by_id = {row["id"]: row for row in rows}
+        return [by_id[profile_id] for profile_id in profile_ids if profile_id in by_id]
+
+    async def create_profile(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                profile_id = self._insert(data)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return (await self.get_profile(profile_id))
+
+    async def get_profile(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._select("WHERE id = ?", (profile_id,))
+        return rows[0] if rows else None
+
+    async def get_profile_version(self, profile_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT updated_at FROM profiles WHERE id = ?", (profile_id,)).fetchone()
+        return row["updated_at"] if row else None
+
+    async def list_profiles(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        return self._select(suffix="ORDER BY created_at, id LIMIT ? OFFSET ?", params=(-1 if limit is None else limit, offset))
+
+    async def list_profile_versions(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, updated_at FROM profiles ORDER BY created_at, id LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    async def update_profile(self, profile_id: str, data: Dict[str, Any],
+                             expected_version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                found = self._update(profile_id, data, expected_version)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return (await self.get_profile(profile_id)) if found else None
+
+    async def delete_profile(self, profile_id: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM profiles WHERE id = ?", (profile_id,))
+        return cursor.rowcount > 0
+
+    async def bulk_create(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not rows:
+            return []
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                profile_ids = [self._insert(row) for row in rows]
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self._select_ids(profile_ids)
+
+    async def bulk_update(self, updates: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not updates:
+            return []
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                updated = [profile_id for profile_id, data in updates.items() if self._update(profile_id, data)]
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self._select_ids(updated)
+
+    async def bulk_delete(self, profile_ids: List[str]) -> int:
+        if not profile_ids:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM profiles WHERE id IN ({', '.join('?' * len(profile_ids))})",
+                tuple(profile_ids)
+            )
+        return cursor.rowcount
+
+    async def search_profiles(self,
+                              min_scores: Optional[Dict[str, int]] = None,
+                              interests: Optional[List[str]] = None,
+                              created_after: Optional[str] = None,
+                              limit: int = 100) -> List[Dict[str, Any]]:
+        conditions = []
+        params = []
+        for component, minimum in (min_scores or {}).items():
+            conditions.append(f"{self._score_expression(component)} >= ?")
+            params.append(int(minimum))
+        if interests:
+            conditions.append(
+                "id IN (SELECT profile_id FROM profile_interests "
+                f"WHERE interest IN ({', '.join('?' * len(interests))}))"
+            )
+            params.extend(interests)
+        if created_after:
+            conditions.append("created_at > ?")
+            params.append(_to_utc(created_after))
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._select(where, tuple(params) + (limit,), "LIMIT ?")
+
+    async def top_profiles(self, component: str, limit: int = 10) -> List[Dict[str, Any]]:
+        expression = self._score_expression(component)
+        return self._select(
+            f"WHERE {expression} IS NOT NULL",
+            (limit,),
+            f"ORDER BY {expression} DESC LIMIT ?"
+        )
+
+    async def append_events(self, events: List[Dict[str, Any]]) -> None:
+        if not events:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO events (origin, channel, key, data, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(event["origin"], event["channel"], event["key"], json.dumps(event.get("data")), now)
+                 for event in events]
+            )
+
+    async def read_events(self, after_id: int, limit: int = 1000) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(EVENT_COLUMNS)} FROM events WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
+            ).fetchall()
+        return [{**dict(row), "data": json.loads(row["data"])} for row in rows]
+
+    async def latest_event_id(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+
+    async def prune_events(self, before: str) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM events WHERE created_at < ?", (_to_utc(before),))
+        return cursor.rowcount
+
+    def _select_user_states(self, where: str, params: tuple) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(USER_STATE_COLUMNS)} FROM user_state WHERE {where}", params
+            ).fetchall()
+        return [{**dict(row), "data": json.loads(row["data"])} for row in rows]
+
+    async def get_user_state(self, user_id: str, kind: str) -> Optional[Dict[str, Any]]:
+        rows = self._select_user_states("user_id = ? AND kind = ?", (user_id, kind))
+        return rows[0] if rows else None
+
+    async def list_user_states(self, kind: str) -> List[Dict[str, Any]]:
+        return self._select_user_states("kind = ?", (kind,))
+
+    async def create_user_state(self, user_id: str, kind: str, data: Any) -> Optional[Dict[str, Any]]:
+        row = {"user_id": user_id, "kind": kind, "data": data, "updated_at": datetime.now(timezone.utc).isoformat()}
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO user_state (user_id, kind, data, updated_at) VALUES (?, ?, ?, ?)",
+                (user_id, kind, json.dumps(data), row["updated_at"])
+            )
+        return row if cursor.rowcount else None
+
+    async def update_user_state(self, user_id: str, kind: str, data: Any,
+                                expected_version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        where, params = "user_id = ? AND kind = ?", [user_id, kind]
+        if expected_version is not None:
+            where, params = "user_id = ? AND kind = ? AND updated_at = ?", [user_id, kind, expected_version]
+        row = {"user_id": user_id, "kind": kind, "data": data, "updated_at": datetime.now(timezone.utc).isoformat()}
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE user_state SET data = ?, updated_at = ? WHERE {where}",
+                [json.dumps(data), row["updated_at"]] + params
+            )
+        return row if cursor.rowcount else None
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,215 @@
+from typing import Any, Dict, List, Optional
+import requests
+from src.config.database import get_supabase_headers, get_supabase_url
+from src.storage.base import ProfileStore, score_column
+
+class SupabaseProfileStore(ProfileStore):
+    """Profile storage on Supabase through its PostgREST API"""
+
+    def __init__(self, base_url: Optional[str] = None, headers: Optional[Dict[str, str]] = None):
+        self.headers = headers or get_supabase_headers()
+        self.base_url = base_url or get_supabase_url()
+        self.table = "profiles"
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}/rest/v1/{self.table}"
+
+    def _table_url(self, table: str) -> str:
+        return f"{self.base_url}/rest/v1/{table}"
+
+    async def create_profile(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        response = requests.post(self.url, headers=self.headers, json=data)
+        response.raise_for_status()
+        return response.json()[0]
+
+    async def get_profile(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        response = requests.get(
+            self.url,
+            headers=self.headers,
+            params={"id": f"eq.{profile_id}"}
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data[0] if data else None
+
+    async def get_profile_version(self, profile_id: str) -> Optional[str]:
+        response = requests.get(
+            self.url,
+            headers=self.headers,
+            params={"id": f"eq.{profile_id}", "select": "updated_at"}
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data[0]["updated_at"] if data else None
+
+    async def list_profiles(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        params = {"order": "created_at.asc", "offset": str(offset)}
+        if limit is not None:
+            params["limit"] = str(limit)
+        response = requests.get(self.url, headers=self.headers, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def list_profile_versions(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        params = {"select": "id,updated_at", "order": "created_at.asc", "offset": str(offset)}
+        if limit is not None:
+            params["limit"] = str(limit)
+        response = requests.get(self.url, headers=self.headers, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def update_profile(self, profile_id: str, data: Dict[str, Any],
+                             expected_version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        params = {"id": f"eq.{profile_id}"}
+        if expected_version is not None:
+            params["updated_at"] = f"eq.{expected_version}"
+        response = requests.patch(self.url, headers=self.headers, params=params, json=data)
+        response.raise_for_status()
+        data = response.json()
+        return data[0] if data else None
+
+    async def delete_profile(self, profile_id: str) -> bool:
+        response = requests.delete(
+            self.url,
+            headers=self.headers,
+            params={"id": f"eq.{profile_id}"}
+        )
+        response.raise_for_status()
+        return bool(response.json())
+
+    async def bulk_create(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not rows:
+            return []
+        response = requests.post(self.url, headers=self.headers, json=rows)
+        response.raise_for_status()
+        return response.json()
+
+    async def bulk_update(self, updates: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # PostgREST has no multi-row PATCH with per-row values, and an upsert
+        # would need every column, so each row is patched on its own.
+        updated = []
+        for profile_id, data in updates.items():
+            row = await self.update_profile(profile_id, data)
+            if row:
+                updated.append(row)
+        return updated
+
+    async def bulk_delete(self, profile_ids: List[str]) -> int:
+        if not profile_ids:
+            return 0
+        response = requests.delete(
+            self.url,
+            headers=self.headers,
+            params={"id": f"in.({','.join(profile_ids)})"}
+        )
+        response.raise_for_status()
+        return len(response.json())
+
+    async def search_profiles(self,
+                              min_scores: Optional[Dict[str, int]] = None,
+                              interests: Optional[List[str]] = None,
+                              created_after: Optional[str] = None,
+                              limit: int = 100) -> List[Dict[str, Any]]:
+        # The jsonb '->' filters match the expression indexes on the score keys
+        params = [("limit", str(limit))]
+        for component, minimum in (min_scores or {}).items():
+            params.append((f"{score_column(component)}->{component}", f"gte.{int(minimum)}"))
+        if interests:
+            quoted = ",".join('"{}"'.format(interest.replace('"', '\\"')) for interest in interests)
+            params.append(("interests", f"ov.{{{quoted}}}"))
+        if created_after:
+            params.append(("created_at", f"gt.{created_after}"))
+
+        response = requests.get(self.url, headers=self.headers, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def top_profiles(self, component: str, limit: int = 10) -> List[Dict[str, Any]]:
+        column = score_column(component)
+        response = requests.get(
+            self.url,
+            headers=self.headers,
+            params={
+                f"{column}->{component}": "not.is.null",
+                "order": f"{column}->{component}.desc",
+                "limit": str(limit)
+            }
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def append_events(self, events: List[Dict[str, Any]]) -> None:
+        if not events:
+            return
+        response = requests.post(
+            self._table_url("events"),
+            headers={**self.headers, "Prefer": "return=minimal"},
+            json=[{column: event.get(column) for column in ("origin", "channel", "key", "data")} for event in events]
+        )
+        response.raise_for_status()
+
+    async def read_events(self, after_id: int, limit: int = 1000) -> List[Dict[str, Any]]:
+        response = requests.get(
+            self._table_url("events"),
+            headers=self.headers,
+            params={"id": f"gt.{after_id}", "order": "id.asc", "limit": str(limit)}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def latest_event_id(self) -> int:
+        response = requests.get(
+            self._table_url("events"),
+            headers=self.headers,
+            params={"select": "id", "order": "id.desc", "limit": "1"}
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data[0]["id"] if data else 0
+
+    async def prune_events(self, before: str) -> int:
+        response = requests.delete(
+            self._table_url("events"),
+            headers={**self.headers, "Prefer": "return=representation"},
+            params={"created_at": f"lt.{before}", "select": "id"}
+        )
+        response.raise_for_status()
+        return len(response.json())
+
+    async def get_user_state(self, user_id: str, kind: str) -> Optional[Dict[str, Any]]:
+        response = requests.get(
+            self._table_url("user_state"),
+            headers=self.headers,
+            params={"user_id": f"eq.{user_id}", "kind": f"eq.{kind}"}
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data[0] if data else None
+
+    async def list_user_states(self, kind: str) -> List[Dict[str, Any]]:
+        response = requests.get(self._table_url("user_state"), headers=self.headers, params={"kind": f"eq.{kind}"})
+        response.raise_for_status()
+        return response.json()
+
+    async def create_user_state(self, user_id: str, kind: str, data: Any) -> Optional[Dict[str, Any]]:
+        response = requests.post(
+            self._table_url("user_state"),
+            headers=self.headers,
+            json={"user_id": user_id, "kind": kind, "data": data}
+        )
+        if response.status_code == 409:
+            # The primary key (user_id, kind) is taken
+            return None
+        response.raise_for_status()
+        return response.json()[0]
+
+    async def update_user_state(self, user_id: str, kind: str, data: Any,
+                                expected_version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        params = {"user_id": f"eq.{user_id}", "kind": f"eq.{kind}"}
+        if expected_version is not None:
+            params["updated_at"] = f"eq.{expected_version}"
+        response = requests.patch(self._table_url("user_state"), headers=self.headers, params=params, json={"data": data})
+        response.raise_for_status()
+        rows = response.json()
+        return rows[0] if rows else None
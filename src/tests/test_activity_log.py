@@ -0,0 +1,112 @@
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from src.agents.neuroscience_agent import NeuroscienceAgent
+from src.storage import activity_log as activity_log_module
+from src.storage.activity_log import ActivityLog
+
+TYPES = ["Videos", "Podcasts", "Hands-on projects", "Lecture notes", "Quiz"]
+TOPICS = ["defi", "bitcoin", "zk"]
+
+def make_events(count, seed):
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    events = []
+    for _ in range(count):
+        event = {
+            "timestamp": start + timedelta(minutes=rng.randrange(60 * 24 * 60)),
+            "type": rng.choice(TYPES),
+            "engagement_score": rng.random(),
+            "success_rate": rng.random()
+        }
+        if event["type"] == "Quiz":
+            event["topic"] = rng.choice(TOPICS)
+            event["total_questions"] = rng.randint(1, 10)
+            event["correct_answers"] = rng.randint(0, event["total_questions"])
+        events.append(event)
+    return events
+
+def test_time_range_scan_and_compaction(tmp_path):
+    log = ActivityLog(str(tmp_path))
+    events = make_events(500, seed=1) + make_events(500, seed=2)
+    assert log.append("alice", events[:500]) == 500
+    assert log.append("alice", events[500:]) == 500
+
+    start, end = datetime(2024, 1, 10), datetime(2024, 2, 1)
+    expected = sorted(event["timestamp"] for event in events if start <= event["timestamp"] < end)
+    scan = log.scan("alice", start, end, columns=["type"])
+    assert len(scan) == len(expected)
+    assert set(scan.columns) == {"timestamp", "type"}
+    assert list(scan.columns["timestamp"][:1]) == [int((expected[0] - datetime(1970, 1, 1)).total_seconds() * 1_000_000)]
+
+    assert log.compact("alice") == 2
+    assert len(log.scan("alice", start, end)) == len(expected)
+    assert len(log.scan("bob")) == 0
+
+def test_compaction_waits_for_readers_of_other_processes(tmp_path):
+    log, other = ActivityLog(str(tmp_path), max_segments=2), ActivityLog(str(tmp_path))
+    events = make_events(30, seed=4)
+    for start in range(0, 20, 10):
+        log.append("alice", events[start:start + 10])
+
+    with other._locked("alice", exclusive=False):
+        # A scan is running in the other process: appends leave compaction for later
+        log.append("alice", events[20:])
+        assert len(log._segments("alice")) == 3
+        assert log.compact("alice", blocking=False) == 0
+    assert log.compact("alice") == 3
+    assert other.compact("alice") == 0
+    assert len(other.scan("alice")) == 30
+
+def test_interrupted_compaction_does_not_duplicate_events(tmp_path, monkeypatch):
+    log = ActivityLog(str(tmp_path))
+    events = make_events(30, seed=6)
+    for start in range(0, 30, 10):
+        log.append("alice", events[start:start + 10])
+
+    def crash(path):
+        raise KeyboardInterrupt
+    # The merged segment is in place, the ones it replaces are not deleted yet
+    monkeypatch.setattr(log, "_remove_segment", crash)
+    try:
+        log.compact("alice")
+    except KeyboardInterrupt:
+        pass
+    monkeypatch.undo()
+
+    restarted = ActivityLog(str(tmp_path))
+    assert len(restarted.scan("alice")) == 30
+    assert len(restarted._segments("alice")) == 1
+    assert len(restarted._segments("alice", replaced=True)) == 3
+    assert restarted.compact("alice") == 0
+    assert restarted._segments("alice", replaced=True) == []
+    assert len(restarted.scan("alice")) == 30
+
+def test_segment_metadata_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(activity_log_module, "META_CACHE_SIZE", 2)
+    log = ActivityLog(str(tmp_path))
+    events = make_events(40, seed=5)
+    for start in range(0, 40, 10):
+        log.append("alice", events[start:start + 10])
+    assert len(log.scan("alice")) == 40
+    assert len(log._meta) == 2
+
+def test_analytics_from_columns_match_dicts(tmp_path):
+    log = ActivityLog(str(tmp_path))
+    events = make_events(2000, seed=3)
+    # Hours are each event's local wall-clock hour, in whatever zone it was logged
+    zones = [timezone(timedelta(hours=-5)), timezone(timedelta(hours=9)), timezone.utc]
+    for index, event in enumerate(events):
+        event["timestamp"] = event["timestamp"].replace(tzinfo=timezone.utc).astimezone(zones[index % 3])
+    log.append("alice", events[:1000])
+    log.append("alice", events[1000:])
+    scan = log.scan("alice")
+
+    agent = NeuroscienceAgent()
+    ordered = sorted(events, key=lambda event: event["timestamp"])
+    expected = asyncio.run(agent.analyze_learning_patterns({
+        "activities": ordered,
+        "activity_times": ordered,
+        "quiz_results": [event for event in ordered if event.get("total_questions")]
+    }))
+    assert asyncio.run(agent.analyze_activity_columns(scan.columns, scan.types, scan.topics)) == expected
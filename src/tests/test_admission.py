@@ -0,0 +1,104 @@
+import asyncio
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+from src.api.admission import AdmissionController, AdmissionMiddleware, AIMDLimit, Rejected, request_user
+
+def test_aimd_limit_adapts_to_latency():
+    limit = AIMDLimit(initial=4, max_limit=8)
+    for _ in range(20):
+        limit.on_sample(0.1, inflight=4)
+    assert limit.limit > 4
+    grown = limit.limit
+    limit.on_sample(1.0, inflight=4)
+    assert limit.limit == pytest.approx(grown * 0.9)
+    # Only the first of a burst of slow responses backs off
+    limit.on_sample(1.0, inflight=4)
+    assert limit.limit == pytest.approx(grown * 0.9)
+    limit.on_sample(0.1, inflight=4, failed=True)
+    limit.on_sample(0.1, inflight=0)
+    assert limit.limit <= grown * 0.9
+
+def test_queue_serves_users_fairly():
+    async def scenario():
+        controller = AdmissionController(AIMDLimit(initial=2, max_limit=2), queue_size=8, queue_timeout=5, max_user_queue_share=1)
+        await controller.acquire("heavy")
+        await controller.acquire("heavy")
+        order = []
+
+        async def request(user_id):
+            await controller.acquire(user_id)
+            order.append(user_id)
+            controller.release(user_id)
+
+        tasks = [asyncio.create_task(request("heavy")) for _ in range(3)]
+        tasks.append(asyncio.create_task(request("light")))
+        await asyncio.sleep(0)
+        controller.release("heavy")
+        await asyncio.gather(*tasks)
+        return order, controller.inflight, controller.queued
+
+    order, inflight, queued = asyncio.run(scenario())
+    # The light user has nothing in flight, so it goes before the heavy user's backlog
+    assert order == ["light", "heavy", "heavy", "heavy"]
+    assert (inflight, queued) == (1, 0)
+
+def test_rejects_when_queue_is_full_or_wait_times_out():
+    async def scenario():
+        controller = AdmissionController(AIMDLimit(initial=1), queue_size=4, queue_timeout=0.05, max_user_queue_share=0.25)
+        await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(Rejected):
+            await controller.acquire("b")
+        with pytest.raises(Rejected) as timed_out:
+            await waiting
+        return controller, timed_out.value
+
+    controller, rejection = asyncio.run(scenario())
+    assert rejection.retry_after >= 1
+    assert (controller.inflight, controller.queued) == (1, 0)
+
+def test_middleware_returns_429_with_retry_after():
+    controller = AdmissionController(AIMDLimit(initial=1, max_limit=1), queue_size=0)
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, controllers={("POST", "/analyze"): controller})
+
+    @app.post("/analyze")
+    async def analyze(payload: dict):
+        return {"user_id": payload["user_id"]}
+
+    client = TestClient(app)
+    assert client.post("/analyze", json={"user_id": "u1"}).json() == {"user_id": "u1"}
+    assert controller.inflight == 0
+
+    asyncio.run(controller.acquire("someone"))
+    response = client.post("/analyze", json={"user_id": "u1"})
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+
+def test_clients_cannot_escape_their_queue_by_rotating_user_ids():
+    controller = AdmissionController(AIMDLimit(initial=1, max_limit=1), queue_size=4, max_user_queue_share=0.25)
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, controllers={("POST", "/analyze"): controller})
+
+    @app.post("/analyze")
+    async def analyze():
+        return {}
+
+    async def scenario():
+        await controller.acquire(request_user({"type": "http", "client": ("10.0.0.1", 1234)}))
+        transport = httpx.ASGITransport(app=app, client=("10.0.0.1", 1234))
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            queued = asyncio.ensure_future(client.post("/analyze", headers={"X-User-Id": "a"}, json={"user_id": "a"}))
+            while not controller.queued:
+                await asyncio.sleep(0)
+            # The same client under another id shares the queue, which holds one request per client
+            rejected = await client.post("/analyze", headers={"X-User-Id": "b"}, json={"user_id": "b"})
+            controller.release(request_user({"type": "http", "client": ("10.0.0.1", 1234)}))
+            return rejected, await queued
+
+    rejected, admitted = asyncio.run(scenario())
+    assert rejected.status_code == 429
+    assert admitted.status_code == 200
@@ -0,0 +1,11 @@
+import pytest
+
+pytest.importorskip("agno")
+
+from src.main import create_app
+
+def test_create_app_mounts_every_router():
+    paths = {route.path for route in create_app().routes}
+    for path in ("/profiles/{profile_id}", "/analyze", "/frameworks", "/agents",
+                 "/analyze-social-media", "/learning/{profile_id}/schedule", "/reviews/users/due"):
+        assert path in paths
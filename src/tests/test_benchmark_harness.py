@@ -0,0 +1,32 @@
+from benchmarks.data import make_tweets, make_topics
+from benchmarks.harness import compare, measure, metric
+
+def results(**values):
+    return {"results": values}
+
+def test_compare_respects_direction_and_threshold():
+    baseline = results(
+        slower=metric(1.0), faster=metric(1.0), noise=metric(1.0),
+        throughput=metric(100, "requests/s", higher_is_better=True), removed=metric(1.0)
+    )
+    current = results(
+        slower=metric(1.5), faster=metric(0.5), noise=metric(1.05),
+        throughput=metric(50, "requests/s", higher_is_better=True), added=metric(1.0)
+    )
+    verdicts = {row["name"]: row["verdict"] for row in compare(baseline, current, threshold=0.1)}
+    assert verdicts == {
+        "slower": "regressed", "faster": "improved", "noise": "unchanged",
+        "throughput": "regressed", "removed": "removed", "added": "added"
+    }
+
+def test_measure_reports_seconds_per_call():
+    calls = []
+    result = measure(lambda: calls.append(1), repeat=2, min_time=0.001)
+    assert result["unit"] == "s" and not result["higher_is_better"]
+    assert 0 < result["value"] < 0.001
+    assert len(calls) > 2
+
+def test_generators_are_deterministic():
+    assert make_tweets(5, seed=3) == make_tweets(5, seed=3)
+    topics, engagement = make_topics(50)
+    assert set(engagement) == set(topics)
@@ -0,0 +1,94 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from src.api import profile_routes
+from src.api.caching import CacheControlMiddleware, StaticJSON, cache_control_for, etag_matches
+from src.api.compression import CompressionMiddleware
+from src.services.profile_service import ProfileService
+from src.storage.sqlite_store import SQLiteProfileStore
+
+def make_client(tmp_path, monkeypatch):
+    store = SQLiteProfileStore(str(tmp_path / "profiles.db"))
+    service = ProfileService(store)
+    monkeypatch.setattr(profile_routes, "profile_service", service)
+    listing = StaticJSON({"frameworks": ["BRAVED", "BALAJIS"] * 200})
+
+    app = FastAPI()
+    app.add_middleware(CacheControlMiddleware)
+    app.add_middleware(CompressionMiddleware)
+    app.include_router(profile_routes.router)
+
+    @app.get("/frameworks")
+    async def frameworks(request: Request):
+        return listing.response(request)
+
+    return TestClient(app), service
+
+def test_etag_matching():
+    assert etag_matches('"abc"', '"abc"') == '"abc"'
+    assert etag_matches('W/"abc", "def"', '"abc"') == '"abc"'
+    assert etag_matches('"abc-gzip"', '"abc"', '"abc-gzip"') == '"abc-gzip"'
+    assert etag_matches("*", '"abc"', '"abc-gzip"') == '"abc"'
+    assert etag_matches('"abc-gzip"', '"abc"') is None
+    assert etag_matches('"abcd"', '"abc"') is None
+    assert etag_matches(None, '"abc"') is None
+
+def test_cache_policies():
+    assert cache_control_for("GET", "/frameworks") == "public, max-age=86400"
+    assert cache_control_for("GET", "/profiles/123") == "private, no-cache"
+    assert cache_control_for("GET", "/profiles/123/similar") == "private, max-age=30"
+    assert cache_control_for("PUT", "/profiles/123") == "no-store"
+
+def test_profile_conditional_get(tmp_path, monkeypatch):
+    client, service = make_client(tmp_path, monkeypatch)
+    profile_id = client.post("/profiles/", json={"username": "etag_user"}).json()["id"]
+
+    response = client.get(f"/profiles/{profile_id}")
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "private, no-cache"
+    assert response.json()["username"] == "etag_user"
+
+    # The cached row version answers without reading the profile
+    calls = []
+    original = service.store.get_profile
+    service.store.get_profile = lambda *args: calls.append(args) or original(*args)
+    response = client.get(f"/profiles/{profile_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert calls == []
+    service.store.get_profile = original
+
+    client.put(f"/profiles/{profile_id}", json={"username": "etag_user_2"})
+    response = client.get(f"/profiles/{profile_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["username"] == "etag_user_2"
+
+def test_static_listing_etag(tmp_path, monkeypatch):
+    client, _ = make_client(tmp_path, monkeypatch)
+    response = client.get("/frameworks", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].endswith('-gzip"')
+    assert response.headers["cache-control"] == "public, max-age=86400"
+
+    gzip_etag = response.headers["etag"]
+    response = client.get("/frameworks", headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == gzip_etag
+    assert response.headers["cache-control"] == "public, max-age=86400"
+
+    # An identity request holding the gzip tag doesn't have the identity bytes
+    response = client.get("/frameworks", headers={"Accept-Encoding": "identity", "If-None-Match": gzip_etag})
+    assert response.status_code == 200 and "content-encoding" not in response.headers
+
+def test_not_modified_echoes_the_compressed_profile_tag(tmp_path, monkeypatch):
+    client, _ = make_client(tmp_path, monkeypatch)
+    profile_id = client.post("/profiles/", json={"username": "x" * 2000}).json()["id"]
+    response = client.get(f"/profiles/{profile_id}", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["etag"].endswith('-gzip"')
+
+    revalidated = client.get(
+        f"/profiles/{profile_id}", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == response.headers["etag"]
+    assert "Accept" in revalidated.headers["vary"]
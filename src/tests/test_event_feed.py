@@ -0,0 +1,34 @@
+import asyncio
+from src.services import event_feed
+from src.services.event_feed import EventFeed
+from src.storage.sqlite_store import SQLiteProfileStore
+
+def test_events_past_a_gap_are_handled_once(tmp_path, monkeypatch):
+    store = SQLiteProfileStore(str(tmp_path / "profiles.db"))
+    feed = EventFeed(store)
+    received = []
+
+    async def handle(key, data):
+        received.append(key)
+
+    async def scenario():
+        feed.add_handler("reviews", handle)
+        await feed.start(poll=False)
+        await feed.poll()
+        await store.append_events([{"origin": "other", "channel": "reviews", "key": key} for key in "abc"])
+        # Event 2 is still being committed by another writer
+        store._conn.execute("DELETE FROM events WHERE id = 2")
+        await feed.poll()
+        await feed.poll()
+        assert received == ["a", "c"] and feed._after == 1
+
+        monkeypatch.setattr(event_feed, "GAP_TIMEOUT", 0)
+        await feed.poll()
+        assert feed._after == 3 and not feed._seen
+        await store.append_events([{"origin": "other", "channel": "reviews", "key": "d"}])
+        await feed.poll()
+        assert received == ["a", "c", "d"]
+        await feed.stop()
+
+    asyncio.run(scenario())
+    store.close()
@@ -0,0 +1,77 @@
+import asyncio
+import requests
+from fastapi.testclient import TestClient
+from loadtest.fake_postgrest import create_app
+from src.storage.supabase_store import SupabaseProfileStore
+
+HEADERS = {"apikey": "test", "Prefer": "return=representation"}
+
+def test_filters_match_the_supabase_store_queries():
+    client = TestClient(create_app())
+    rows = client.post("/rest/v1/profiles", headers=HEADERS, json=[
+        {"username": "low", "interests": ["ai"], "braved_scores": {"ai": 10}},
+        {"username": "high", "interests": ["bitcoin", "zk"], "braved_scores": {"ai": 90}},
+        {"username": "mid", "interests": ['say "gm"'], "braved_scores": {"ai": 50}}
+    ])
+    assert rows.status_code == 201
+    ids = {row["username"]: row["id"] for row in rows.json()}
+
+    def usernames(params):
+        response = client.get("/rest/v1/profiles", headers=HEADERS, params=params)
+        assert response.status_code == 200
+        return [row["username"] for row in response.json()]
+
+    assert usernames({"braved_scores->ai": "gte.50"}) == ["high", "mid"]
+    assert usernames({"interests": 'ov.{"zk","say \\"gm\\""}'}) == ["high", "mid"]
+    assert usernames({"braved_scores->ai": "not.is.null", "order": "braved_scores->ai.desc", "limit": "2"}) == [
+        "high", "mid"
+    ]
+    assert usernames({"created_at": f"gt.{rows.json()[0]['created_at']}"}) == ["high", "mid"]
+    assert usernames({"order": "created_at.asc", "offset": "1"}) == ["high", "mid"]
+
+    version = client.get("/rest/v1/profiles", headers=HEADERS, params={"id": f"eq.{ids['low']}", "select": "updated_at"})
+    assert list(version.json()[0]) == ["updated_at"]
+    updated = client.patch("/rest/v1/profiles", headers=HEADERS, params={"id": f"eq.{ids['low']}"}, json={"interests": []})
+    assert updated.json()[0]["updated_at"] > version.json()[0]["updated_at"]
+
+    deleted = client.delete("/rest/v1/profiles", headers=HEADERS, params={"id": f"in.({ids['low']},{ids['mid']})"})
+    assert len(deleted.json()) == 2
+    assert usernames({}) == ["high"]
+
+def test_unknown_columns_and_missing_key_are_rejected():
+    client = TestClient(create_app())
+    response = client.post("/rest/v1/profiles", headers=HEADERS, json={"nickname": "x"})
+    assert response.status_code == 400 and response.json()["code"] == "PGRST204"
+    assert client.get("/rest/v1/profiles").status_code == 401
+
+def test_injected_errors_spare_the_stats_endpoint():
+    client = TestClient(create_app(error_rate=1.0, error_status=503))
+    assert client.get("/rest/v1/profiles", headers=HEADERS).status_code == 503
+    assert client.get("/_loadtest/stats").json()["injected_errors"] == 1
+
+def test_supabase_store_shares_events_and_user_state(monkeypatch):
+    client = TestClient(create_app())
+    for method in ("get", "post", "patch", "delete"):
+        monkeypatch.setattr(requests, method, getattr(client, method))
+    store = SupabaseProfileStore("http://testserver", HEADERS)
+
+    async def run():
+        assert await store.latest_event_id() == 0
+        await store.append_events([
+            {"origin": "a", "channel": "profiles", "key": "p1", "data": {"scores": True}},
+            {"origin": "b", "channel": "progress", "key": "u1", "data": None}
+        ])
+        events = await store.read_events(0)
+        assert [(event["id"], event["channel"]) for event in events] == [(1, "profiles"), (2, "progress")]
+        assert await store.read_events(1) == events[1:]
+        assert await store.latest_event_id() == 2
+
+        created = await store.create_user_state("u1", "reviews", {"items": []})
+        assert await store.create_user_state("u1", "reviews", {}) is None
+        assert await store.get_user_state("u1", "reviews") == created
+        updated = await store.update_user_state("u1", "reviews", {"items": [1]}, expected_version=created["updated_at"])
+        assert updated["data"] == {"items": [1]}
+        assert await store.update_user_state("u1", "reviews", {}, expected_version=created["updated_at"]) is None
+        assert await store.list_user_states("reviews") == [updated]
+
+    asyncio.run(run())
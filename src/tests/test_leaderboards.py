@@ -0,0 +1,117 @@
+import asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.api import admin, leaderboard_routes
+from src.models.profile import Profile
+from src.services.leaderboard_service import LeaderboardService
+from src.services.profile_service import ProfileService
+from src.storage.sqlite_store import SQLiteProfileStore
+
+run = asyncio.run
+
+def scores(ai):
+    return {"ai": ai}, {}
+
+def test_upsert_and_remove_move_ranks():
+    boards = LeaderboardService(None)
+    for profile_id, ai in (("a", 50), ("b", 80), ("c", 50), ("d", 10)):
+        boards.upsert(profile_id, *scores(ai))
+    assert [(e["rank"], e["profile_id"]) for e in boards.top("ai", 4)] == [(1, "b"), (2, "a"), (2, "c"), (4, "d")]
+    assert boards.rank("ai", "c") == {"rank": 2, "profile_id": "c", "score": 50, "total": 4}
+
+    boards.upsert("d", *scores(90))
+    boards.remove("b")
+    assert [(e["rank"], e["profile_id"]) for e in boards.top("ai")] == [(1, "d"), (2, "a"), (2, "c")]
+    assert boards.rank("ai", "a")["total"] == 3
+
+def test_around_is_clipped_at_the_ends():
+    boards = LeaderboardService(None)
+    for i in range(10):
+        boards.upsert(f"p{i}", *scores(i * 10))
+    assert [e["profile_id"] for e in boards.around("ai", "p5", 2)] == ["p7", "p6", "p5", "p4", "p3"]
+    assert [e["rank"] for e in boards.around("ai", "p9", 2)] == [1, 2, 3]
+    assert [e["profile_id"] for e in boards.around("ai", "p0", 1)] == ["p1", "p0"]
+
+def create(service, username, ai):
+    return run(service.create_profile(Profile(username=username, braved_scores={"ai": ai}))).id
+
+def test_snapshot_is_reconciled_with_the_store(tmp_path):
+    store = SQLiteProfileStore(str(tmp_path / "profiles.db"))
+    service = ProfileService(store)
+    ids = [create(service, f"u{i}", i) for i in range(40)]
+
+    boards = LeaderboardService(str(tmp_path / "boards.npz"))
+    run(boards.load(store))
+    assert boards.save_snapshot()
+
+    # Writes made after the snapshot, e.g. by another worker
+    run(service.patch_profile(ids[0], {"braved_scores": {"ai": 100}}))
+    run(service.delete_profile(ids[1]))
+    added = create(service, "new", 99)
+
+    restarted = LeaderboardService(str(tmp_path / "boards.npz"))
+    restarted._scan = None  # the snapshot must be caught up, not replaced by a scan
+    run(restarted.load(store))
+    assert len(restarted) == 40
+    assert [e["profile_id"] for e in restarted.top("ai", 2)] == [ids[0], added]
+    assert restarted.top("ai", 40) == run(_scanned(store)).top("ai", 40)
+    store.close()
+
+async def _scanned(store):
+    boards = LeaderboardService(None)
+    await boards.load(store)
+    return boards
+
+def test_writes_during_load_are_not_lost(tmp_path):
+    store = SQLiteProfileStore(str(tmp_path / "profiles.db"))
+    service = ProfileService(store)
+    ids = [create(service, f"u{i}", i) for i in range(30)]
+    boards = LeaderboardService(None)
+    list_profiles = store.list_profiles
+
+    async def list_and_write(limit=None, offset=0):
+        rows = await list_profiles(limit=limit, offset=offset)
+        if offset == 10:
+            boards.on_profile_write(ids[0], {"braved_scores": {"ai": 100}, "balajis_scores": {}})
+            boards.on_profile_write(ids[29], None)
+        return rows
+
+    store.list_profiles = list_and_write
+    run(boards.load(store, page_size=10))
+    assert len(boards) == 29
+    assert boards.top("ai", 1)[0]["profile_id"] == ids[0]
+    store.close()
+
+def test_only_one_process_writes_the_snapshot(tmp_path):
+    path = str(tmp_path / "boards.npz")
+    first, second = LeaderboardService(path), LeaderboardService(path)
+    first.upsert("a", *scores(1))
+    assert first.save_snapshot()
+    assert not second.save_snapshot()
+
+    first._writer_lock.close()  # the writer exits
+    assert second.save_snapshot()
+
+def test_routes(tmp_path, monkeypatch):
+    store = SQLiteProfileStore(str(tmp_path / "profiles.db"))
+    service = ProfileService(store)
+    a, b = create(service, "a", 70), create(service, "b", 90)
+    boards = LeaderboardService(str(tmp_path / "boards.npz"))
+    monkeypatch.setattr(leaderboard_routes, "profile_service", service)
+    monkeypatch.setattr(leaderboard_routes, "get_leaderboard_service", lambda: boards)
+
+    app = FastAPI()
+    app.include_router(leaderboard_routes.router)
+    client = TestClient(app)
+    assert [e["profile_id"] for e in client.get("/leaderboards/ai").json()["entries"]] == [b, a]
+    assert client.get(f"/leaderboards/ai/profiles/{a}").json()["rank"] == 2
+    assert len(client.get(f"/leaderboards/ai/profiles/{a}/around", params={"radius": 1}).json()["entries"]) == 2
+    assert client.get("/leaderboards/unknown").status_code == 404
+    assert client.get("/leaderboards/ai/profiles/unknown").status_code == 404
+    assert client.get("/leaderboards/ai/profiles/unknown/around").status_code == 404
+
+    assert client.post("/leaderboards/snapshot").status_code == 403
+    monkeypatch.setattr(admin, "ADMIN_API_KEY", "secret")
+    response = client.post("/leaderboards/snapshot", headers={"X-Admin-Key": "secret"})
+    assert response.status_code == 200 and response.json()["profiles"] == 2
+    store.close()
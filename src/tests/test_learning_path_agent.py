@@ -0,0 +1,54 @@
+import asyncio
+from datetime import datetime
+import pytest
+
+pytest.importorskip("agno")
+from src.agents.learning_path_agent import LearningPathAgent
+
+def test_resources_are_memoized_and_shared():
+    agent = LearningPathAgent()
+    agent.clear_resource_cache()
+    first = asyncio.run(agent.recommend_resources("defi", "braved", "beginner"))
+    second = asyncio.run(agent.recommend_resources(" defi", "balajis", "Beginner"))
+    assert first is second
+    assert first["courses"][0]["url"] == "https://udemy.com/courses/defi-beginner"
+    with pytest.raises(TypeError):
+        first["courses"][0]["url"] = "changed"
+    assert agent.resource_cache_info()["hits"] == 1
+
+def test_bulk_resolution_keeps_request_order():
+    agent = LearningPathAgent()
+    results = asyncio.run(agent.recommend_resources_bulk([
+        ("defi", "braved", "beginner"), ("ai", "balajis", "advanced"), ("defi", "balajis", "beginner")
+    ]))
+    assert results[0] is results[2]
+    assert results[1]["books"][0]["url"] == "https://books.com/ai"
+
+def test_learning_path_modules_follow_their_prerequisites():
+    agent = LearningPathAgent()
+    recommendations = {
+        "B": {"name": "Bitcoin", "learning_path": {
+            level: {"title": f"Bitcoin {level}", "steps": ["read", "build"]}
+            for level in ("beginner", "intermediate", "advanced")
+        }}
+    }
+    result = asyncio.run(agent.execute("generate_learning_path", {
+        "interests": {"technology": {"primary_interest": "zk"}},
+        "braved_recommendations": recommendations,
+        "start_date": "2024-01-01T00:00:00"
+    }))
+    assert [module["module_id"] for module in result["modules"]] == [
+        "interests.technology", "braved.B.beginner", "braved.B.intermediate", "braved.B.advanced"
+    ]
+    assert result["modules"][2]["prerequisites"] == ["braved.B.beginner"]
+    assert result["modules"][1]["resources"]["books"][0]["url"] == "https://books.com/Bitcoin"
+
+    # Modules given out of order are scheduled after their prerequisites
+    schedule = asyncio.run(agent.create_learning_schedule(result["modules"][::-1], datetime(2024, 1, 1)))
+    assert [entry["module_id"] for entry in schedule["modules"]] == [
+        "braved.B.beginner", "interests.technology", "braved.B.intermediate", "braved.B.advanced"
+    ]
+    assert schedule["end_date"] == datetime(2024, 4, 22).isoformat()
+    assert "milestones" not in schedule["modules"][0]
+    milestones = agent.iter_learning_schedule(result["modules"][::-1], datetime(2024, 1, 1))
+    assert [entry["module_id"] for entry in milestones] == [entry["module_id"] for entry in schedule["modules"]]
@@ -0,0 +1,132 @@
+import asyncio
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.api import learning_routes
+from src.models.profile import Profile
+from src.services import learning_planner
+from src.services.profile_service import ProfileService
+from src.storage.sqlite_store import SQLiteProfileStore
+from src.services.learning_planner import (
+    FrozenCatalog, LearningPlanner, catalog_from_recommendations, iter_module_schedule, schedule_page
+)
+
+def make_catalog():
+    recommendations = {
+        component: {
+            "name": name,
+            "learning_path": {
+                level: {"title": f"{name} {level}", "steps": ["read", "build"]}
+                for level in ("beginner", "intermediate", "advanced")
+            }
+        }
+        for component, name in (("B", "Bitcoin"), ("A", "AI"))
+    }
+    catalog = catalog_from_recommendations("braved", recommendations)
+    catalog["braved.A.advanced"]["prerequisites"].append("braved.B.intermediate")
+    return catalog
+
+def test_plan_respects_prerequisites_with_parallel_tracks():
+    planner = LearningPlanner()
+    schedule = planner.plan(make_catalog(), targets=["braved.A.advanced"], start_date=datetime(2024, 1, 1))
+    assert [stage["modules"] for stage in schedule["stages"]] == [
+        ["braved.B.beginner", "braved.A.beginner"],
+        ["braved.B.intermediate", "braved.A.intermediate"],
+        ["braved.A.advanced"]
+    ]
+    assert schedule["total_duration_weeks"] == 12
+    assert schedule["end_date"] == datetime(2024, 3, 25).isoformat()
+
+def test_completed_modules_and_track_limit():
+    planner = LearningPlanner()
+    schedule = planner.plan(make_catalog(), completed=["braved.B.beginner"], max_parallel=1)
+    ids = [module["module_id"] for module in schedule["modules"]]
+    assert "braved.B.beginner" not in ids
+    assert len(schedule["stages"]) == len(ids) == 5
+    assert ids.index("braved.B.intermediate") < ids.index("braved.A.advanced")
+
+def test_compiled_dag_is_cached_per_version_and_cycles_rejected():
+    planner = LearningPlanner()
+    catalog = make_catalog()
+    assert planner.compile(catalog) is planner.compile(make_catalog())
+    catalog["braved.B.beginner"]["prerequisites"].append("braved.A.advanced")
+    with pytest.raises(ValueError):
+        planner.compile(catalog)
+
+def test_compiled_dag_keeps_its_own_copy_of_the_catalog(monkeypatch):
+    planner = LearningPlanner()
+    catalog = make_catalog()
+    frozen = FrozenCatalog(catalog)
+    dag = planner.compile(frozen)
+    catalog["braved.A.advanced"]["prerequisites"].clear()
+    catalog["braved.A.advanced"]["title"] = "changed"
+    assert dag.modules[dag.index["braved.A.advanced"]]["title"] == "AI advanced"
+    with pytest.raises(TypeError):
+        dag.modules[0]["title"] = "changed"
+
+    # A FrozenCatalog is looked up by the version it was hashed to once
+    monkeypatch.setattr(learning_planner, "catalog_version", lambda catalog: pytest.fail("catalog rehashed"))
+    schedule = planner.plan(frozen, targets=["braved.A.advanced"])
+    assert schedule["modules"][-1]["prerequisites"] == ["braved.A.intermediate", "braved.B.intermediate"]
+
+def test_schedule_pages_walk_the_whole_path():
+    modules = [
+        {"title": f"Module {index}", "duration_weeks": 3, "objectives": ["learn", "apply"]}
+        for index in range(5)
+    ]
+    start_date = datetime(2024, 1, 1)
+    collected = []
+    week = 0
+    while week is not None:
+        page = schedule_page(modules, start_date, week, weeks=4)
+        collected.extend(page["weeks"])
+        week = page["next_week"]
+    assert [entry["week"] for entry in collected] == list(range(1, 16))
+
+    module_weeks = [
+        (entry["module_title"], milestone["week"], milestone["tasks"])
+        for entry in iter_module_schedule(modules, start_date)
+        for milestone in entry["milestones"]
+    ]
+    assert [(entry["module_title"], entry["module_week"], entry["tasks"]) for entry in collected] == module_weeks
+    assert collected[7]["start_date"] == datetime(2024, 2, 19).isoformat()
+
+def test_schedule_pages_follow_the_planned_stages():
+    modules = [
+        {"module_id": module_id, **module}
+        for module_id, module in make_catalog().items()
+    ][::-1]
+    start_date = datetime(2024, 1, 1)
+    planned = LearningPlanner().plan(make_catalog(), max_parallel=2, start_date=start_date)
+    starts = {entry["module_id"]: entry["start_date"] for entry in planned["modules"]}
+
+    page = schedule_page(modules, start_date, week=4, weeks=4, max_parallel=2)
+    assert page["total_weeks"] == planned["total_duration_weeks"]
+    assert {entry["module_id"] for entry in page["weeks"]} == {"braved.B.intermediate", "braved.A.intermediate"}
+    first_weeks = [entry for entry in page["weeks"] if entry["module_week"] == 1]
+    assert all(entry["start_date"] == starts[entry["module_id"]] for entry in first_weeks)
+    ordered = [entry["module_id"] for entry in iter_module_schedule(modules, start_date, max_parallel=2)]
+    assert all(ordered.index(prerequisite) < ordered.index(module["module_id"])
+               for module in modules for prerequisite in module["prerequisites"])
+
+def test_stored_learning_path_is_paged_in_planned_order(tmp_path, monkeypatch):
+    service = ProfileService(SQLiteProfileStore(str(tmp_path / "profiles.db")))
+    monkeypatch.setattr(learning_routes, "profile_service", service)
+    app = FastAPI()
+    app.include_router(learning_routes.router)
+    client = TestClient(app)
+    profile = asyncio.run(service.create_profile(Profile(username="alice")))
+
+    modules = [{"module_id": module_id, **module} for module_id, module in make_catalog().items()]
+    stored = client.put(f"/learning/{profile.id}/path", json={
+        "modules": modules, "start_date": "2024-01-01T00:00:00", "max_parallel": 2
+    })
+    assert stored.status_code == 200
+    assert asyncio.run(service.get_profile(profile.id)).learning_path["modules"] == modules
+
+    # AI beginner runs alongside Bitcoin beginner, not after every Bitcoin module
+    page = client.get(f"/learning/{profile.id}/schedule", params={"week": 0, "weeks": 1}).json()
+    assert {entry["module_id"] for entry in page["weeks"]} == {"braved.B.beginner", "braved.A.beginner"}
+    assert page["total_weeks"] == stored.json()["schedule"]["total_duration_weeks"] == 12
+    assert client.put("/learning/missing/path", json={"modules": modules}).status_code == 404
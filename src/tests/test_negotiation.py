@@ -0,0 +1,93 @@
+import pytest
+import requests
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.api import profile_routes
+from src.api.caching import etag_matches
+from src.api.compression import CompressionMiddleware
+from src.api.negotiation import MSGPACK_MEDIA_TYPE, negotiate_format
+from src.client import APIClient
+from src.models.profile import Profile
+from src.services.profile_service import ProfileService
+from src.storage.sqlite_store import SQLiteProfileStore
+
+msgpack = pytest.importorskip("msgpack")
+
+def make_app(tmp_path, monkeypatch):
+    service = ProfileService(SQLiteProfileStore(str(tmp_path / "profiles.db")))
+    monkeypatch.setattr(profile_routes, "profile_service", service)
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+    app.include_router(profile_routes.router)
+    return app
+
+def test_negotiate_format():
+    assert negotiate_format("application/msgpack") == "msgpack"
+    assert negotiate_format("application/x-msgpack, application/json;q=0.5") == "msgpack"
+    assert negotiate_format("application/json, application/msgpack") == "json"
+    assert negotiate_format("*/*") == "json"
+    assert negotiate_format("") == "json"
+
+def test_profile_routes_speak_msgpack(tmp_path, monkeypatch):
+    client = TestClient(make_app(tmp_path, monkeypatch))
+    headers = {"Content-Type": MSGPACK_MEDIA_TYPE, "Accept": MSGPACK_MEDIA_TYPE}
+    body = msgpack.packb({"username": "packed", "braved_scores": {"ai": 70}})
+
+    created = client.post("/profiles/", content=body, headers=headers)
+    assert created.status_code == 200
+    assert created.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    profile = msgpack.unpackb(created.content)
+    assert profile["braved_scores"] == {"ai": 70}
+
+    fetched = client.get(f"/profiles/{profile['id']}", headers={"Accept": MSGPACK_MEDIA_TYPE})
+    assert msgpack.unpackb(fetched.content) == profile
+    assert fetched.headers["etag"].endswith('-msgpack"')
+    assert "Accept" in fetched.headers["vary"]
+    json_etag = client.get(f"/profiles/{profile['id']}").headers["etag"]
+    assert fetched.headers["etag"] == json_etag[:-1] + '-msgpack"'
+    assert etag_matches(fetched.headers["etag"], json_etag) is None
+
+    revalidated = client.get(
+        f"/profiles/{profile['id']}",
+        headers={"Accept": MSGPACK_MEDIA_TYPE, "If-None-Match": fetched.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == fetched.headers["etag"]
+
+    # Same schema, so JSON clients see the same profile
+    assert client.get(f"/profiles/{profile['id']}").json() == profile
+
+    invalid = client.post("/profiles/", content=b"\xc1", headers=headers)
+    assert invalid.status_code == 400
+
+class _TestClientSession(requests.Session):
+    """Routes the API client's requests through a Starlette TestClient"""
+
+    def __init__(self, client: TestClient):
+        super().__init__()
+        self.client = client
+
+    def request(self, method, url, params=None, data=None, headers=None, timeout=None):
+        response = self.client.request(method, url, params=params, content=data, headers=headers)
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.headers = requests.structures.CaseInsensitiveDict(response.headers)
+        result._content = response.content
+        return result
+
+@pytest.mark.parametrize("use_msgpack", [False, True])
+def test_api_client(tmp_path, monkeypatch, use_msgpack):
+    session = _TestClientSession(TestClient(make_app(tmp_path, monkeypatch)))
+    with APIClient("http://testserver", session=session, use_msgpack=use_msgpack) as client:
+        learning_path = {"modules": [{"title": "AI Fundamentals", "duration_weeks": 4, "objectives": ["agents"]}]}
+        created = client.create_profile(
+            Profile(username="typed", interests=["ai"], braved_scores={"ai": 80}, learning_path=learning_path)
+        )
+        assert isinstance(created, Profile)
+        assert created.learning_path == learning_path
+        assert client.get_profile(created.id) == created
+        assert client.list_profiles() == [created]
+        assert [profile.id for profile in client.search_profiles(min_scores={"ai": 50})] == [created.id]
+        assert client.delete_profile(created.id)
+        assert client.get_profile(created.id) is None
+        assert not client.delete_profile(created.id)
@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.agents.neuroscience_agent import NeuroscienceAgent
+
+def test_optimal_times_ranking():
+    agent = NeuroscienceAgent()
+    activity_times = [
+        {"timestamp": datetime(2024, 1, 1, 9), "success_rate": 0.5},
+        {"timestamp": datetime(2024, 1, 1, 20), "success_rate": 0.9},
+        {"timestamp": datetime(2024, 1, 2, 9), "success_rate": 0.7},
+        {"timestamp": datetime(2024, 1, 2, 14)}
+    ]
+    assert agent._analyze_optimal_times(activity_times) == [
+        {"hour": 20, "success_rate": 0.9, "activity_count": 1},
+        {"hour": 9, "success_rate": 0.6, "activity_count": 2},
+        {"hour": 14, "success_rate": 0.0, "activity_count": 1}
+    ]
+
+def test_optimal_times_use_local_hours():
+    agent = NeuroscienceAgent()
+    tokyo, new_york = timezone(timedelta(hours=9)), timezone(timedelta(hours=-5))
+    activity_times = [
+        {"timestamp": datetime(2024, 1, 1, 9, tzinfo=tokyo), "success_rate": 0.8},
+        {"timestamp": datetime(2024, 1, 1, 9, tzinfo=new_york), "success_rate": 0.6}
+    ]
+    assert agent._analyze_optimal_times(activity_times) == [
+        {"hour": 9, "success_rate": 0.7, "activity_count": 2}
+    ]
+
+def test_retention_by_topic():
+    agent = NeuroscienceAgent()
+    quiz_results = [
+        {"topic": "defi", "total_questions": 10, "correct_answers": 7},
+        {"topic": "bitcoin", "total_questions": 5, "correct_answers": 5},
+        {"topic": "defi", "total_questions": 5, "correct_answers": 2}
+    ]
+    retention = agent._analyze_retention(quiz_results)
+    assert retention["overall_retention"] == 70.0
+    assert retention["topic_retention"] == {
+        "defi": {"total_questions": 15, "correct_answers": 9},
+        "bitcoin": {"total_questions": 5, "correct_answers": 5}
+    }
+    assert list(retention["topic_retention"]) == ["defi", "bitcoin"]
+
+def test_style_scores_from_a_generator():
+    agent = NeuroscienceAgent()
+    activities = (
+        {"type": activity_type, "engagement_score": score}
+        for activity_type, score in [("Videos", 1.0), ("Hands-on projects", 0.25), ("Videos of lectures, with notes", 0.5)]
+    )
+    scores = agent._score_learning_styles(activities)
+    assert scores == {"visual": 0.75, "auditory": 0.5, "kinesthetic": 0.25, "reading_writing": 0.5}
+
+def test_style_scores_follow_changed_patterns():
+    agent = NeuroscienceAgent()
+    activities = [{"type": "Videos", "engagement_score": 1.0}, {"type": "Flashcards", "engagement_score": 0.5}]
+    assert agent._score_learning_styles(activities)["visual"] == 1.0
+
+    agent.learning_patterns["spaced_repetition"] = {"weight": 0.1, "indicators": ["flashcards"]}
+    agent.learning_patterns["visual"]["indicators"] = ["diagrams"]
+    insights = asyncio.run(agent.analyze_learning_patterns({"activities": activities}))
+    assert insights["learning_style_preferences"]["spaced_repetition"]["score"] == 0.5
+    assert insights["learning_style_preferences"]["visual"]["score"] == 0.0
+
+def test_batch_mastery_matches_per_topic_assessment():
+    agent = NeuroscienceAgent()
+    topics = [
+        {"name": "defi", "quiz_scores": [0.9, 0.85], "project_completion": 0.9, "time_spent": 10, "expected_time": 8, "engagement_score": 0.95},
+        {"name": "nft", "quiz_scores": [0.2, 0.5, 0.4], "project_completion": 0.1, "time_spent": 1, "expected_time": 5},
+        {"name": "zk", "project_completion": 0.7, "engagement_score": 0.7}
+    ]
+    columns = {key: [topic.get(key) for topic in topics] for key in
+               ("name", "quiz_scores", "project_completion", "time_spent", "expected_time", "engagement_score")}
+    expected = [asyncio.run(agent.assess_mastery_level(topic)) for topic in topics]
+    assert asyncio.run(agent.assess_mastery_levels(columns)) == expected
+
+def test_batch_mastery_takes_array_columns_and_copies_recommendations():
+    agent = NeuroscienceAgent()
+    assessments = asyncio.run(agent.assess_mastery_levels({
+        "name": ["defi", "nft"],
+        "quiz_scores": np.array([[0.1, 0.2], [0.2, 0.1]]),
+        "project_completion": np.array([0.1, 0.2])
+    }))
+    assert [a["mastery_level"] for a in assessments] == ["novice", "novice"]
+    assessments[0]["recommendations"][0]["suggestions"].append("changed")
+    expected = asyncio.run(agent.assess_mastery_level({"quiz_scores": [0.2, 0.1], "project_completion": 0.2}))
+    assert assessments[1]["recommendations"] == expected["recommendations"]
+
+    with pytest.raises(ValueError):
+        asyncio.run(agent.assess_mastery_levels({"name": ["defi"], "expected_time": [0]}))
+
+def test_mastery_route_rejects_bad_tables():
+    pytest.importorskip("agno")
+    from src.api import agent_routes
+
+    app = FastAPI()
+    app.include_router(agent_routes.router)
+    client = TestClient(app)
+
+    def post(topics):
+        return client.post("/neuroscience/mastery", json={"topics": topics})
+
+    response = post({"name": ["defi", "zk"], "quiz_scores": [[0.9], None], "expected_time": [2, None]})
+    assert response.status_code == 200 and len(response.json()["assessments"]) == 2
+    assert post({"name": ["defi"], "quiz_scores": [0.9]}).status_code == 422
+    assert post({"name": ["defi"], "time_spent": ["long"]}).status_code == 422
+    assert post({"name": ["defi"], "expected_time": [0]}).status_code == 400
+    assert post({"name": ["defi", "zk"], "time_spent": [1]}).status_code == 400
@@ -0,0 +1,29 @@
+import asyncio
+import pytest
+pytest.importorskip("agno")
+from src.agents.orchestrator import MrsBeens
+
+class StubAgent:
+    def __init__(self, name, result):
+        self.name = name
+        self.result = result
+
+    async def execute(self, task, params):
+        return self.result
+
+def test_execute_returns_named_results_and_scores():
+    orchestrator = MrsBeens()
+    orchestrator.register_agent(StubAgent("SocialMediaAgent", {"braved_scores": {"courage": 0.5}}))
+    orchestrator.register_agent(StubAgent("InterestAnalysisAgent", {
+        "learning_opportunities": {}, "balajis_scores": {"technology": 0.7}, "braved_scores": {"resilience": 0.4}
+    }))
+    orchestrator.register_agent(StubAgent("LearningPathAgent", {"modules": [], "total_duration_weeks": 0}))
+    events = []
+
+    result = asyncio.run(orchestrator.execute(
+        "analyze_user_profile", {}, lambda event, **data: events.append(event)
+    ))
+    assert result["learning_path"] == {"modules": [], "total_duration_weeks": 0}
+    assert result["braved_scores"] == {"courage": 0.5, "resilience": 0.4}
+    assert result["balajis_scores"] == {"technology": 0.7}
+    assert events.count("partial_scores") == 2
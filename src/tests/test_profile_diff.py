@@ -0,0 +1,38 @@
+from src.services.profile_diff import diff_row, merge_changes
+
+STORED_ROW = {
+    "id": "1",
+    "username": "test_user",
+    "interests": ["bitcoin", "ai"],
+    "braved_scores": {"bitcoin": 75, "ai": 80},
+    "balajis_scores": {"build": 85, "joy": 75},
+    "learning_path": {"steps": []},
+    "created_at": "2025-01-01T00:00:00+00:00"
+}
+
+def test_unchanged_row_has_empty_payload():
+    payload, changed_keys = diff_row(STORED_ROW, dict(STORED_ROW))
+    assert payload == {}
+    assert changed_keys == {}
+
+def test_single_score_key_change():
+    new = merge_changes(STORED_ROW, {"braved_scores": {"ai": 90}})
+    payload, changed_keys = diff_row(STORED_ROW, new)
+    assert payload == {"braved_scores": {"bitcoin": 75, "ai": 90}}
+    assert changed_keys == {"braved_scores": ["ai"]}
+
+def test_only_changed_columns_are_sent():
+    new = merge_changes(STORED_ROW, {
+        "interests": ["bitcoin", "ai", "blockchain"],
+        "balajis_scores": {"build": 85},
+        "id": "2"
+    })
+    payload, changed_keys = diff_row(STORED_ROW, new)
+    assert payload == {"interests": ["bitcoin", "ai", "blockchain"]}
+    assert changed_keys == {}
+
+def test_replaced_score_map_drops_missing_keys():
+    new = {**STORED_ROW, "braved_scores": {"bitcoin": 75}}
+    payload, changed_keys = diff_row(STORED_ROW, new, merge_scores=False)
+    assert payload == {"braved_scores": {"bitcoin": 75}}
+    assert changed_keys == {"braved_scores": ["ai"]}
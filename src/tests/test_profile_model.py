@@ -0,0 +1,45 @@
+import logging
+from src.models import profile as profile_module
+from src.models.profile import Profile
+
+ROW = {
+    "id": "p1",
+    "username": "row_user",
+    "interests": ["ai"],
+    "braved_scores": {"bitcoin": 10, "real_world": 0, "ai": 70, "vrar": 0, "emotional": 0, "decentralization": 0},
+    "balajis_scores": {"build": 5, "attention": 0, "leverage": 0, "algorithms": 0, "joy": 0, "influence": 0, "skills": 0},
+    "learning_path": {"steps": []},
+    "created_at": "2025-01-01T00:00:00+00:00",
+    "updated_at": "2025-01-02T00:00:00+00:00"
+}
+
+def test_from_db_row_matches_validation():
+    profile = Profile.from_db_row(ROW)
+    assert profile == Profile(**ROW)
+    assert profile.dict() == Profile(**ROW).dict()
+    # The cached row isn't shared with the model
+    profile.braved_scores["ai"] = 0
+    assert ROW["braved_scores"]["ai"] == 70
+
+def test_rich_learning_paths_validate():
+    learning_path = {
+        "modules": [{"module_id": "interests.ai", "duration_weeks": 4, "objectives": ["Build an agent"]}],
+        "schedule": {"start_date": "2025-01-06T00:00:00+00:00", "max_parallel": 1}
+    }
+    row = {**ROW, "learning_path": learning_path}
+    assert Profile(**row).learning_path == learning_path
+    assert Profile.from_db_row(row) == Profile(**row)
+
+def test_from_db_row_fills_missing_columns():
+    row = {key: value for key, value in ROW.items() if key != "updated_at"}
+    profile = Profile.from_db_row(row)
+    assert profile.updated_at is None
+    assert profile.username == "row_user"
+
+def test_sampled_validation_logs_mismatches(monkeypatch, caplog):
+    monkeypatch.setattr(profile_module, "PROFILE_VALIDATION_SAMPLE_RATE", 1.0)
+    with caplog.at_level(logging.WARNING, logger="src.models.profile"):
+        Profile.from_db_row(ROW)
+        assert not caplog.records
+        Profile.from_db_row({**ROW, "braved_scores": {"ai": "seventy"}})
+    assert "fails validation" in caplog.records[0].getMessage()
@@ -0,0 +1,123 @@
+import asyncio
+import pytest
+from src.models.profile import Profile
+from src.services.event_feed import EventFeed
+from src.services.profile_service import ConcurrentUpdateError, ProfileService
+from src.storage.sqlite_store import SQLiteProfileStore
+
+def run(coro):
+    return asyncio.run(coro)
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteProfileStore(str(tmp_path / "profiles.db"))
+    yield store
+    store.close()
+
+def create(service, username="learner", **scores):
+    return run(service.create_profile(Profile(username=username, braved_scores={"ai": 10, "bitcoin": 20, **scores})))
+
+def test_patch_is_not_dropped_after_another_writer(store):
+    service, other = ProfileService(store), ProfileService(store)
+    profile = create(service)
+    # Another worker changes ai; this process still caches ai=10
+    run(other.patch_profile(profile.id, {"braved_scores": {"ai": 50}}))
+
+    run(service.patch_profile(profile.id, {"braved_scores": {"ai": 10}}))
+    assert run(store.get_profile(profile.id))["braved_scores"]["ai"] == 10
+
+def test_patch_keeps_keys_written_by_others(store):
+    service, other = ProfileService(store), ProfileService(store)
+    profile = create(service)
+    run(other.patch_profile(profile.id, {"braved_scores": {"bitcoin": 90}}))
+
+    patched = run(service.patch_profile(profile.id, {"braved_scores": {"ai": 70}}))
+    assert patched.braved_scores == {"ai": 70, "bitcoin": 90}
+
+def test_patch_retries_when_the_row_changes_under_it(store):
+    service = ProfileService(store)
+    profile = create(service)
+    other = SQLiteProfileStore(store.path)
+    read = store.get_profile
+    reads = []
+
+    async def racing_get_profile(profile_id):
+        row = await read(profile_id)
+        if not reads:
+            # Someone else writes between this read and the update
+            await other.update_profile(profile_id, {"username": "renamed"})
+        reads.append(row)
+        return row
+
+    store.get_profile = racing_get_profile
+    patched = run(service.patch_profile(profile.id, {"braved_scores": {"ai": 60}}))
+    other.close()
+    # The second attempt diffed against the renamed row
+    assert reads[1]["username"] == "renamed"
+    assert patched.username == "renamed" and patched.braved_scores["ai"] == 60
+
+def test_patch_gives_up_on_a_row_that_keeps_changing(store):
+    service = ProfileService(store)
+    profile = create(service)
+    other = SQLiteProfileStore(store.path)
+    read = store.get_profile
+
+    async def always_racing(profile_id):
+        row = await read(profile_id)
+        await other.update_profile(profile_id, {"username": row["username"] + "x"})
+        return row
+
+    store.get_profile = always_racing
+    with pytest.raises(ConcurrentUpdateError):
+        run(service.patch_profile(profile.id, {"braved_scores": {"ai": 60}}))
+    other.close()
+
+def test_put_replaces_score_maps(store):
+    service = ProfileService(store)
+    profile = create(service)
+    updated = run(service.update_profile(profile.id, Profile(username="learner", braved_scores={"ai": 10})))
+    assert updated.braved_scores == {"ai": 10}
+
+def test_cache_is_bounded_and_not_filled_by_queries(store):
+    service = ProfileService(store, cache_size=2)
+    profiles = [create(service, f"learner_{i}") for i in range(3)]
+    assert list(service._rows) == [profiles[1].id, profiles[2].id]
+
+    service = ProfileService(store, cache_size=2)
+    run(service.get_all_profiles())
+    run(service.search_profiles(min_scores={"ai": 0}))
+    assert not service._rows
+
+def test_writes_reach_the_other_workers_through_the_event_feed(store):
+    async def scenario():
+        # Two workers over one database, each with its own feed
+        feeds = [EventFeed(SQLiteProfileStore(store.path)) for _ in range(2)]
+        service, other = (ProfileService(store, feed=feed) for feed in feeds)
+        written = []
+        other.add_score_listener(lambda profile_id, row: written.append((profile_id, row and row["braved_scores"])))
+        for feed in feeds:
+            await feed.start(poll=False)
+            await feed.poll()
+
+        profile = await service.create_profile(Profile(username="learner", braved_scores={"ai": 10}))
+        await other.get_profile(profile.id)
+        await service.patch_profile(profile.id, {"braved_scores": {"ai": 60}})
+        await service.patch_profile(profile.id, {"username": "renamed"})
+        await feeds[0].poll()
+        # Not yet delivered: the other worker still answers from its cache
+        assert await other.get_profile_version(profile.id) != await store.get_profile_version(profile.id)
+
+        await feeds[1].poll()
+        assert await other.get_profile_version(profile.id) == await store.get_profile_version(profile.id)
+        assert written == [(profile.id, {"ai": 60}), (profile.id, {"ai": 60})]
+
+        await service.delete_profile(profile.id)
+        await feeds[0].poll()
+        await feeds[1].poll()
+        assert written[-1] == (profile.id, None)
+        # A worker doesn't handle its own events
+        await feeds[0].poll()
+        for feed in feeds:
+            await feed.stop()
+
+    run(scenario())
@@ -0,0 +1,107 @@
+import asyncio
+import json
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.api import progress_routes
+from src.services import progress_hub
+from src.services.event_feed import EventFeed
+from src.services.progress_hub import ProgressHub
+from src.storage.sqlite_store import SQLiteProfileStore
+
+def test_publish_serializes_once_for_all_subscribers():
+    async def scenario():
+        hub = ProgressHub()
+        received = {"a": [], "b": [], "other": []}
+
+        def collector(name):
+            async def send(payload):
+                received[name].append(payload)
+            return send
+
+        hub.subscribe("u1", collector("a"))
+        subscriber = hub.subscribe("u1", collector("b"))
+        hub.subscribe("u2", collector("other"))
+        hub.publish("u1", "agent_started", agent="LearningPathAgent")
+        await asyncio.sleep(0)
+        hub.unsubscribe("u1", subscriber)
+        hub.publish("u1", "completed", learning_path={"modules": []})
+        await asyncio.sleep(0)
+        return hub, received
+
+    hub, received = asyncio.run(scenario())
+    assert received["a"][0] is received["b"][0]
+    assert [json.loads(payload)["event"] for payload in received["a"]] == ["agent_started", "completed"]
+    assert len(received["b"]) == 1 and received["other"] == []
+    assert hub.subscriber_count() == 2
+
+def test_slow_subscriber_keeps_only_the_newest_events():
+    async def scenario():
+        hub = ProgressHub()
+        release = asyncio.Event()
+        received = []
+
+        async def slow_send(payload):
+            await release.wait()
+            received.append(json.loads(payload)["step"])
+
+        hub.subscribe("u1", slow_send)
+        for step in range(progress_hub.MAX_PENDING_EVENTS * 2):
+            hub.publish("u1", "agent_finished", step=step)
+        release.set()
+        await asyncio.sleep(0.01)
+        return received
+
+    received = asyncio.run(scenario())
+    # Published faster than sent: only the newest events are kept
+    assert received == list(range(progress_hub.MAX_PENDING_EVENTS, progress_hub.MAX_PENDING_EVENTS * 2))
+
+def test_websocket_receives_latest_and_new_events(monkeypatch):
+    hub = ProgressHub()
+    monkeypatch.setattr(progress_routes, "get_progress_hub", lambda: hub)
+    app = FastAPI()
+    app.include_router(progress_routes.router)
+
+    @app.post("/publish/{user_id}/{event}")
+    async def publish(user_id: str, event: str):
+        hub.publish(user_id, event)
+
+    client = TestClient(app)
+    client.post("/publish/u1/agent_started")
+    with client.websocket_connect("/ws/analyses/u1") as websocket:
+        assert websocket.receive_json()["event"] == "agent_started"
+        client.post("/publish/u1/completed")
+        assert websocket.receive_json()["event"] == "completed"
+    assert hub.subscriber_count() == 0
+
+def test_events_reach_subscribers_of_other_workers(tmp_path):
+    store = SQLiteProfileStore(str(tmp_path / "profiles.db"))
+    feeds = [EventFeed(store), EventFeed(store)]
+    running, following = ProgressHub(feed=feeds[0]), ProgressHub(feed=feeds[1])
+    received = []
+
+    async def send(payload):
+        received.append(json.loads(payload))
+
+    async def scenario():
+        for feed in feeds:
+            await feed.start(poll=False)
+            await feed.poll()
+        following.subscribe("u1", send)
+        running.publish("u1", "completed", learning_path={"modules": []})
+        for feed in feeds:
+            await feed.poll()
+        await asyncio.sleep(0)
+        # Subscribing late to either worker still gets the latest event
+        late = []
+        async def late_send(payload):
+            late.append(payload)
+        following.subscribe("u1", late_send)
+        await asyncio.sleep(0)
+        for feed in feeds:
+            await feed.stop()
+        return late
+
+    late = asyncio.run(scenario())
+    assert [event["event"] for event in received] == ["completed"]
+    assert received[0]["learning_path"] == {"modules": []}
+    assert len(late) == 1
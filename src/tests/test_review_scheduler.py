@@ -0,0 +1,85 @@
+import asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.api import review_routes
+from src.models.profile import Profile
+from src.services.event_feed import EventFeed
+from src.services.profile_service import ProfileService
+from src.services.review_scheduler import DAY_SECONDS, ReviewScheduler, ReviewService
+from src.storage.sqlite_store import SQLiteProfileStore
+
+def test_sm2_intervals_and_due_index():
+    scheduler = ReviewScheduler(capacity=2)
+    now = 1_000_000.0
+    assert scheduler.review("alice", "defi", 5, now)["interval_days"] == 1
+    assert scheduler.review("alice", "defi", 5, now)["interval_days"] == 6
+    assert scheduler.review("alice", "defi", 2, now)["repetitions"] == 0
+    scheduler.review("alice", "nft", 4, now - DAY_SECONDS)
+    scheduler.review("bob", "bitcoin", 4, now + DAY_SECONDS)
+
+    assert [item["item_id"] for item in scheduler.due_items("alice", now + DAY_SECONDS)] == ["nft", "defi"]
+    assert scheduler.due_items("bob", now + DAY_SECONDS) == []
+    assert [user["user_id"] for user in scheduler.users_due(3600, now - DAY_SECONDS)] == []
+    assert [user["user_id"] for user in scheduler.users_due(3600, now)] == ["alice"]
+    assert [user["user_id"] for user in scheduler.users_due(DAY_SECONDS, now)] == ["alice"]
+    assert [user["user_id"] for user in scheduler.users_due(3 * DAY_SECONDS, now)] == ["alice", "bob"]
+
+def test_seeding_from_retention_and_mastery():
+    scheduler = ReviewScheduler()
+    retention = {"topic_retention": {"defi": {"total_questions": 10, "correct_answers": 3}}}
+    assert scheduler.seed_from_retention("alice", retention, now=0.0) == 1
+    assert scheduler.seed_from_retention("alice", retention, now=0.0) == 0
+    assert scheduler.seed_from_mastery("alice", {"topic": "zk", "score": 90.0}, now=0.0)
+    assert scheduler.state("alice", "defi")["repetitions"] == 0
+    assert scheduler.state("alice", "zk")["repetitions"] == 1
+
+def test_reviews_are_stored_and_shared_between_workers(tmp_path):
+    store = SQLiteProfileStore(str(tmp_path / "profiles.db"))
+
+    async def scenario():
+        feeds = [EventFeed(store) for _ in range(2)]
+        service, other = (ReviewService(store, feed=feed) for feed in feeds)
+        for feed in feeds:
+            await feed.start(poll=False)
+            await feed.poll()
+        await other.load()
+
+        await service.review("alice", "defi", 5, now=0.0)
+        await service.review("alice", "defi", 5, now=0.0)
+        assert await service.seed("alice", {}, [{"topic": "zk", "score": 40.0}], now=0.0) == 1
+        await feeds[0].poll()
+        await feeds[1].poll()
+        assert other.scheduler.state("alice", "defi") == service.scheduler.state("alice", "defi")
+        assert other.scheduler.state("alice", "defi")["interval_days"] == 6
+        assert [user["user_id"] for user in other.scheduler.users_due(DAY_SECONDS, now=0.0)] == ["alice"]
+
+        # A fresh worker builds its index from the store; writes continue from the stored state
+        restarted = ReviewService(store)
+        await restarted.load()
+        assert restarted.scheduler.document("alice") == service.scheduler.document("alice")
+        assert (await other.review("alice", "defi", 5, now=0.0))["repetitions"] == 3
+
+    asyncio.run(scenario())
+    store.close()
+
+def test_seed_route_reads_the_stored_insights(tmp_path, monkeypatch):
+    store = SQLiteProfileStore(str(tmp_path / "profiles.db"))
+    profiles = ProfileService(store)
+    monkeypatch.setattr(review_routes, "profile_service", profiles)
+    monkeypatch.setattr(review_routes, "review_service", ReviewService(store))
+    app = FastAPI()
+    app.include_router(review_routes.router)
+    client = TestClient(app)
+
+    profile = asyncio.run(profiles.create_profile(Profile(username="alice")))
+    asyncio.run(profiles.patch_profile(profile.id, {"neuroscience_insights": {
+        "retention_patterns": {"topic_retention": {"defi": {"total_questions": 4, "correct_answers": 4}}},
+        "mastery_assessments": [{"topic": "zk", "score": 20.0}]
+    }}))
+    # Schedules come from the profile, not the request
+    seeded = client.post(f"/reviews/{profile.id}/seed", json={"mastery_assessments": [{"topic": "x", "score": 100}]})
+    assert seeded.json()["seeded"] == 2
+    assert client.get(f"/reviews/{profile.id}/items/zk").json()["repetitions"] == 0
+    assert client.get(f"/reviews/{profile.id}/items/x").status_code == 404
+    assert client.post("/reviews/missing/seed").status_code == 404
+    store.close()
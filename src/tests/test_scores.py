@@ -0,0 +1,48 @@
+import pickle
+import numpy as np
+from src.models.profile import Profile
+from src.models.scores import SCORE_KEYS, ScoreVector, score_vector
+
+BRAVED = {"bitcoin": 90, "real_world": 10, "ai": 75, "vrar": 0, "emotional": 40, "decentralization": 55}
+BALAJIS = {"build": 80, "attention": 20, "leverage": 35, "algorithms": 60, "joy": 5, "influence": 15, "skills": 100}
+
+def test_round_trips_dict_form():
+    vector = ScoreVector.from_dicts(BRAVED, BALAJIS)
+    assert len(vector) == len(SCORE_KEYS)
+    assert vector.to_dicts() == (BRAVED, BALAJIS)
+    assert ScoreVector.from_row({"braved_scores": BRAVED, "balajis_scores": BALAJIS}) == vector
+    assert ScoreVector(vector.tobytes()) == vector
+    assert pickle.loads(pickle.dumps(vector)) == vector
+
+def test_named_and_indexed_access():
+    vector = ScoreVector.from_dicts(BRAVED, BALAJIS)
+    assert vector.ai == vector["ai"] == 75
+    assert vector.skills == vector[len(SCORE_KEYS) - 1] == 100
+    assert list(vector) == [vector[key] for key in SCORE_KEYS]
+    assert np.array_equal(vector.as_array(), score_vector(BRAVED, BALAJIS))
+
+def test_clips_and_fills_missing_components():
+    vector = ScoreVector.from_dicts({"bitcoin": 250, "ai": -3, "unknown": 7}, None)
+    assert vector.bitcoin == 100
+    assert vector.ai == 0
+    assert sum(vector) == 100
+
+def test_is_immutable_and_hashable():
+    vector = ScoreVector.from_dicts(BRAVED, BALAJIS)
+    try:
+        vector.ai = 1
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("ScoreVector should be immutable")
+    changed = vector.replace(ai=101, joy=6)
+    assert (changed.ai, changed.joy, vector.ai) == (100, 6, 75)
+    assert len({vector, ScoreVector.from_dicts(BRAVED, BALAJIS), changed}) == 2
+
+def test_profile_conversion():
+    profile = Profile(username="alice", braved_scores=BRAVED, balajis_scores=BALAJIS)
+    vector = profile.score_vector()
+    assert vector.build == 80
+    updated = profile.with_scores(vector.replace(build=10))
+    assert updated.balajis_scores["build"] == 10
+    assert profile.balajis_scores["build"] == 80
@@ -0,0 +1,106 @@
+import json
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.api import learning_routes
+from src.services.session_scheduler import SessionPlan, SessionScheduler, availability_mask, slot_scores
+from src.storage.sqlite_store import SQLiteProfileStore
+
+# Weekday evenings 18:00-21:00 and Saturday mornings 9:00-12:00
+AVAILABILITY = [{"day": day, "start_hour": 18, "end_hour": 21} for day in range(5)] + [
+    {"day": 5, "start_hour": 9, "end_hour": 12}
+]
+
+def make_plan(start_date=datetime(2024, 1, 1), **kwargs):
+    modules = [{"title": "DeFi", "hours": 8}, {"title": "Zero Knowledge", "hours": 4}]
+    scores = slot_scores([{"hour": 20, "success_rate": 0.9}, {"hour": 10, "success_rate": 0.7}])
+    return SessionPlan(modules, availability_mask(AVAILABILITY), scores, start_date, **kwargs)
+
+def test_best_hours_are_packed_first():
+    plan = make_plan(weekly_hours=6, max_daily_hours=1)
+    first_week = plan.sessions(until=datetime(2024, 1, 8))
+    # One hour per day: the 20:00 slot every weekday, then Saturday 10:00
+    assert [session["start"] for session in first_week] == [
+        datetime(2024, 1, day, 20, tzinfo=timezone.utc).isoformat() for day in range(1, 6)
+    ] + [datetime(2024, 1, 6, 10, tzinfo=timezone.utc).isoformat()]
+    assert sum(session["hours"] for session in plan.sessions()) == 12
+    assert [window["module_title"] for window in plan.module_windows()] == ["DeFi", "Zero Knowledge"]
+
+def test_missed_session_moves_without_replanning_others():
+    plan = make_plan()
+    before = plan.sessions()
+    missed = before[0]
+    rescheduled = plan.reschedule(datetime.fromisoformat(missed["start"]), now=datetime(2024, 1, 1, 22))
+    assert sum(session["hours"] for session in rescheduled) == missed["hours"]
+    assert all(session["module_title"] == missed["module_title"] for session in rescheduled)
+    after = plan.sessions()
+    assert [session for session in before[1:] if session not in after] == []
+
+def test_datetimes_are_normalized_to_utc():
+    # 2024-01-01 00:00 UTC, given in UTC+2
+    plan = make_plan(start_date=datetime(2024, 1, 1, 2, tzinfo=timezone(timedelta(hours=2))))
+    assert plan.sessions() == make_plan().sessions()
+    missed = datetime.fromisoformat(plan.sessions()[0]["start"]).astimezone(timezone(timedelta(hours=-5)))
+    rescheduled = plan.reschedule(missed, now=datetime(2024, 1, 1, 22))
+    assert all(session["start"].endswith("+00:00") for session in rescheduled)
+    assert plan.reschedule(datetime.fromisoformat(rescheduled[0]["start"]).replace(tzinfo=None))
+
+def test_packing_gives_up_after_the_search_horizon():
+    with pytest.raises(ValueError):
+        SessionPlan([{"title": "Forever", "hours": 10 ** 9}], availability_mask(AVAILABILITY), slot_scores(),
+                    datetime(2024, 1, 1))
+
+def test_modules_sharing_a_title_stay_apart():
+    modules = [{"module_id": "a", "title": "Basics", "hours": 2}, {"module_id": "b", "title": "Basics", "hours": 2}]
+    plan = SessionPlan(modules, availability_mask(AVAILABILITY), slot_scores(), datetime(2024, 1, 1),
+                       max_daily_hours=1)
+    assert [window["module_id"] for window in plan.module_windows()] == ["a", "b"]
+    first = plan.sessions()[0]
+    plan.reschedule(datetime.fromisoformat(first["start"]), now=datetime(2024, 1, 1, 22))
+    assert sorted(session["module_id"] for session in plan.sessions()) == ["a", "a", "b", "b"]
+
+def test_availability_is_local_to_the_learner():
+    # Evenings in New York, across the switch to daylight saving time on 2024-03-10
+    plan = make_plan(start_date=datetime(2024, 3, 4), time_zone="America/New_York", max_daily_hours=1)
+    starts = [datetime.fromisoformat(session["start"]) for session in plan.sessions()]
+    assert {start.hour for start in starts} == {20, 10}
+    assert starts[0].utcoffset() == timedelta(hours=-5) and starts[-1].utcoffset() == timedelta(hours=-4)
+    with pytest.raises(ValueError):
+        make_plan(time_zone="Mars/Olympus_Mons")
+
+def test_plans_round_trip_through_their_document():
+    plan = make_plan(time_zone="Europe/Berlin")
+    restored = SessionPlan.from_dict(json.loads(json.dumps(plan.to_dict())))
+    assert restored.sessions() == plan.sessions()
+    missed = datetime.fromisoformat(plan.sessions()[0]["start"])
+    assert restored.reschedule(missed, now=datetime(2024, 1, 1, 22)) == plan.reschedule(missed, now=datetime(2024, 1, 1, 22))
+
+def test_session_routes(tmp_path, monkeypatch):
+    store = SQLiteProfileStore(str(tmp_path / "profiles.db"))
+    monkeypatch.setattr(learning_routes, "session_scheduler", SessionScheduler(store))
+    app = FastAPI()
+    app.include_router(learning_routes.router)
+    client = TestClient(app)
+
+    def plan(modules):
+        return client.post("/learning/alice/sessions", json={
+            "modules": modules, "availability": AVAILABILITY, "start_date": "2024-01-01T00:00:00+02:00"
+        })
+
+    assert plan([{"title": "DeFi", "hours": "many"}]).status_code == 422
+    assert plan([{"hours": 3}]).status_code == 422
+    assert plan([{"title": "Forever", "hours": 10 ** 9}]).status_code == 400
+    response = plan([{"title": "DeFi", "hours": 4, "objectives": ["learn"]}])
+    assert response.status_code == 200
+    first = response.json()["sessions"][0]["start"]
+    missed = client.post("/learning/alice/sessions/missed", json={"start": first})
+    assert missed.status_code == 200 and missed.json()["rescheduled"]
+
+    # The plan is stored, so another worker sees the moved session
+    monkeypatch.setattr(learning_routes, "session_scheduler", SessionScheduler(store))
+    sessions = client.get("/learning/alice/sessions").json()
+    assert first not in [session["start"] for session in sessions]
+    assert missed.json()["rescheduled"][0] in sessions
+    assert client.post("/learning/alice/sessions/missed", json={"start": first}).status_code == 404
+    assert client.get("/learning/bob/sessions").status_code == 404
@@ -0,0 +1,91 @@
+import asyncio
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.api import profile_routes
+from src.models.profile import Profile
+from src.models.scores import SCORE_KEYS, ScoreVector
+from src.services import similarity_service as similarity_module
+from src.services.profile_service import ProfileService
+from src.services.similarity_service import SimilarityService
+from src.storage.sqlite_store import SQLiteProfileStore
+
+def random_index(count, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.integers(0, 101, size=(count, len(SCORE_KEYS)))
+    vectors[3] = 0  # a zero vector has no cosine similarity
+    index = SimilarityService(capacity=4)
+    for i, vector in enumerate(vectors):
+        braved, balajis = ScoreVector(vector.tolist()).to_dicts()
+        index.upsert(f"p{i}", braved, balajis)
+    return index, vectors.astype(np.float64)
+
+def reference(vectors, query, metric, k):
+    others = [i for i in range(len(vectors)) if i != query]
+    if metric == "cosine":
+        norms = np.linalg.norm(vectors[others], axis=1) * np.linalg.norm(vectors[query])
+        scores = np.divide(vectors[others] @ vectors[query], norms, out=np.zeros(len(others)), where=norms > 0)
+        order = np.argsort(-scores, kind="stable")
+    else:
+        scores = np.linalg.norm(vectors[others] - vectors[query], axis=1)
+        order = np.argsort(scores, kind="stable")
+    return [(f"p{others[i]}", scores[i]) for i in order[:k]]
+
+@pytest.mark.parametrize("metric", ["cosine", "euclidean"])
+def test_ranking_matches_brute_force(metric, monkeypatch):
+    # Small chunks so that results from several chunks are merged
+    monkeypatch.setattr(similarity_module, "CHUNK_SIZE", 16)
+    index, vectors = random_index(200)
+    for query in (0, 57, 199):
+        results = index.similar(f"p{query}", 10, metric)
+        expected = reference(vectors, query, metric, 10)
+        assert [r["profile_id"] for r in results] == [profile_id for profile_id, _ in expected]
+        np.testing.assert_allclose([r["score"] for r in results], [score for _, score in expected], rtol=1e-5)
+
+def test_removed_slots_are_reused_and_excluded():
+    index, _ = random_index(10)
+    slot = index._slots["p4"]
+    index.remove("p4")
+    assert "p4" not in {r["profile_id"] for r in index.similar("p0", 20)}
+    with pytest.raises(KeyError):
+        index.similar("p4")
+
+    index.upsert("new", {"ai": 50}, {"build": 50})
+    assert index._slots["new"] == slot and index._size == 10
+    assert "new" in {r["profile_id"] for r in index.similar("p0", 20)}
+
+def test_listener_follows_profile_writes(tmp_path):
+    store = SQLiteProfileStore(str(tmp_path / "profiles.db"))
+    service = ProfileService(store)
+    index = SimilarityService()
+    service.add_score_listener(index.on_profile_write)
+
+    run = asyncio.run
+    a = run(service.create_profile(Profile(username="a", braved_scores={"ai": 100})))
+    b = run(service.create_profile(Profile(username="b", braved_scores={"ai": 100})))
+    c = run(service.create_profile(Profile(username="c", braved_scores={"bitcoin": 100})))
+    assert index.similar(a.id, 1)[0]["profile_id"] == b.id
+
+    run(service.patch_profile(b.id, {"braved_scores": {"ai": 0, "bitcoin": 100}}))
+    assert index.similar(c.id, 1)[0]["profile_id"] == b.id
+    run(service.delete_profile(b.id))
+    assert len(index) == 2
+    store.close()
+
+def test_similar_route(tmp_path, monkeypatch):
+    store = SQLiteProfileStore(str(tmp_path / "profiles.db"))
+    service = ProfileService(store)
+    monkeypatch.setattr(profile_routes, "profile_service", service)
+    monkeypatch.setattr(profile_routes, "similarity_service", SimilarityService())
+    a = asyncio.run(service.create_profile(Profile(username="a")))
+    b = asyncio.run(service.create_profile(Profile(username="b")))
+
+    app = FastAPI()
+    app.include_router(profile_routes.router)
+    client = TestClient(app)
+    response = client.get(f"/profiles/{a.id}/similar", params={"metric": "euclidean"})
+    assert response.status_code == 200
+    assert response.json()["similar"] == [{"profile_id": b.id, "score": 0.0}]
+    assert client.get("/profiles/unknown/similar").status_code == 404
+    store.close()
@@ -0,0 +1,98 @@
+import asyncio
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.api import admin, stats_routes
+from src.models.scores import SCORE_KEYS, ScoreVector
+from src.services.stats_service import REPORTED_QUANTILES, StatsService
+
+def make_rows(count, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i, vector in enumerate(rng.integers(0, 101, size=(count, len(SCORE_KEYS)))):
+        braved, balajis = ScoreVector(vector.tolist()).to_dicts()
+        rows.append({"id": f"p{i}", "braved_scores": braved, "balajis_scores": balajis})
+    return rows
+
+def vectors_of(rows):
+    return np.array([ScoreVector.from_row(row).as_array() for row in rows], dtype=np.int64)
+
+def test_distributions_match_numpy():
+    rows = make_rows(501)
+    stats = StatsService()
+    stats.rebuild(rows)
+    vectors = vectors_of(rows)
+    for index, (key, distribution) in enumerate(stats.distributions().items()):
+        assert key == SCORE_KEYS[index]
+        assert distribution["histogram"] == np.bincount(vectors[:, index], minlength=101).tolist()
+        assert np.isclose(distribution["mean"], vectors[:, index].mean())
+        for quantile in REPORTED_QUANTILES:
+            expected = np.percentile(vectors[:, index], quantile, method="inverted_cdf")
+            assert distribution["quantiles"][f"p{quantile}"] == expected
+
+def test_percentiles_match_brute_force():
+    rows = make_rows(200, seed=1)
+    stats = StatsService()
+    stats.rebuild(rows)
+    vectors = vectors_of(rows)
+    for key, component in stats.percentiles("p7").items():
+        column = vectors[:, SCORE_KEYS.index(key)]
+        score = column[7]
+        below, equal = (column < score).sum(), (column == score).sum()
+        assert component["percentile"] == round(100 * (below + equal / 2) / len(column), 2)
+        assert component["top_percent"] == round(100 * (len(column) - below) / len(column), 2)
+
+def test_incremental_updates_equal_a_rebuild():
+    rows = make_rows(100, seed=2)
+    stats = StatsService()
+    for row in rows:
+        stats.on_profile_write(row["id"], row)
+    changed = make_rows(10, seed=3)
+    for row in changed:
+        stats.on_profile_write(row["id"], row)
+    stats.on_profile_write("p50", None)
+
+    expected = StatsService()
+    expected.rebuild([row for row in changed + rows[10:] if row["id"] != "p50"])
+    assert stats.count == expected.count == 99
+    assert stats.distributions() == expected.distributions()
+
+class PagedStore:
+    """Serves rows page by page and lets a test act between pages"""
+
+    def __init__(self, rows, between_pages):
+        self.rows = rows
+        self.between_pages = between_pages
+
+    async def list_profiles(self, limit=None, offset=0):
+        if offset:
+            self.between_pages()
+        return self.rows[offset:offset + limit]
+
+def test_writes_during_load_are_not_lost():
+    rows = make_rows(30, seed=4)
+    stats = StatsService()
+    updated = {**rows[0], "braved_scores": {key: 100 for key in rows[0]["braved_scores"]}}
+
+    def write_between_pages():
+        stats.on_profile_write("p0", updated)
+        stats.on_profile_write("p1", None)
+
+    asyncio.run(stats.load(PagedStore(rows, write_between_pages), page_size=10))
+    assert stats.loaded and stats.count == 29
+    assert stats.percentiles("p0")["ai"]["score"] == 100
+
+def test_rebuild_route_needs_the_admin_key(monkeypatch):
+    app = FastAPI()
+    app.include_router(stats_routes.router)
+    client = TestClient(app)
+    assert client.post("/stats/rebuild").status_code == 403
+
+    monkeypatch.setattr(admin, "ADMIN_API_KEY", "secret")
+    assert client.post("/stats/rebuild", headers={"X-Admin-Key": "wrong"}).status_code == 403
+
+    stats = StatsService()
+    monkeypatch.setattr(stats_routes, "get_stats_service", lambda: stats)
+    monkeypatch.setattr(stats_routes.profile_service, "store", PagedStore(make_rows(3), lambda: None))
+    response = client.post("/stats/rebuild", headers={"X-Admin-Key": "secret"})
+    assert response.status_code == 200 and response.json()["profiles"] == 3
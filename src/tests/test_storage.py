@@ -0,0 +1,120 @@
+"""
+Conformance tests shared by every ProfileStore backend.
+
+SQLite always runs; the Supabase backend runs when RUN_SUPABASE_TESTS is set
+and SUPABASE_URL/SUPABASE_SERVICE_KEY point at a disposable project.
+"""
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+import pytest
+from src.storage.sqlite_store import SQLiteProfileStore
+
+BACKENDS = ["sqlite"]
+if os.getenv("RUN_SUPABASE_TESTS"):
+    BACKENDS.append("supabase")
+
+@pytest.fixture(params=BACKENDS)
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        store = SQLiteProfileStore(str(tmp_path / "profiles.db"))
+        yield store
+        store.close()
+    else:
+        from src.storage.supabase_store import SupabaseProfileStore
+        store = SupabaseProfileStore()
+        created = []
+        original_create = store.bulk_create
+
+        async def tracking_bulk_create(rows):
+            result = await original_create(rows)
+            created.extend(row["id"] for row in result)
+            return result
+
+        store.bulk_create = tracking_bulk_create
+        yield store
+        asyncio.run(store.bulk_delete(created))
+
+def run(coro):
+    return asyncio.run(coro)
+
+def make_row(username, interests, ai=0, build=0):
+    return {
+        "username": username,
+        "interests": interests,
+        "braved_scores": {"bitcoin": 10, "real_world": 0, "ai": ai, "vrar": 0, "emotional": 0, "decentralization": 0},
+        "balajis_scores": {"build": build, "attention": 0, "leverage": 0, "algorithms": 0, "joy": 0, "influence": 0, "skills": 0},
+        "learning_path": {"steps": []}
+    }
+
+def test_crud_round_trip(store):
+    [row] = run(store.bulk_create([make_row("crud_user", ["bitcoin"], ai=40)]))
+    assert row["id"] and row["created_at"]
+    assert run(store.get_profile(row["id"]))["braved_scores"]["ai"] == 40
+
+    updated = run(store.update_profile(row["id"], {"braved_scores": {**row["braved_scores"], "ai": 90}}))
+    assert updated["braved_scores"]["ai"] == 90
+    assert updated["username"] == "crud_user"
+
+    assert run(store.bulk_delete([row["id"]])) == 1
+    assert run(store.get_profile(row["id"])) is None
+
+def test_updates_bump_row_version(store):
+    [row] = run(store.bulk_create([make_row("version_user", ["ai"])]))
+    assert run(store.get_profile_version(row["id"])) == row["updated_at"]
+
+    updated = run(store.update_profile(row["id"], {"username": "version_user_x"}))
+    assert updated["updated_at"] != row["updated_at"]
+    assert run(store.get_profile_version(row["id"])) == updated["updated_at"]
+    assert run(store.get_profile_version("00000000-0000-0000-0000-000000000000")) is None
+
+def test_bulk_update(store):
+    rows = run(store.bulk_create([make_row(f"bulk_{i}", ["ai"], ai=i) for i in range(3)]))
+    updated = run(store.bulk_update({row["id"]: {"username": row["username"] + "_x"} for row in rows}))
+    assert sorted(row["username"] for row in updated) == ["bulk_0_x", "bulk_1_x", "bulk_2_x"]
+
+def test_score_and_interest_queries(store):
+    rows = run(store.bulk_create([
+        make_row("query_low", ["bitcoin"], ai=20, build=90),
+        make_row("query_mid", ["ai", "zk"], ai=60, build=50),
+        make_row("query_high", ["ai"], ai=95, build=10)
+    ]))
+    ids = {row["id"] for row in rows}
+
+    found = run(store.search_profiles(min_scores={"ai": 50}, interests=["ai"]))
+    assert {row["username"] for row in found if row["id"] in ids} == {"query_mid", "query_high"}
+
+    found = run(store.search_profiles(min_scores={"ai": 50, "build": 40}))
+    assert {row["username"] for row in found if row["id"] in ids} == {"query_mid"}
+
+    found = run(store.search_profiles(interests=["zk", "bitcoin"]))
+    assert {row["username"] for row in found if row["id"] in ids} == {"query_low", "query_mid"}
+
+    top = [row for row in run(store.top_profiles("build", limit=100)) if row["id"] in ids]
+    assert [row["username"] for row in top] == ["query_low", "query_mid", "query_high"]
+
+def test_created_after(store):
+    before = (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat()
+    [row] = run(store.bulk_create([make_row("recent_user", [])]))
+    assert row["id"] in {found["id"] for found in run(store.search_profiles(created_after=before))}
+
+    later = (datetime.now(timezone.utc) + timedelta(minutes=1)).isoformat()
+    assert row["id"] not in {found["id"] for found in run(store.search_profiles(created_after=later))}
+
+def test_unknown_component_is_rejected(store):
+    with pytest.raises(ValueError):
+        run(store.top_profiles("not_a_component"))
+
+def test_update_with_stale_version_is_refused(store):
+    [row] = run(store.bulk_create([make_row("stale_user", ["ai"])]))
+    updated = run(store.update_profile(row["id"], {"username": "first"}, expected_version=row["updated_at"]))
+    assert updated["username"] == "first"
+    assert run(store.update_profile(row["id"], {"username": "second"}, expected_version=row["updated_at"])) is None
+    assert run(store.get_profile(row["id"]))["username"] == "first"
+
+def test_neuroscience_insights_round_trip(store):
+    [row] = run(store.bulk_create([make_row("insights_user", ["ai"])]))
+    assert row["neuroscience_insights"] is None
+    insights = {"optimal_learning_times": [9, 20], "recommendations": []}
+    updated = run(store.update_profile(row["id"], {"neuroscience_insights": insights}))
+    assert updated["neuroscience_insights"] == insights
@@ -18,7 +18,7 @@ if %errorlevel% neq 0 (
 )
 
 REM Start FastAPI backend server
-start cmd /k "echo Starting Backend Server... && cd /d %~dp0 && python -m uvicorn src.api.main:app --reload --port 8000"
+start cmd /k "echo Starting Backend Server... && cd /d %~dp0 && python -m uvicorn src.main:app --reload --port 8000"
 
 REM Wait a moment for the backend to start
 timeout /t 3 /nobreak
@@ -0,0 +1,25 @@
+-- Indexes for score-range, interest and recency queries on profiles.
+-- Score indexes are on the jsonb expression (col -> 'key') so that the
+-- PostgREST filters `braved_scores->ai=gte.70` and
+-- `order=braved_scores->ai.desc` can use them.
+
+CREATE INDEX IF NOT EXISTS profiles_interests_idx
+  ON profiles USING GIN (interests);
+
+CREATE INDEX IF NOT EXISTS profiles_created_at_idx
+  ON profiles (created_at);
+
+CREATE INDEX IF NOT EXISTS profiles_braved_bitcoin_idx ON profiles ((braved_scores -> 'bitcoin'));
+CREATE INDEX IF NOT EXISTS profiles_braved_real_world_idx ON profiles ((braved_scores -> 'real_world'));
+CREATE INDEX IF NOT EXISTS profiles_braved_ai_idx ON profiles ((braved_scores -> 'ai'));
+CREATE INDEX IF NOT EXISTS profiles_braved_vrar_idx ON profiles ((braved_scores -> 'vrar'));
+CREATE INDEX IF NOT EXISTS profiles_braved_emotional_idx ON profiles ((braved_scores -> 'emotional'));
+CREATE INDEX IF NOT EXISTS profiles_braved_decentralization_idx ON profiles ((braved_scores -> 'decentralization'));
+
+CREATE INDEX IF NOT EXISTS profiles_balajis_build_idx ON profiles ((balajis_scores -> 'build'));
+CREATE INDEX IF NOT EXISTS profiles_balajis_attention_idx ON profiles ((balajis_scores -> 'attention'));
+CREATE INDEX IF NOT EXISTS profiles_balajis_leverage_idx ON profiles ((balajis_scores -> 'leverage'));
+CREATE INDEX IF NOT EXISTS profiles_balajis_algorithms_idx ON profiles ((balajis_scores -> 'algorithms'));
+CREATE INDEX IF NOT EXISTS profiles_balajis_joy_idx ON profiles ((balajis_scores -> 'joy'));
+CREATE INDEX IF NOT EXISTS profiles_balajis_influence_idx ON profiles ((balajis_scores -> 'influence'));
+CREATE INDEX IF NOT EXISTS profiles_balajis_skills_idx ON profiles ((balajis_scores -> 'skills'));
@@ -0,0 +1,20 @@
+-- Row version for profiles: updated_at is bumped by a trigger on every
+-- update, and the API derives each profile's ETag from it.
+
+ALTER TABLE profiles
+  ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp();
+
+-- clock_timestamp() rather than now(): two updates in one transaction
+-- must still produce different versions.
+CREATE OR REPLACE FUNCTION set_profiles_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.updated_at = clock_timestamp();
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS profiles_set_updated_at ON profiles;
+CREATE TRIGGER profiles_set_updated_at
+  BEFORE UPDATE ON profiles
+  FOR EACH ROW EXECUTE FUNCTION set_profiles_updated_at();
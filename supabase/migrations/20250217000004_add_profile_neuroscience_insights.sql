@@ -0,0 +1,5 @@
+-- Learning pattern analysis stored by POST /neuroscience. Nullable: only
+-- profiles that have been analyzed have insights.
+
+ALTER TABLE profiles
+  ADD COLUMN IF NOT EXISTS neuroscience_insights JSONB;
@@ -0,0 +1,33 @@
+-- State the API's worker processes share. events is an append-only log
+-- each worker polls for the changes made by the others (profile writes,
+-- review updates, analysis progress); user_state holds one JSON document
+-- per user and kind (review queues, session plans), versioned like
+-- profiles by updated_at.
+
+CREATE TABLE IF NOT EXISTS events (
+  id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+  origin TEXT NOT NULL,
+  channel TEXT NOT NULL,
+  key TEXT NOT NULL,
+  data JSONB,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS events_created_at_idx ON events (created_at);
+
+CREATE TABLE IF NOT EXISTS user_state (
+  user_id TEXT NOT NULL,
+  kind TEXT NOT NULL,
+  data JSONB NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp(),
+  PRIMARY KEY (user_id, kind)
+);
+
+DROP TRIGGER IF EXISTS user_state_set_updated_at ON user_state;
+CREATE TRIGGER user_state_set_updated_at
+  BEFORE UPDATE ON user_state
+  FOR EACH ROW EXECUTE FUNCTION set_profiles_updated_at();
+
+-- Only the API (with the service key) reads and writes these tables
+ALTER TABLE events ENABLE ROW LEVEL SECURITY;
+ALTER TABLE user_state ENABLE ROW LEVEL SECURITY;